@@ -7,597 +7,373 @@ a SQL database for data storage and retrieval.
 
 Endpoints:
 - /sales_fact: APIs for Sales Fact entity (create, read, update, delete).
+- /sales_fact/bulk: API for inserting many Sales Fact records at once.
 - /product: APIs for Product entity (create, read, update, delete).
 - /customer: APIs for Customer entity (create, read, update, delete).
 - /transaction: APIs for Transaction entity (create, read, update, delete).
 - /date: APIs for Date entity (create, read, update, delete).
 
 Each API endpoint supports standard CRUD operations and interacts with a SQL
-database through the sql_interactions module.
+database through the sql_interactions module. The CRUD endpoints of every
+entity are registered by `make_crud` from the `ENTITIES` table.
 
 Note:
 - Ensure the proper configuration of the database connection in sql_interactions.
+- SQLite connections are pooled on `app.state.pool` for the lifetime of the app,
+  so the endpoints never open or close connections themselves.
+- Database errors are answered with a 500 `{"error": ...}` response by a
+  single exception handler.
+- Responses are serialized with orjson through `ORJSONResponse`.
+- GET results are cached in-process for `CACHE_TTL` seconds and invalidated
+  by the write endpoints of the same table. Every worker has its own cache,
+  so `gunicorn_conf.py` turns it off (`CLV_CACHE_TTL=0`) for several workers.
+- The schema and the planner statistics are prepared by `prepare_database`,
+  once per server: by the gunicorn master, or on startup otherwise.
 - This module assumes the use of FastAPI and requires appropriate model definitions.
 
 """
 
-from fastapi import FastAPI, HTTPException
-from ..DB import sql_interactions
+import asyncio
+import collections
+import contextlib
+import logging
+import os
+import sqlite3
+import orjson
+import aiosqlite
+from aiosqlitepool import SQLiteConnectionPool
+from cachetools import TTLCache
+from typing import List
+from fastapi import FastAPI, Path, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from ..DB import schema, sql_interactions
+from ..Logger import CustomFormatter
 from .models import (
-    SalesFactCreate, SalesFactUpdate,
-    ProductCreate, ProductUpdate,
-    CustomerCreate, CustomerUpdate,
-    TransactionCreate, TransactionUpdate,
-    DateCreate, DateUpdate
+    SalesFactCreate, SalesFactUpdate, SalesFactRead,
+    ProductCreate, ProductUpdate, ProductRead,
+    CustomerCreate, CustomerUpdate, CustomerRead,
+    TransactionCreate, TransactionUpdate, TransactionRead,
+    DateCreate, DateUpdate, DateRead,
+    DataResponse
 )
 
-app = FastAPI()
+logger = logging.getLogger(os.path.basename(__file__))
+logger.setLevel(logging.DEBUG)
+ch = logging.StreamHandler()
+ch.setLevel(logging.DEBUG)
+ch.setFormatter(CustomFormatter())
+logger.addHandler(ch)
 
-# Sales Fact API Methods
+DB_NAME = "temp.db"
+POOL_SIZE = 8  # pooled SQLite connections per worker process
+OPTIMIZE_INTERVAL = 15 * 60  # seconds between `PRAGMA optimize` runs
+# Seconds a cached GET result stays valid, 0 turns the cache off
+CACHE_TTL = float(os.getenv("CLV_CACHE_TTL", "60"))
+# Set to 1 once the database was prepared for the whole server, e.g. by the gunicorn master
+DB_PREPARED_ENV = "CLV_DB_PREPARED"
 
+# Results of GET requests, keyed by (table, id) or (table, start_id, head)
+read_cache = TTLCache(maxsize=10_000, ttl=CACHE_TTL) if CACHE_TTL > 0 else None
+# Number of invalidations of every table, so a read that overlapped a write is not cached
+cache_generations = collections.Counter()
 
-@app.post("/sales_fact/")
-async def create_sales_fact(insert_values: SalesFactCreate):
-    """
-    Create a new sales fact record.
-
-    Parameters:
-    - `insert_values`: The data to insert for the new sales fact.
+app = FastAPI(default_response_class=ORJSONResponse)
 
-    Returns:
-    - The created sales fact.
-    """
-    try:
-        db_sales = sql_interactions.SqlHandler.insert_by_id(
-            insert_values,
-            db_name="temp.db", table_name="sales_fact"
-        )
-        return db_sales
-    except Exception as e:
-        return {"error": f"Internal Server Error: {str(e)}"}
-
-
-@app.get("/sales_fact/")
-async def select_sales_facts(start_id: int, head: int):
-    """
-    Select multiple sales facts within a range.
-
-    Parameters:
-    - `start_id`: The starting ID of the range.
-    - `head`: The number of records to retrieve.
 
-    Returns:
-    - List of selected sales facts.
+async def optimize_periodically():
     """
-    try:
-        db_sales_fact = sql_interactions.SqlHandler.select_many(
-            start_id, head,
-            db_name="temp.db", table_name="sales_fact", table_id="sales_id"
-        )
-        return db_sales_fact
-    except Exception as e:
-        return {"error": f"Internal Server Error: {str(e)}"}
-
-
-@app.get("/sales_fact/{sales_fact_id}")
-async def select_sales_fact(sales_fact_id: int):
+    Run `PRAGMA optimize` every `OPTIMIZE_INTERVAL` seconds so the query
+    planner statistics stay fresh while the application is running.
     """
-    Select a specific sales fact by ID.
+    while True:
+        await asyncio.sleep(OPTIMIZE_INTERVAL)
+        async with app.state.pool.connection() as conn:
+            await conn.execute("PRAGMA optimize;")
 
-    Parameters:
-    - `sales_fact_id`: The ID of the sales fact to retrieve.
 
-    Returns:
-    - The selected sales fact.
+def prepare_database():
     """
-    try:
-        db_sales_fact = sql_interactions.SqlHandler.select_by_id(
-            sales_fact_id,
-            db_name="temp.db", table_name='sales_fact', table_id="sales_id"
-        )
-        return db_sales_fact
-    except Exception as e:
-        return {"error": f"Internal Server Error: {str(e)}"}
-
+    Create missing tables and indexes and give the query planner statistics
+    about the indexes.
 
-@app.put("/sales_fact/{sales_fact_id}")
-async def update_sales_fact(row_id: int, update_data: SalesFactUpdate):
+    Run once per server before the workers start serving: `gunicorn_conf.py`
+    calls it in the master process and sets `DB_PREPARED_ENV`, so the workers
+    skip it. Without that variable the startup hook runs it.
     """
-    Update a sales fact record by ID.
+    schema.init_schema()
+    with contextlib.closing(sqlite3.connect(DB_NAME)) as conn:
+        conn.execute("ANALYZE;")
+        conn.commit()
 
-    Parameters:
-    - `row_id`: The ID of the sales fact to update.
-    - `update_data`: The data to update for the sales fact.
 
-    Returns:
-    - The result of the update operation.
+@app.on_event("startup")
+async def open_connection_pool():
     """
-    try:
-        result = sql_interactions.SqlHandler.update_by_id(
-            row_id, update_data,
-            db_name="temp.db", table_name="sales_fact", table_id="sales_id"
-        )
-        return result
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Internal Server Error: {str(e)}"
-        )
-
+    Create the SQLite connection pool shared by all endpoints.
 
-@app.delete("/sales_fact/{sales_fact_id}")
-async def delete_sales_fact(sales_fact_id: int):
+    Connections are opened lazily and reused across requests, so the
+    per-request connect/teardown cost and the cold page cache are avoided.
+    The pool is built here rather than at import time, so every worker
+    process gets its own connections.
+    The database is prepared first, unless the gunicorn master already did
+    so. The page size conversion of `sql_interactions.set_page_size` is not
+    run here, as it needs the database to itself; `schema_builder.py` runs
+    it once.
     """
-    Delete a sales fact record by ID.
+    if os.getenv(DB_PREPARED_ENV) != "1":
+        await asyncio.to_thread(prepare_database)
+    app.state.pool = SQLiteConnectionPool(
+        lambda: sql_interactions.connect(DB_NAME), pool_size=POOL_SIZE
+    )
+    app.state.optimize_task = asyncio.create_task(optimize_periodically())
 
-    Parameters:
-    - `sales_fact_id`: The ID of the sales fact to delete.
 
-    Returns:
-    - The result of the delete operation.
+@app.on_event("shutdown")
+async def close_connection_pool():
     """
-    try:
-        db_sales_fact = sql_interactions.SqlHandler.delete_by_id(
-            sales_fact_id,
-            db_name="temp.db", table_name='sales_fact', table_id="sales_id"
-        )
-        return db_sales_fact
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Internal Server Error: {str(e)}"
-        )
-
-# Product API Methods
-
-
-@app.post("/product/")
-async def create_product(insert_values: ProductCreate):
+    Stop the `PRAGMA optimize` loop and close every pooled SQLite connection.
     """
-    Delete a sales fact record by ID.
+    app.state.optimize_task.cancel()
+    await app.state.pool.close()
 
-    Parameters:
-    - `sales_fact_id`: The ID of the sales fact to delete.
 
-    Returns:
-    - The result of the delete operation.
+@app.exception_handler(aiosqlite.Error)
+async def database_error_handler(request: Request, exc: aiosqlite.Error):
     """
-    try:
-        db_product = sql_interactions.SqlHandler.insert_by_id(
-            insert_values,
-            db_name="temp.db", table_name="product"
-        )
-        return db_product
-    except Exception as e:
-        return {"error": f"Internal Server Error: {str(e)}"}
-
+    Turn database errors raised by any endpoint into a 500 response.
 
-@app.get("/product/")
-async def select_products(start_id: int, head: int):
+    Other exceptions are left to FastAPI's default error handling.
     """
-    Select multiple products within a range.
+    logger.exception(f"Database error on {request.url.path}")
+    return ORJSONResponse(
+        {"error": f"Internal Server Error: {str(exc)}"}, status_code=500
+    )
 
-    Parameters:
-    - `start_id`: The starting ID of the range.
-    - `head`: The number of records to retrieve.
 
-    Returns:
-    - List of selected products.
+async def cached_select(key, select, *args, **kwargs):
     """
-    try:
-        db_products = sql_interactions.SqlHandler.select_many(
-            start_id, head,
-            db_name="temp.db", table_name="product", table_id="product_id"
-        )
-        return db_products
-    except Exception as e:
-        return {"error": f"Internal Server Error: {str(e)}"}
+    Return the cached result for `key`, querying the database on a miss.
 
-
-@app.get("/product/{product_id}")
-async def select_product(product_id: int):
-    """
-    Select a specific product by ID.
+    With the cache turned off the database is always queried. The result is
+    only stored if the table was not invalidated while it was queried, so a
+    read that started before a write cannot cache the rows of before the
+    write after the write has invalidated the cache.
 
     Parameters:
-    - `product_id`: The ID of the product to retrieve.
+    - `key`: Cache key, `(table, id)` or `(table, start_id, head)`.
+    - `select`: The SqlHandler select coroutine to run on a miss.
+    - `*args`, `**kwargs`: Arguments passed to `select` after the connection.
 
     Returns:
-    - The selected product.
-    """
-    try:
-        db_product = sql_interactions.SqlHandler.select_by_id(
-            product_id,
-            db_name="temp.db", table_name='product', table_id="product_id"
-        )
-        return db_product
-    except Exception as e:
-        return {"error": f"Internal Server Error: {str(e)}"}
-
-
-@app.put("/product/{product_id}")
-async def update_product(row_id: int, update_data: ProductUpdate):
+    - The result of the select operation.
     """
-    Update a product record by ID.
+    result = None if read_cache is None else read_cache.get(key)
+    if result is None:
+        generation = cache_generations[key[0]]
+        async with app.state.pool.connection() as conn:
+            result = await select(conn, *args, **kwargs)
+        if (result is not None and read_cache is not None
+                and cache_generations[key[0]] == generation):
+            read_cache[key] = result
+    return result
 
-    Parameters:
-    - `row_id`: The ID of the product to update.
-    - `update_data`: The data to update for the product.
 
-    Returns:
-    - The result of the update operation.
+async def stream_rows(*args, **kwargs):
     """
-    try:
-        result = sql_interactions.SqlHandler.update_by_id(
-            row_id, update_data,
-            db_name="temp.db", table_name="product", table_id="product_id"
-        )
-        return result
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Internal Server Error: {str(e)}"
-        )
+    Stream the rows of `SqlHandler.iter_many` as NDJSON lines.
 
-
-@app.delete("/product/{product_id}")
-async def delete_product(product_id: int):
-    """
-    Delete a product record by ID.
+    The pooled connection is held until the last row has been sent.
 
     Parameters:
-    - `product_id`: The ID of the product to delete.
-
-    Returns:
-    - The result of the delete operation.
-    """
-    try:
-        db_product = sql_interactions.SqlHandler.delete_by_id(
-            product_id,
-            db_name="temp.db", table_name='product', table_id="product_id"
-        )
-        return db_product
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Internal Server Error: {str(e)}"
-        )
-
-# Customer API Methods
-
-
-@app.post("/customer/")
-async def create_customer(insert_values: CustomerCreate):
+    - `*args`, `**kwargs`: Arguments passed to `iter_many` after the
+      connection.
     """
-    Create a new customer record.
+    async with app.state.pool.connection() as conn:
+        async for row in sql_interactions.SqlHandler.iter_many(
+                conn, *args, **kwargs):
+            yield orjson.dumps(row) + b"\n"
 
-    Parameters:
-    - `insert_values`: The data to insert for the new customer.
 
-    Returns:
-    - The created customer.
+def invalidate_cache(table_name, row_id=None):
     """
-    try:
-        db_customer = sql_interactions.SqlHandler.insert_by_id(
-            insert_values,
-            db_name="temp.db", table_name="customer"
-        )
-        return db_customer
-    except Exception as e:
-        return {"error": f"Internal Server Error: {str(e)}"}
+    Drop cached results of a table after a write.
 
-
-@app.get("/customer/")
-async def select_customers(start_id: int, head: int):
-    """
-    Select multiple customers within a range.
+    The `(table, id)` entry of `row_id` and every cached range of the table
+    are removed. Without `row_id` (inserts) the ID of the new row is not
+    known here, so all entries of the table go. The generation of the table
+    is advanced, so reads still running keep their results out of the cache.
 
     Parameters:
-    - `start_id`: The starting ID of the range.
-    - `head`: The number of records to retrieve.
-
-    Returns:
-    - List of selected customers.
+    - `table_name`: The table that was written to.
+    - `row_id`: The ID of the affected row, if known.
     """
-    try:
-        db_customers = sql_interactions.SqlHandler.select_many(
-            start_id, head,
-            db_name="temp.db", table_name="customer", table_id="customer_id"
-        )
-        return db_customers
-    except Exception as e:
-        return {"error": f"Internal Server Error: {str(e)}"}
+    cache_generations[table_name] += 1
+    if read_cache is None:
+        return
+    read_cache.pop((table_name, row_id), None)
+    for key in list(read_cache.keys()):
+        if key[0] == table_name and (row_id is None or len(key) == 3):
+            read_cache.pop(key, None)
 
 
-@app.get("/customer/{customer_id}")
-async def select_customer(customer_id: int):
-    """
-    Select a specific customer by ID.
+# CRUD API Methods
 
-    Parameters:
-    - `customer_id`: The ID of the customer to retrieve.
 
-    Returns:
-    - The selected customer.
+def make_crud(app, prefix, table_name, table_id, create_model, update_model,
+              read_model):
     """
-    try:
-        db_customer = sql_interactions.SqlHandler.select_by_id(
-            customer_id,
-            db_name="temp.db", table_name='customer', table_id="customer_id"
-        )
-        return db_customer
-    except Exception as e:
-        return {"error": f"Internal Server Error: {str(e)}"}
-
-
-@app.put("/customer/{customer_id}")
-async def update_customer(row_id: int, update_data: CustomerUpdate):
-    """
-    Update a customer record by ID.
+    Register the create, read, update and delete endpoints of an entity.
 
     Parameters:
-    - `row_id`: The ID of the customer to update.
-    - `update_data`: The data to update for the customer.
-
-    Returns:
-    - The result of the update operation.
-    """
-    try:
-        result = sql_interactions.SqlHandler.update_by_id(
-            row_id, update_data,
-            db_name="temp.db", table_name="customer", table_id="customer_id"
-        )
+    - `app`: The FastAPI application to register the endpoints on.
+    - `prefix`: URL prefix of the entity, e.g. `product`.
+    - `table_name`: Name of the database table of the entity.
+    - `table_id`: Name of the ID column of the table.
+    - `create_model`: Pydantic model for creating a new record.
+    - `update_model`: Pydantic model for updating an existing record.
+    - `read_model`: Pydantic model of a selected record.
+    """
+    path_id = f"{prefix}_id"
+    item_path = f"/{prefix}/{{{path_id}}}"
+
+    async def create(insert_values: create_model):
+        """
+        Create a new record.
+
+        Parameters:
+        - `insert_values`: The data to insert for the new record.
+
+        Returns:
+        - The created record.
+        """
+        async with app.state.pool.connection() as conn:
+            result = await sql_interactions.SqlHandler.insert_by_id(
+                conn, insert_values, table_name=table_name
+            )
+        invalidate_cache(table_name)
         return result
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Internal Server Error: {str(e)}"
-        )
-
-
-@app.delete("/customer/{customer_id}")
-async def delete_customer(customer_id: int):
-    """
-    Delete a customer record by ID.
-
-    Parameters:
-    - `customer_id`: The ID of the customer to delete.
-
-    Returns:
-    - The result of the delete operation.
-    """
-    try:
-        db_customer = sql_interactions.SqlHandler.delete_by_id(
-            customer_id,
-            db_name="temp.db", table_name='customer', table_id="customer_id"
-        )
-        return db_customer
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Internal Server Error: {str(e)}"
-        )
-
-# Transaction API Methods
-
-
-@app.post("/transaction/")
-async def create_transaction(insert_values: TransactionCreate):
-    """
-    Create a new transaction record.
-
-    Parameters:
-    - `insert_values`: The data to insert for the new transaction.
-
-    Returns:
-    - The created transaction.
-    """
-    try:
-        db_transaction = sql_interactions.SqlHandler.insert_by_id(
-            insert_values,
-            db_name="temp.db", table_name="transactions"
-        )
-        return db_transaction
-    except Exception as e:
-        return {"error": f"Internal Server Error: {str(e)}"}
-
-
-@app.get("/transaction/")
-async def select_transactions(start_id: int, head: int):
-    """
-    Select multiple transactions within a range.
-
-    Parameters:
-    - `start_id`: The starting ID of the range.
-    - `head`: The number of records to retrieve.
-
-    Returns:
-    - List of selected transactions.
-    """
-    try:
-        db_transactions = sql_interactions.SqlHandler.select_many(
-            start_id, head,
-            db_name="temp.db", table_name="transactions",
-            table_id="transaction_id"
-        )
-        return db_transactions
-    except Exception as e:
-        return {"error": f"Internal Server Error: {str(e)}"}
-
 
-@app.get("/transaction/{transaction_id}")
-async def select_transaction(transaction_id: int):
-    """
-    Select a specific transaction by ID.
-
-    Parameters:
-    - `transaction_id`: The ID of the transaction to retrieve.
-
-    Returns:
-    - The selected transaction.
-    """
-    try:
-        db_transaction = sql_interactions.SqlHandler.select_by_id(
-            transaction_id,
-            db_name="temp.db", table_name='transactions',
-            table_id="transaction_id"
-        )
-        return db_transaction
-    except Exception as e:
-        return {"error": f"Internal Server Error: {str(e)}"}
-
-
-@app.put("/transaction/{transaction_id}")
-async def update_transaction(row_id: int, update_data: TransactionUpdate):
-    """
-    Update a transaction record by ID.
-
-    Parameters:
-    - `row_id`: The ID of the transaction to update.
-    - `update_data`: The data to update for the transaction.
-
-    Returns:
-    - The result of the update operation.
-    """
-    try:
-        result = sql_interactions.SqlHandler.update_by_id(
-            row_id, update_data,
-            db_name="temp.db", table_name="transactions",
-            table_id="transaction_id"
-        )
+    async def select_many(start_id: int, head: int, stream: bool = False):
+        """
+        Select multiple records within a range.
+
+        Parameters:
+        - `start_id`: The starting ID of the range.
+        - `head`: The number of records to retrieve.
+        - `stream`: Stream the records as NDJSON lines instead of a single
+          JSON document. Streamed results are not cached.
+
+        Returns:
+        - List of selected records.
+        """
+        if stream:
+            return StreamingResponse(
+                stream_rows(start_id, head, table_name=table_name,
+                            table_id=table_id),
+                media_type="application/x-ndjson"
+            )
+        return await cached_select(
+            (table_name, start_id, head),
+            sql_interactions.SqlHandler.select_many,
+            start_id, head, table_name=table_name, table_id=table_id
+        )
+
+    async def select(row_id: int = Path(alias=path_id)):
+        """
+        Select a specific record by ID.
+
+        Parameters:
+        - `row_id`: The ID of the record to retrieve.
+
+        Returns:
+        - The selected record.
+        """
+        return await cached_select(
+            (table_name, row_id),
+            sql_interactions.SqlHandler.select_by_id,
+            row_id, table_name=table_name, table_id=table_id
+        )
+
+    async def update(update_data: update_model,
+                     row_id: int = Path(alias=path_id)):
+        """
+        Update a record by ID.
+
+        Parameters:
+        - `row_id`: The ID of the record to update.
+        - `update_data`: The data to update for the record.
+
+        Returns:
+        - The result of the update operation.
+        """
+        async with app.state.pool.connection() as conn:
+            result = await sql_interactions.SqlHandler.update_by_id(
+                conn, row_id, update_data, table_name=table_name,
+                table_id=table_id
+            )
+        invalidate_cache(table_name, row_id)
         return result
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Internal Server Error: {str(e)}"
-        )
-
-
-@app.delete("/transaction/{transaction_id}")
-async def delete_transaction(transaction_id: int):
-    """
-    Delete a transaction record by ID.
-
-    Parameters:
-    - `transaction_id`: The ID of the transaction to delete.
-
-    Returns:
-    - The result of the delete operation.
-    """
-    try:
-        db_transaction = sql_interactions.SqlHandler.delete_by_id(
-            transaction_id,
-            db_name="temp.db", table_name='transactions',
-            table_id="transaction_id"
-        )
-        return db_transaction
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Internal Server Error: {str(e)}"
-        )
-
-# Date API Methods
-
-
-@app.post("/date/")
-async def create_date(insert_values: DateCreate):
-    """
-    Create a new date record.
-
-    Parameters:
-    - `insert_values`: The data to insert for the new date.
-
-    Returns:
-    - The created date.
-    """
-    try:
-        db_date = sql_interactions.SqlHandler.insert_by_id(
-            insert_values,
-            db_name="temp.db", table_name="date"
-        )
-        return db_date
-    except Exception as e:
-        return {"error": f"Internal Server Error: {str(e)}"}
-
-
-@app.get("/date/")
-async def select_dates(start_id: int, head: int):
-    """
-    Select multiple dates within a range.
-
-    Parameters:
-    - `start_id`: The starting ID of the range.
-    - `head`: The number of records to retrieve.
-
-    Returns:
-    - List of selected dates.
-    """
-    try:
-        db_dates = sql_interactions.SqlHandler.select_many(
-            start_id, head,
-            db_name="temp.db", table_name="date", table_id="date_id"
-        )
-        return db_dates
-    except Exception as e:
-        return {"error": f"Internal Server Error: {str(e)}"}
-
-
-@app.get("/date/{date_id}")
-async def select_date(date_id: int):
-    """
-    Select a specific date by ID.
-
-    Parameters:
-    - `date_id`: The ID of the date to retrieve.
-
-    Returns:
-    - The selected date.
-    """
-    try:
-        db_date = sql_interactions.SqlHandler.select_by_id(
-            date_id,
-            db_name="temp.db", table_name='date', table_id="date_id"
-        )
-        return db_date
-    except Exception as e:
-        return {"error": f"Internal Server Error: {str(e)}"}
 
+    async def delete(row_id: int = Path(alias=path_id)):
+        """
+        Delete a record by ID.
+
+        Parameters:
+        - `row_id`: The ID of the record to delete.
+
+        Returns:
+        - The result of the delete operation.
+        """
+        async with app.state.pool.connection() as conn:
+            result = await sql_interactions.SqlHandler.delete_by_id(
+                conn, row_id, table_name=table_name, table_id=table_id
+            )
+        invalidate_cache(table_name, row_id)
+        return result
 
-@app.put("/date/{date_id}")
-async def update_date(row_id: int, update_data: DateUpdate):
-    """
-    Update a date record by ID.
+    app.post(f"/{prefix}/", name=f"create_{prefix}")(create)
+    app.get(f"/{prefix}/", name=f"select_{prefix}s",
+            response_model=DataResponse[List[read_model]],
+            response_model_exclude_unset=True)(select_many)
+    app.get(item_path, name=f"select_{prefix}",
+            response_model=DataResponse[read_model],
+            response_model_exclude_unset=True)(select)
+    app.put(item_path, name=f"update_{prefix}")(update)
+    app.delete(item_path, name=f"delete_{prefix}")(delete)
+
+
+# (URL prefix, table, ID column, create, update and read models) of each entity
+ENTITIES = (
+    ("sales_fact", "sales_fact", "sales_id",
+     SalesFactCreate, SalesFactUpdate, SalesFactRead),
+    ("product", "product", "product_id",
+     ProductCreate, ProductUpdate, ProductRead),
+    ("customer", "customer", "customer_id",
+     CustomerCreate, CustomerUpdate, CustomerRead),
+    ("transaction", "transactions", "transaction_id",
+     TransactionCreate, TransactionUpdate, TransactionRead),
+    ("date", "date", "date_id", DateCreate, DateUpdate, DateRead),
+)
 
-    Parameters:
-    - `row_id`: The ID of the date to update.
-    - `update_data`: The data to update for the date.
+for entity in ENTITIES:
+    make_crud(app, *entity)
 
-    Returns:
-    - The result of the update operation.
-    """
-    try:
-        result = sql_interactions.SqlHandler.update_by_id(
-            row_id, update_data,
-            db_name="temp.db", table_name="date", table_id="date_id"
-        )
-        return result
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Internal Server Error: {str(e)}"
-        )
 
-
-@app.delete("/date/{date_id}")
-async def delete_date(date_id: int):
+@app.post("/sales_fact/bulk")
+async def create_sales_facts(insert_values: List[SalesFactCreate]):
     """
-    Delete a date record by ID.
+    Create many sales fact records in a single transaction.
 
     Parameters:
-    - `date_id`: The ID of the date to delete.
+    - `insert_values`: The data to insert for the new sales facts.
 
     Returns:
-    - The result of the delete operation.
+    - The number of inserted sales facts.
     """
-    try:
-        db_date = sql_interactions.SqlHandler.delete_by_id(
-            date_id,
-            db_name="temp.db", table_name='date', table_id="date_id"
-        )
-        return db_date
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Internal Server Error: {str(e)}"
+    async with app.state.pool.connection() as conn:
+        inserted = await sql_interactions.SqlHandler.bulk_insert(
+            conn, insert_values, table_name="sales_fact",
+            columns=list(SalesFactCreate.model_fields)
         )
+    invalidate_cache("sales_fact")
+    return {"inserted": inserted}
@@ -6,6 +6,7 @@ data structures used in the FastAPI endpoints for the Sales Fact, Product,
 Customer, Transaction, and Date entities.
 
 Models:
+- EntityModel: Base model rejecting unknown fields and freezing instances.
 - ProductCreate: Pydantic model for creating a new product.
 - ProductUpdate: Pydantic model for updating an existing product.
 - CustomerCreate: Pydantic model for creating a new customer.
@@ -16,19 +17,45 @@ Models:
 - DateUpdate: Pydantic model for updating an existing date.
 - SalesFactCreate: Pydantic model for creating a new sales fact.
 - SalesFactUpdate: Pydantic model for updating an existing sales fact.
+- ProductRead, CustomerRead, TransactionRead, DateRead, SalesFactRead:
+  Pydantic models of the rows returned by the select endpoints.
+- DataResponse: Generic `{"data": ...}` envelope of the select endpoints.
 
 Each model corresponds to a database entity and includes the necessary fields
 with their respective types. Optional fields are provided for update operations.
 """
 
-from pydantic import BaseModel
-from typing import Optional
-from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field, computed_field
+from typing import Annotated, Generic, Literal, Optional, TypeVar
+import datetime
+from ..DB.schema import GENDERS, MONTH_NAMES, PAYMENT_METHODS, WEEKDAY_NAMES
+
+# Value ranges of the date dimension components
+Month = Annotated[int, Field(ge=1, le=12)]
+Quarter = Annotated[int, Field(ge=1, le=4)]
+DayOfMonth = Annotated[int, Field(ge=1, le=31)]
+DayOfYear = Annotated[int, Field(ge=1, le=366)]
+DayOfWeek = Annotated[int, Field(ge=1, le=7)]
+WeekOfYear = Annotated[int, Field(ge=1, le=53)]
+WeekOfMonth = Annotated[int, Field(ge=1, le=5)]
+
+# Allowed values of the enumerated columns
+Gender = Literal[GENDERS]
+PaymentMethod = Literal[PAYMENT_METHODS]
+
+
+class EntityModel(BaseModel):
+    """
+    Base model of the request bodies.
+
+    Unknown fields are rejected and instances are immutable once validated.
+    """
+    model_config = ConfigDict(extra='forbid', frozen=True)
 
 # Pydantic models for database entities
 
 
-class ProductCreate(BaseModel):
+class ProductCreate(EntityModel):
     """
     Pydantic model for creating a new product.
 
@@ -44,7 +71,7 @@ class ProductCreate(BaseModel):
     price: float
 
 
-class ProductUpdate(BaseModel):
+class ProductUpdate(EntityModel):
     """
     Pydantic model for updating an existing product.
 
@@ -60,7 +87,25 @@ class ProductUpdate(BaseModel):
     price: Optional[float] = None
 
 
-class CustomerCreate(BaseModel):
+class ProductRead(BaseModel):
+    """
+    Pydantic model of a product row.
+
+    Fields:
+    - `product_id`: ID of the product.
+    - `SKU`: Stock Keeping Unit for the product.
+    - `product_category`: Category of the product.
+    - `producer_country`: Country where the product is produced.
+    - `price`: Price of the product.
+    """
+    product_id: int
+    SKU: Optional[str] = None
+    product_category: Optional[str] = None
+    producer_country: Optional[str] = None
+    price: Optional[float] = None
+
+
+class CustomerCreate(EntityModel):
     """
     Pydantic model for creating a new customer.
 
@@ -84,11 +129,11 @@ class CustomerCreate(BaseModel):
     city: str
     address: str
     zip_code: str
-    birthday: datetime
-    gender: str
+    birthday: datetime.date
+    gender: Gender
 
 
-class CustomerUpdate(BaseModel):
+class CustomerUpdate(EntityModel):
     """
     Pydantic model for updating an existing customer.
 
@@ -112,11 +157,41 @@ class CustomerUpdate(BaseModel):
     city: Optional[str] = None
     address: Optional[str] = None
     zip_code: Optional[str] = None
-    birthday: Optional[datetime] = None
+    birthday: Optional[datetime.date] = None
+    gender: Optional[Gender] = None
+
+
+class CustomerRead(BaseModel):
+    """
+    Pydantic model of a customer row.
+
+    Fields:
+    - `customer_id`: ID of the customer.
+    - `customer_name`: First name of the customer.
+    - `customer_surname`: Last name of the customer.
+    - `email`: Email address of the customer.
+    - `phone`: Phone number of the customer.
+    - `country`: Country of residence.
+    - `city`: City of residence.
+    - `address`: Address of the customer.
+    - `zip_code`: ZIP code of the customer's location.
+    - `birthday`: Date of birth of the customer, as stored.
+    - `gender`: Gender of the customer.
+    """
+    customer_id: int
+    customer_name: Optional[str] = None
+    customer_surname: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    country: Optional[str] = None
+    city: Optional[str] = None
+    address: Optional[str] = None
+    zip_code: Optional[str] = None
+    birthday: Optional[str] = None
     gender: Optional[str] = None
 
 
-class TransactionCreate(BaseModel):
+class TransactionCreate(EntityModel):
     """
     Pydantic model for creating a new transaction.
 
@@ -125,12 +200,12 @@ class TransactionCreate(BaseModel):
     - `payment_method`: Payment method used for the transaction.
     - `customer_id`: ID of the customer associated with the transaction.
     """
-    date: datetime
-    payment_method: str
+    date: datetime.date
+    payment_method: PaymentMethod
     customer_id: int
 
 
-class TransactionUpdate(BaseModel):
+class TransactionUpdate(EntityModel):
     """
     Pydantic model for updating an existing transaction.
 
@@ -139,72 +214,123 @@ class TransactionUpdate(BaseModel):
     - `payment_method`: Payment method used for the transaction.
     - `customer_id`: ID of the customer associated with the transaction.
     """
-    date: Optional[datetime] = None
+    date: Optional[datetime.date] = None
+    payment_method: Optional[PaymentMethod] = None
+    customer_id: Optional[int] = None
+
+
+class TransactionRead(BaseModel):
+    """
+    Pydantic model of a transaction row.
+
+    Fields:
+    - `transaction_id`: ID of the transaction.
+    - `date`: Date of the transaction, as stored.
+    - `payment_method`: Payment method used for the transaction.
+    - `customer_id`: ID of the customer associated with the transaction.
+    """
+    transaction_id: int
+    date: Optional[str] = None
     payment_method: Optional[str] = None
     customer_id: Optional[int] = None
 
 
-class DateCreate(BaseModel):
+class DateCreate(EntityModel):
     """
     Pydantic model for creating a new date.
 
     Fields:
     - `date`: Date.
     - `month`: Month of the date.
-    - `month_name`: Name of the month.
     - `year`: Year of the date.
     - `quarter`: Quarter of the year.
     - `day_of_month`: Day of the month.
     - `day_of_year`: Day of the year.
     - `day_of_week_number`: Day of the week (number).
-    - `day_of_week_name`: Name of the day of the week.
     - `week_of_year`: Week of the year.
     - `week_of_month`: Week of the month.
     """
-    date: datetime
-    month: int
-    month_name: str
+    date: datetime.date
+    month: Month
     year: int
-    quarter: int
-    day_of_month: int
-    day_of_year: int
-    day_of_week_number: int
-    day_of_week_name: str
-    week_of_year: int
-    week_of_month: int
+    quarter: Quarter
+    day_of_month: DayOfMonth
+    day_of_year: DayOfYear
+    day_of_week_number: DayOfWeek
+    week_of_year: WeekOfYear
+    week_of_month: WeekOfMonth
 
 
-class DateUpdate(BaseModel):
+class DateUpdate(EntityModel):
     """
     Pydantic model for updating an existing date.
 
     Optional Fields:
     - `date`: Date.
     - `month`: Month of the date.
-    - `month_name`: Name of the month.
     - `year`: Year of the date.
     - `quarter`: Quarter of the year.
     - `day_of_month`: Day of the month.
     - `day_of_year`: Day of the year.
     - `day_of_week_number`: Day of the week (number).
-    - `day_of_week_name`: Name of the day of the week.
     - `week_of_year`: Week of the year.
     - `week_of_month`: Week of the month.
     """
-    date: Optional[datetime] = None
+    date: Optional[datetime.date] = None
+    month: Optional[Month] = None
+    year: Optional[int] = None
+    quarter: Optional[Quarter] = None
+    day_of_month: Optional[DayOfMonth] = None
+    day_of_year: Optional[DayOfYear] = None
+    day_of_week_number: Optional[DayOfWeek] = None
+    week_of_year: Optional[WeekOfYear] = None
+    week_of_month: Optional[WeekOfMonth] = None
+
+
+class DateRead(BaseModel):
+    """
+    Pydantic model of a date row.
+
+    Fields:
+    - `date_id`: ID of the date.
+    - `date`: Date, as stored.
+    - `month`: Month of the date.
+    - `month_name`: Name of the month, derived from `month`.
+    - `year`: Year of the date.
+    - `quarter`: Quarter of the year.
+    - `day_of_month`: Day of the month.
+    - `day_of_year`: Day of the year.
+    - `day_of_week_number`: Day of the week (number).
+    - `day_of_week_name`: Name of the day of the week, derived from
+      `day_of_week_number`.
+    - `week_of_year`: Week of the year.
+    - `week_of_month`: Week of the month.
+    """
+    date_id: int
+    date: Optional[str] = None
     month: Optional[int] = None
-    month_name: Optional[str] = None
     year: Optional[int] = None
     quarter: Optional[int] = None
     day_of_month: Optional[int] = None
     day_of_year: Optional[int] = None
     day_of_week_number: Optional[int] = None
-    day_of_week_name: Optional[str] = None
     week_of_year: Optional[int] = None
     week_of_month: Optional[int] = None
 
+    @computed_field
+    @property
+    def month_name(self) -> Optional[str]:
+        return None if self.month is None else MONTH_NAMES[self.month - 1]
+
+    @computed_field
+    @property
+    def day_of_week_name(self) -> Optional[str]:
+        if self.day_of_week_number is None:
+            return None
+        return WEEKDAY_NAMES[self.day_of_week_number - 1]
+
 
-class SalesFactCreate(BaseModel):
+class SalesFactCreate(EntityModel):
     """
     Pydantic model for creating a new sales fact.
 
@@ -222,7 +348,7 @@ class SalesFactCreate(BaseModel):
     date_id: int
 
 
-class SalesFactUpdate(BaseModel):
+class SalesFactUpdate(EntityModel):
     """
     Pydantic model for updating an existing sales fact.
 
@@ -238,3 +364,36 @@ class SalesFactUpdate(BaseModel):
     customer_id: Optional[int] = None
     quantity: Optional[int] = None
     date_id: Optional[int] = None
+
+
+class SalesFactRead(BaseModel):
+    """
+    Pydantic model of a sales fact row.
+
+    Fields:
+    - `sales_id`: ID of the sales fact.
+    - `transaction_id`: ID of the associated transaction.
+    - `product_id`: ID of the associated product.
+    - `customer_id`: ID of the associated customer.
+    - `quantity`: Quantity sold.
+    - `date_id`: ID of the associated date.
+    """
+    sales_id: int
+    transaction_id: Optional[int] = None
+    product_id: Optional[int] = None
+    customer_id: Optional[int] = None
+    quantity: Optional[int] = None
+    date_id: Optional[int] = None
+
+
+T = TypeVar("T")
+
+
+class DataResponse(BaseModel, Generic[T]):
+    """
+    Pydantic model of the `{"data": ...}` envelope of the select endpoints.
+
+    Fields:
+    - `data`: The selected row(s), or None if no row matched.
+    """
+    data: Optional[T] = None
@@ -2,5 +2,17 @@ from ..Logger import logger
 from ..utils import *
 from . import schema
 from ..Logger.logger import CustomFormatter
-from .data_generator import generate_product, generate_customer, generate_transaction, generate_date, generate_sales
 from .sql_interactions import SqlHandler
+
+# The generators need Faker and build their name pools on import, so they are
+# only loaded when first accessed, not by the schema and the API
+_GENERATORS = ('generate_product', 'generate_products', 'generate_customer', 'generate_customers',
+               'generate_transaction', 'generate_transactions', 'generate_date', 'generate_date_range',
+               'generate_sales')
+
+
+def __getattr__(name):
+    if name in _GENERATORS:
+        from . import data_generator
+        return getattr(data_generator, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
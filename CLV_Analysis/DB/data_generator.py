@@ -7,24 +7,32 @@ to generate realistic fake data for testing and development purposes.
 
 Functions:
 - generate_product: Generates fake data for a product.
+- generate_products: Generates fake data for many products at once.
 - generate_customer: Generates fake data for a customer.
+- generate_customers: Generates fake data for many customers at once.
 - generate_transaction: Generates fake data for a transaction.
+- generate_transactions: Generates fake data for many transactions at once.
 - generate_date: Generates fake data for a date.
+- generate_date_range: Generates the data of consecutive dates at once.
 - generate_sales: Generates fake data for sales.
 
 Note:
 - The functions in this module are intended for testing and development purposes,
   and the generated data may not reflect real-world scenarios.
+- Setting the `CLV_SEED` environment variable seeds Faker and the shared random
+  number generator `_RNG`, so the same seed generates the same data.
 """
 
 import faker
 from faker import Faker
 import faker_commerce
+from faker_commerce import CATEGORIES
 import numpy as np
-import random
+import pandas as pd
 import logging
 from ..Logger.logger import CustomFormatter
-from datetime import datetime, timedelta
+from .schema import GENDERS, PAYMENT_METHODS
+from datetime import date, datetime, timedelta
 import os
 faker.locale = "en_US"
 
@@ -36,8 +44,49 @@ ch.setLevel(logging.DEBUG)
 ch.setFormatter(CustomFormatter())
 logger.addHandler(ch)
 
+# Seed of the generated data, so runs with the same CLV_SEED give the same data
+_SEED = int(os.environ["CLV_SEED"]) if os.getenv("CLV_SEED") else None
+
 fake = Faker()
 fake.add_provider(faker_commerce.Provider)
+if _SEED is not None:
+    Faker.seed(_SEED)
+
+# Single random number generator shared by all generators
+_RNG = np.random.default_rng(_SEED)
+
+# Date ranges of the generated data
+_CUSTOMER_DOB_START = datetime(1923, 1, 1)
+_CUSTOMER_DOB_END = datetime(2005, 12, 31)
+_CUSTOMER_DOB_RANGE_DAYS = (_CUSTOMER_DOB_END - _CUSTOMER_DOB_START).days
+_TXN_START = datetime(2000, 1, 1)
+_TXN_END = datetime(2023, 12, 31)
+_TXN_RANGE_DAYS = (_TXN_END - _TXN_START).days
+_DATE_START = date(2000, 1, 1)
+
+
+def _weighted_pool(elements):
+    """
+    Split a Faker `{value: weight}` mapping into values and probabilities.
+    """
+    values = np.array(list(elements.keys()))
+    weights = np.array(list(elements.values()), dtype=float)
+    return values, weights / weights.sum()
+
+
+_FIRST_NAMES = _weighted_pool(fake.provider('faker.providers.person')
+                              .first_names)
+_LAST_NAMES = _weighted_pool(fake.provider('faker.providers.person')
+                             .last_names)
+_COUNTRIES = np.array(fake.provider('faker.providers.address').countries)
+
+
+def _random_dates(start, range_days, n):
+    """
+    Draw `n` uniformly distributed dates from `start` to `start + range_days`.
+    """
+    days = _RNG.integers(0, range_days + 1, n)
+    return np.datetime64(start, 'D') + days.astype('timedelta64[D]')
 
 # Data Models
 
@@ -55,9 +104,34 @@ def generate_product(product_id):
     return {
         "product_id": product_id,
         "SKU": fake.unique.hexify(text='^^^^^', upper=True),
-        "product_category": fake.ecommerce_category(),
+        "product_category": str(_RNG.choice(CATEGORIES)),
         "producer_country": fake.country(),
-        "price": round(random.uniform(1, 100), 2)
+        "price": round(float(_RNG.uniform(1, 100)), 2)
+    }
+
+
+def generate_products(n):
+    """
+    Generate fake data for `n` products at once.
+
+    SKUs are `n` distinct 5-digit hex codes drawn without replacement, so
+    they are unique without tracking the values already used.
+
+    Parameters:
+    - n: Number of products to generate, at most 16 ** 5.
+
+    Returns:
+    - Dictionary mapping each product column to an array of length n,
+      with product IDs 0 to n - 1.
+    """
+    assert n <= 16 ** 5, "Not enough distinct 5-digit SKUs"
+    codes = _RNG.choice(16 ** 5, size=n, replace=False)
+    return {
+        "product_id": np.arange(n),
+        "SKU": np.char.mod('%05X', codes),
+        "product_category": _RNG.choice(CATEGORIES, n),
+        "producer_country": _RNG.choice(_COUNTRIES, n),
+        "price": np.round(_RNG.uniform(1, 100, n), 2)
     }
 
 
@@ -71,9 +145,8 @@ def generate_customer(customer_id):
     Returns:
     - Dictionary containing fake data for a customer.
     """
-    start_date = datetime(1923, 1, 1)
-    end_date = datetime(2005, 12, 31)
-    random_date = fake.date_time_between_dates(start_date, end_date)
+    random_date = fake.date_time_between_dates(_CUSTOMER_DOB_START,
+                                               _CUSTOMER_DOB_END)
     return {
         "customer_id": customer_id,
         "customer_name": fake.first_name(),
@@ -84,9 +157,39 @@ def generate_customer(customer_id):
         "city": fake.city(),
         "address": fake.street_address(),
         "zip_code":  fake.zipcode(),
-        "birthday":  random_date.strftime("%Y-%m-%d"),
-        "gender": fake.random_element(elements=("Female", "Male",
-                                                "Prefer Not To Say", "Other"))
+        "birthday":  random_date.date(),
+        "gender": fake.random_element(elements=GENDERS)
+    }
+
+
+def generate_customers(n):
+    """
+    Generate fake data for `n` customers at once.
+
+    Names, countries, birthdays and genders are sampled with NumPy in one
+    call each; Faker is only used for the free-form strings.
+
+    Parameters:
+    - n: Number of customers to generate.
+
+    Returns:
+    - Dictionary mapping each customer column to an array of length n,
+      with customer IDs 0 to n - 1.
+    """
+    birthday = _random_dates(_CUSTOMER_DOB_START, _CUSTOMER_DOB_RANGE_DAYS,
+                             n)
+    return {
+        "customer_id": np.arange(n),
+        "customer_name": _RNG.choice(_FIRST_NAMES[0], n, p=_FIRST_NAMES[1]),
+        "customer_surname": _RNG.choice(_LAST_NAMES[0], n, p=_LAST_NAMES[1]),
+        "email": [fake.email() for _ in range(n)],
+        "phone": [fake.phone_number() for _ in range(n)],
+        "country": _RNG.choice(_COUNTRIES, n),
+        "city": [fake.city() for _ in range(n)],
+        "address": [fake.street_address() for _ in range(n)],
+        "zip_code": [fake.zipcode() for _ in range(n)],
+        "birthday": birthday,
+        "gender": _RNG.choice(GENDERS, n)
     }
 
 
@@ -101,18 +204,43 @@ def generate_transaction(transaction_id):
     - Dictionary containing fake data for a transaction.
     """
     # Generate a random date between a specific date range
-    start_date = datetime(2000, 1, 1)
-    end_date = datetime(2023, 12, 31)
-    random_date = fake.date_between_dates(start_date, end_date)
+    random_date = _TXN_START.date() + timedelta(
+        days=int(_RNG.integers(0, _TXN_RANGE_DAYS + 1)))
 
     return {
         "transaction_id": transaction_id,
         "date": random_date,
-        "payment_method": fake.random_element(
-            elements=("Credit Card", "Debit Card",
-                      "Cash", "Online Transfer", "Check", "Mobile Payment")),
-        "customer_id": np.random.randint(0, 3000)
+        "payment_method": fake.random_element(elements=PAYMENT_METHODS),
+        "customer_id": int(_RNG.integers(0, 3000))
+    }
+
+
+def generate_transactions(n):
+    """
+    Generate fake data for `n` transactions at once.
+
+    Parameters:
+    - n: Number of transactions to generate.
+
+    Returns:
+    - Dictionary mapping each transaction column to an array of length n,
+      with transaction IDs 0 to n - 1. No two transactions share the same
+      customer, date and payment method.
+    """
+    data = {
+        "transaction_id": np.arange(n),
+        "date": _random_dates(_TXN_START, _TXN_RANGE_DAYS, n),
+        "payment_method": _RNG.choice(PAYMENT_METHODS, n),
+        "customer_id": _RNG.integers(0, 3000, n)
     }
+    # Redraw the dates of transactions repeating a natural key
+    while True:
+        duplicated = pd.DataFrame(data).duplicated(
+            ["customer_id", "date", "payment_method"]).values
+        if not duplicated.any():
+            return data
+        data["date"][duplicated] = _random_dates(
+            _TXN_START, _TXN_RANGE_DAYS, duplicated.sum())
 
 
 def generate_date(date_id):
@@ -125,26 +253,59 @@ def generate_date(date_id):
     Returns:
     - Dictionary containing fake data for a date.
     """
-    start_date = datetime(2000, 1, 1)
-    current_date = start_date + timedelta(days=date_id)
+    current_date = _DATE_START + timedelta(days=date_id)
 
     # Extract date components
     return {
         "date_id": date_id,
-        "date": current_date.strftime("%Y-%m-%d"),
+        "date": current_date,
         "month": current_date.month,
-        "month_name": current_date.strftime("%B"),
         "year": current_date.year,
         "quarter": (current_date.month - 1) // 3 + 1,
         "day_of_month": current_date.day,
         "day_of_year": current_date.timetuple().tm_yday,
         "day_of_week_number": current_date.weekday() + 1,
-        "day_of_week_name": current_date.strftime("%A"),
         "week_of_year": current_date.isocalendar()[1],
         "week_of_month": (current_date.day - 1) // 7 + 1
     }
 
 
+def generate_date_range(n, start=_DATE_START):
+    """
+    Generate the data of `n` consecutive dates at once.
+
+    Vectorized counterpart of `generate_date`: all components are computed
+    with array operations over a `DatetimeIndex` starting at `start`. Date
+    IDs count the days since 2000-01-01 whatever the start, so the output
+    matches `generate_date(date_id)` for every row.
+
+    Parameters:
+    - n: Number of dates to generate.
+    - start: First date of the range, 2000-01-01 by default.
+
+    Returns:
+    - Dictionary mapping each date column to a NumPy array of length n.
+    """
+    offset = (start - _DATE_START).days
+    date_id = np.arange(offset, offset + n)
+    idx = pd.DatetimeIndex(np.datetime64(_DATE_START, 'D')
+                           + date_id.astype('timedelta64[D]'))
+    month = idx.month.values
+
+    return {
+        "date_id": date_id,
+        "date": idx.values.astype('datetime64[D]'),
+        "month": month,
+        "year": idx.year.values,
+        "quarter": (month - 1) // 3 + 1,
+        "day_of_month": idx.day.values,
+        "day_of_year": idx.dayofyear.values,
+        "day_of_week_number": idx.dayofweek.values + 1,
+        "week_of_year": idx.isocalendar().week.values.astype(np.int64),
+        "week_of_month": (idx.day.values - 1) // 7 + 1
+    }
+
+
 def generate_sales():
     """
     Generate fake data for sales.
@@ -153,6 +314,6 @@ def generate_sales():
     - Dictionary containing fake data for sales.
     """
     return {
-        "product_id": np.random.randint(0, 5000),
-        "quantity": np.random.randint(1, 20),
+        "product_id": int(_RNG.integers(0, 5000)),
+        "quantity": int(_RNG.integers(1, 20)),
     }
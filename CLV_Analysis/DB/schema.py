@@ -11,28 +11,143 @@ Classes:
 - Transaction: Represents a transaction in the company.
 - Date: Represents a date in the company.
 - Sale: Represents a sale in the company.
+- BulkInsertMixin: Adds batched bulk inserts to all models.
+
+Functions:
+- init_schema: Creates the tables of the models, once per process.
+- strict: Makes a query raise on any relationship it does not load explicitly.
+- core_insert: Inserts rows through the Core table, bypassing the ORM session.
+- bulk_load: Inserts the rows of any iterable, committing every batch.
+- sku_index: Maps every product SKU to its product ID.
+- insert_new_transactions: Inserts the transactions that do not exist yet.
+- populate_date_dimension: Fills the date table for a range of days.
+- dump_sales_parquet: Exports the sales fact table to a Parquet file.
+- load_sales_parquet: Appends the sales facts of a Parquet file.
 
 Note:
 - These classes are SQLAlchemy declarative base classes, allowing for easy interaction
   with the database through an ORM (Object-Relational Mapping).
+- Primary keys are generated by the database: the ROWID on SQLite, the
+  `<column>_seq` sequences on PostgreSQL and DuckDB. Rows passed to the insert
+  helpers should leave them out, unless other loaded rows reference the IDs.
 """
 
+import functools
 import logging
+import os
+import pandas as pd
 from ..Logger.logger import CustomFormatter
-from sqlalchemy import create_engine
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from .sql_interactions import CONNECTION_PRAGMAS
+from sqlalchemy import case, create_engine, event, insert, make_url, select, text
+from sqlalchemy import (Column, Enum, Integer, SmallInteger, String, Float, ForeignKey, Index,
+                        Sequence, UniqueConstraint)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy import Date as SADate
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.orm import raiseload, relationship, sessionmaker
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
-ch = logging.StreamHandler()
-ch.setLevel(logging.DEBUG)
-logger.addHandler(ch)
+if not logger.handlers:
+    ch = logging.StreamHandler()
+    ch.setLevel(logging.DEBUG)
+    logger.addHandler(ch)
+
+BULK_INSERT_BATCH_SIZE = 1000
+# Rows committed per transaction by `bulk_load`, tunable per backend
+BULK_LOAD_BATCH_SIZE = int(os.getenv('CLV_BULK_LOAD_BATCH_SIZE', 10_000))
+
+# Columns identifying a transaction besides its ID
+TRANSACTION_NATURAL_KEY = ('customer_id', 'date', 'payment_method')
+
+# Allowed values of the enumerated columns, also used by the data generator
+GENDERS = ("Female", "Male", "Prefer Not To Say", "Other")
+PAYMENT_METHODS = ("Credit Card", "Debit Card", "Cash", "Online Transfer",
+                   "Check", "Mobile Payment")
+
+MONTH_NAMES = ("January", "February", "March", "April", "May", "June",
+               "July", "August", "September", "October", "November",
+               "December")
+WEEKDAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday",
+                 "Saturday", "Sunday")
+
+# Database of the models, e.g. `duckdb:///clv.duckdb` for analytics reads
+# (requires the optional `duckdb-engine` package)
+DB_URL = os.getenv('CLV_DB_URL', 'sqlite:///temp.db')
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Configures every new SQLite connection of the engine like the API pool
+    connections: WAL journaling, synchronous=NORMAL, in-memory temp tables,
+    a large page cache and memory-mapped I/O. Commits of bulk loads then no
+    longer wait for a full fsync each.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL;")
+    for pragma in CONNECTION_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+@functools.lru_cache(maxsize=None)
+def _bootstrap(url=DB_URL):
+    """
+    Creates the engine and the session factory of a database, once per URL.
+
+    Sessions of the factory keep their objects loaded after a commit and
+    do not flush pending objects before every query, so bulk loaders do
+    not pay extra SELECTs:
+    `with SessionLocal() as s: s.execute(insert(Sale), rows)`
+
+    Parameters:
+    - url: The SQLAlchemy URL of the database.
+
+    Returns:
+    - Tuple of the engine and its session factory.
+    """
+    sqlite = make_url(url).get_backend_name() == 'sqlite'
+    engine = create_engine(url,
+                           connect_args=({'check_same_thread': False}
+                                         if sqlite else {}),
+                           insertmanyvalues_page_size=BULK_INSERT_BATCH_SIZE)
+    if sqlite:
+        event.listen(engine, "connect", set_sqlite_pragmas)
+    session_factory = sessionmaker(bind=engine, expire_on_commit=False,
+                                   autoflush=False)
+    return engine, session_factory
+
+
+engine, SessionLocal = _bootstrap()
+
+
+class BulkInsertMixin:
+    """
+    Adds batched bulk inserts to the models.
+    """
+
+    @classmethod
+    def bulk_insert(cls, session, mappings, batch_size=BULK_INSERT_BATCH_SIZE):
+        """
+        Inserts the given rows with `session.execute(insert(cls), ...)`.
 
-engine = create_engine('sqlite:///temp.db')
-Base = declarative_base()
+        Each batch is sent as multi-row INSERT statements instead of one
+        statement per object, which is much faster than `session.add()`
+        loops. Prefer it over `add_all` for loading data.
+
+        Parameters:
+        - session: The SQLAlchemy session to execute the inserts in.
+        - mappings: List of dictionaries mapping column names to values.
+        - batch_size: Number of rows sent per `execute` call.
+        """
+        for start in range(0, len(mappings), batch_size):
+            session.execute(insert(cls), mappings[start:start + batch_size])
+
+
+Base = declarative_base(cls=BulkInsertMixin)
 
 
 class Product(Base):
@@ -41,16 +156,16 @@ class Product(Base):
 
     Attributes:
     - product_id: Primary key identifying the product.
-    - SKU: Stock Keeping Unit for the product.
+    - SKU: Stock Keeping Unit for the product, unique.
     - product_category: Category of the product.
     - producer_country: Country where the product is produced.
     - price: Price of the product.
     """
     __tablename__ = "product"
 
-    product_id = Column(Integer, primary_key=True)
-    SKU = Column(String)
-    product_category = Column(String)
+    product_id = Column(Integer, Sequence('product_id_seq'), primary_key=True)
+    SKU = Column(String(32), unique=True, index=True, nullable=False)
+    product_category = Column(String(64))
     producer_country = Column(String)
     price = Column(Float)
 
@@ -70,21 +185,26 @@ class Customer(Base):
     - address: Address of the customer.
     - zip_code: ZIP code of the customer.
     - birthday: Birthday of the customer.
-    - gender: Gender of the customer.
+    - gender: Gender of the customer, one of `GENDERS`.
+    - transactions: Transactions of the customer.
     """
     __tablename__ = "customer"
 
-    customer_id = Column(Integer, primary_key=True)
+    customer_id = Column(Integer, Sequence('customer_id_seq'), primary_key=True)
     customer_name = Column(String)
     customer_surname = Column(String)
-    email = Column(String)
-    phone = Column(String)
+    email = Column(String(254))
+    phone = Column(String(32))
     country = Column(String)
     city = Column(String)
     address = Column(String)
-    zip_code = Column(String)
-    birthday = Column(DateTime)
-    gender = Column(String)
+    zip_code = Column(String(16))
+    birthday = Column(SADate)
+    gender = Column(Enum(*GENDERS, name='gender', native_enum=False,
+                         length=20, validate_strings=True))
+
+    transactions = relationship("Transaction", back_populates="customers",
+                                lazy="selectin")
 
 
 class Transaction(Base):
@@ -94,17 +214,28 @@ class Transaction(Base):
     Attributes:
     - transaction_id: Primary key identifying the transaction.
     - date: Date of the transaction.
-    - payment_method: Payment method used for the transaction.
+    - payment_method: Payment method used for the transaction, one of
+      `PAYMENT_METHODS`.
     - customer_id: Foreign key linking to the Customer entity.
+
+    The customer, date and payment method identify a transaction, so
+    loading the same transactions again can skip the existing ones.
     """
     __tablename__ = "transactions"
+    __table_args__ = (
+        UniqueConstraint(*TRANSACTION_NATURAL_KEY, name='uq_tx_natural'),
+    )
 
-    transaction_id = Column(Integer, primary_key=True)
-    date = Column(DateTime)
-    payment_method = Column(String)
+    transaction_id = Column(Integer, Sequence('transaction_id_seq'), primary_key=True)
+    date = Column(SADate)
+    payment_method = Column(Enum(*PAYMENT_METHODS, name='payment_method',
+                                 native_enum=False, length=16,
+                                 validate_strings=True))
 
-    customer_id = Column(Integer, ForeignKey('customer.customer_id'))
-    customers = relationship("Customer", backref="transactions")
+    customer_id = Column(Integer, ForeignKey('customer.customer_id'),
+                         index=True)
+    customers = relationship("Customer", back_populates="transactions",
+                             lazy="joined")
 
 
 class Date(Base):
@@ -115,30 +246,49 @@ class Date(Base):
     - date_id: Primary key identifying the date.
     - date: Date value.
     - month: Month of the date.
-    - month_name: Name of the month.
+    - month_name: Name of the month, derived from `month`.
     - year: Year of the date.
     - quarter: Quarter of the date.
     - day_of_month: Day of the month.
     - day_of_year: Day of the year.
     - day_of_week_number: Day of the week (numeric representation).
-    - day_of_week_name: Name of the day of the week.
+    - day_of_week_name: Name of the day of the week, derived from
+      `day_of_week_number`.
     - week_of_year: Week of the year.
     - week_of_month: Week of the month.
     """
     __tablename__ = "date"
 
-    date_id = Column(Integer, primary_key=True)
-    date = Column(DateTime)
-    month = Column(Integer)
-    month_name = Column(String)
-    year = Column(Integer)
-    quarter = Column(Integer)
-    day_of_month = Column(Integer)
-    day_of_year = Column(Integer)
-    day_of_week_number = Column(Integer)
-    day_of_week_name = Column(String)
-    week_of_year = Column(Integer)
-    week_of_month = Column(Integer)
+    date_id = Column(Integer, Sequence('date_id_seq'), primary_key=True)
+    date = Column(SADate, index=True)
+    month = Column(SmallInteger)
+    year = Column(Integer, index=True)
+    quarter = Column(SmallInteger, index=True)
+    day_of_month = Column(SmallInteger)
+    day_of_year = Column(SmallInteger)
+    day_of_week_number = Column(SmallInteger)
+    week_of_year = Column(SmallInteger)
+    week_of_month = Column(SmallInteger)
+
+    # The names are looked up from the numbers instead of being stored
+    @hybrid_property
+    def month_name(self):
+        return None if self.month is None else MONTH_NAMES[self.month - 1]
+
+    @month_name.expression
+    def month_name(cls):
+        return case(dict(enumerate(MONTH_NAMES, 1)), value=cls.month)
+
+    @hybrid_property
+    def day_of_week_name(self):
+        if self.day_of_week_number is None:
+            return None
+        return WEEKDAY_NAMES[self.day_of_week_number - 1]
+
+    @day_of_week_name.expression
+    def day_of_week_name(cls):
+        return case(dict(enumerate(WEEKDAY_NAMES, 1)),
+                    value=cls.day_of_week_number)
 
 
 class Sale(Base):
@@ -154,18 +304,217 @@ class Sale(Base):
     - date_id: Foreign key linking to the Date entity.
     """
     __tablename__ = "sales_fact"
+    __table_args__ = (
+        # RFM queries group the sales of a customer by date and product
+        Index('ix_sale_customer_date', 'customer_id', 'date_id'),
+        Index('ix_sale_customer_product', 'customer_id', 'product_id'),
+    )
 
-    sales_id = Column(Integer, primary_key=True)
-    transaction_id = Column(Integer, ForeignKey('transactions.transaction_id'))
-    product_id = Column(Integer, ForeignKey('product.product_id'))
+    sales_id = Column(Integer, Sequence('sales_id_seq'), primary_key=True)
+    transaction_id = Column(Integer, ForeignKey('transactions.transaction_id'),
+                            index=True)
+    product_id = Column(Integer, ForeignKey('product.product_id'), index=True)
+    # Indexed by the composite indexes above, which lead with it
     customer_id = Column(Integer, ForeignKey('customer.customer_id'))
     quantity = Column(Integer)
-    date_id = Column(Integer, ForeignKey('date.date_id'))
+    date_id = Column(Integer, ForeignKey('date.date_id'), index=True)
+
+    # Many-to-one relationships are loaded in the same query as the sale
+    transaction = relationship("Transaction", lazy="joined")
+    product = relationship("Product", lazy="joined")
+    customer = relationship("Customer", lazy="joined")
+    date = relationship("Date", lazy="joined")
+
+
+# Indexes no longer defined by the models, e.g. the single-column index of
+# Sale.customer_id, which the composite indexes leading with it made redundant
+OBSOLETE_INDEXES = ('ix_sales_fact_customer_id',)
+
+
+@functools.lru_cache(maxsize=None)
+def init_schema(engine=engine):
+    """
+    Creates the tables and indexes of all models that do not exist yet.
+
+    `create_all` only creates the indexes of new tables, so the indexes of
+    existing tables are created separately with `CREATE INDEX IF NOT
+    EXISTS`, which also works on backends without index reflection. Indexes
+    of `OBSOLETE_INDEXES`, left by older versions of the models, are dropped.
+
+    Called explicitly by the entry points instead of at import time, so
+    importing the models does not touch the database, unless the
+    `CLV_CREATE_SCHEMA` environment variable is `1`. Subsequent calls for
+    the same engine are no-ops.
+
+    Parameters:
+    - engine: The SQLAlchemy engine of the target database.
+    """
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                conn.execute(CreateIndex(index, if_not_exists=True))
+        for name in OBSOLETE_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
+def core_insert(model, rows, chunk=5000, engine=engine):
+    """
+    Inserts rows into the table of a model with SQLAlchemy Core.
+
+    Unlike `Model.bulk_insert`, no session is involved: the rows are sent
+    to `model.__table__.insert()` in chunks, all within one transaction.
+    Use it for large loads such as the sales facts.
 
-    transaction = relationship("Transaction")
-    product = relationship("Product")
-    customer = relationship("Customer")
-    date = relationship("Date")
+    Parameters:
+    - model: The model whose table to insert into, e.g. `Sale`.
+    - rows: List of dictionaries mapping column names to values.
+    - chunk: Number of rows sent per `execute` call.
+    - engine: The SQLAlchemy engine of the target database.
+    """
+    table = model.__table__
+    with engine.begin() as conn:
+        for start in range(0, len(rows), chunk):
+            conn.execute(table.insert(), rows[start:start + chunk])
+
+
+def bulk_load(model, rows, batch_size=BULK_LOAD_BATCH_SIZE):
+    """
+    Inserts the rows of an iterable, committing every `batch_size` rows.
+
+    The rows are consumed lazily, so generators of any length can be loaded
+    without being materialized in memory.
+
+    Parameters:
+    - model: The model whose table to insert into, e.g. `Sale`.
+    - rows: Iterable of dictionaries mapping column names to values.
+    - batch_size: Number of rows inserted and committed per transaction,
+      `CLV_BULK_LOAD_BATCH_SIZE` or 10000 by default.
+
+    Returns:
+    - The number of inserted rows.
+    """
+    inserted = 0
+    batch = []
+    with SessionLocal() as session:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                session.execute(insert(model), batch)
+                session.commit()
+                inserted += len(batch)
+                batch.clear()
+        if batch:
+            session.execute(insert(model), batch)
+            session.commit()
+            inserted += len(batch)
+    return inserted
+
+
+def sku_index(session):
+    """
+    Maps every product SKU to its product ID with a single query.
+
+    Build it once before an ingest loop and resolve the product IDs from it,
+    instead of querying the product of every sale by its SKU.
+
+    Parameters:
+    - session: The SQLAlchemy session to query in.
+
+    Returns:
+    - Dictionary mapping each SKU to its product ID.
+    """
+    return dict(session.execute(select(Product.SKU, Product.product_id)).all())
+
+
+def insert_new_transactions(rows, engine=engine):
+    """
+    Inserts transactions, skipping those whose natural key already exists.
+
+    Uses SQLite's `INSERT ... ON CONFLICT DO NOTHING` on the
+    `(customer_id, date, payment_method)` constraint, so loading the same
+    data twice is a no-op and the rows are still sent in full batches.
+
+    Parameters:
+    - rows: List of dictionaries mapping column names to values.
+    - engine: The SQLAlchemy engine of the target database.
+    """
+    statement = sqlite_insert(Transaction).on_conflict_do_nothing(
+        index_elements=TRANSACTION_NATURAL_KEY)
+    with engine.begin() as conn:
+        conn.execute(statement, rows)
+
+
+def populate_date_dimension(engine, start, end):
+    """
+    Fills the date table with every day from `start` to `end`, inclusive.
+
+    The columns are computed with vectorized pandas operations by
+    `generate_date_range` and written with multi-row INSERTs, so no model
+    instance is created per day.
+
+    Parameters:
+    - engine: The SQLAlchemy engine of the target database.
+    - start: First date to insert.
+    - end: Last date to insert.
+    """
+    # Imported here, so the models do not load Faker and the generator's
+    # name pools on import
+    from .data_generator import generate_date_range
+
+    df = pd.DataFrame(generate_date_range((end - start).days + 1, start))
+    df["date"] = df["date"].dt.date
+    df.to_sql(Date.__tablename__, engine, if_exists='append', index=False,
+              method='multi', chunksize=1000)
+
+
+def dump_sales_parquet(engine, path):
+    """
+    Exports the sales fact table to a zstd-compressed Parquet file.
+
+    Analyses reading the columnar file skip SQLite entirely.
+
+    Parameters:
+    - engine: The SQLAlchemy engine of the source database.
+    - path: Path of the Parquet file to write.
+    """
+    pd.read_sql_table(Sale.__tablename__, engine).to_parquet(
+        path, compression='zstd', index=False)
+
+
+def load_sales_parquet(engine, path):
+    """
+    Appends the sales facts of a Parquet file to the sales fact table.
+
+    Parameters:
+    - engine: The SQLAlchemy engine of the target database.
+    - path: Path of the Parquet file to read.
+    """
+    pd.read_parquet(path).to_sql(Sale.__tablename__, engine,
+                                 if_exists='append', index=False,
+                                 method='multi', chunksize=5000)
+
+
+def strict(query, *loads):
+    """
+    Applies the given loader options and `raiseload('*')` to a query.
+
+    Every relationship that is not loaded by one of `loads` raises an error
+    when accessed, instead of silently issuing one SELECT per row (N+1).
+
+    Example:
+        strict(session.query(Sale), selectinload(Sale.customer)).all()
+
+    Parameters:
+    - query: The SQLAlchemy query or select statement.
+    - *loads: Loader options, e.g. `selectinload(Sale.customer)`.
+
+    Returns:
+    - The query with the loader options applied.
+    """
+    return query.options(*loads, raiseload('*'))
 
 
-Base.metadata.create_all(engine)
+# Opt-in schema creation on import, e.g. for notebooks
+if os.getenv('CLV_CREATE_SCHEMA') == '1':
+    init_schema()
@@ -8,15 +8,22 @@ Classes:
 - SqlHandler: Handles SQLite database operations, including table manipulation
   and data import/export.
 
+Functions:
+- connect: Opens an asynchronous connection used by the API connection pool.
+- set_page_size: Converts the database file to the configured page size.
+- build_query: Builds (and caches) the SQL text of a CRUD statement.
+
 Note:
 - This module assumes that the database connection is established
   using the SqlHandler class and follows a specific structure.
 """
 
 import sqlite3
+import aiosqlite
+import contextlib
+import functools
 import logging
 import pandas as pd
-import numpy as np
 import os
 from ..Logger import CustomFormatter
 
@@ -28,6 +35,124 @@ ch.setFormatter(CustomFormatter())
 logger.addHandler(ch)
 
 
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA cache_size=-131072;",
+    "PRAGMA mmap_size=268435456;",
+)
+# Connection settings of SqlHandler.initial_load: no rollback journal, no
+# fsync and a single lock held for the whole load
+INITIAL_LOAD_PRAGMAS = (
+    "PRAGMA locking_mode=EXCLUSIVE;",
+    "PRAGMA journal_mode=OFF;",
+    "PRAGMA synchronous=OFF;",
+)
+PAGE_SIZE = 8192
+# Bound parameters per statement allowed by every SQLite build (the default
+# SQLITE_MAX_VARIABLE_NUMBER before 3.32), see SqlHandler.insert_many
+SQLITE_MAX_VARIABLES = 999
+
+
+async def connect(db_name: str) -> aiosqlite.Connection:
+    """
+    Opens an asynchronous connection to the specified SQLite database.
+
+    Used as the connection factory of the API connection pool, so every
+    pooled connection is configured the same way: WAL journaling (readers
+    are not blocked by a writer and commits need a single fsync),
+    synchronous=NORMAL, in-memory temp tables, a 128 MB page cache and
+    256 MB of memory-mapped I/O, so hot pages are read without syscalls.
+
+    Args:
+        db_name (str): Path to the SQLite database file.
+
+    Returns:
+        aiosqlite.Connection: Open connection returning rows as dictionaries.
+    """
+    conn = await aiosqlite.connect(db_name)
+    conn.row_factory = aiosqlite.Row  # Return rows as dictionaries
+    if db_name != ':memory:':
+        # WAL is not available for in-memory databases
+        await conn.execute("PRAGMA journal_mode=WAL;")
+    for pragma in CONNECTION_PRAGMAS:
+        await conn.execute(pragma)
+    return conn
+
+
+async def set_page_size(db_name: str, page_size: int = PAGE_SIZE) -> None:
+    """
+    Converts the database file to the given page size, if it differs.
+
+    The page size of an existing database only changes when it is rebuilt
+    by `VACUUM`, which is not possible in WAL mode, so the journal mode is
+    switched back to DELETE for the rebuild. `connect` re-enables WAL.
+
+    The rebuild rewrites the whole file and needs the database to itself,
+    so it is a one-off migration run by `schema_builder.py` and `seed.py`,
+    not by the API workers. If another connection has the database open,
+    the conversion is skipped with a warning.
+
+    Args:
+        db_name (str): Path to the SQLite database file.
+        page_size (int): Page size in bytes, a power of two.
+    """
+    if db_name == ':memory:':
+        return
+    async with aiosqlite.connect(db_name) as conn:
+        async with conn.execute("PRAGMA page_size;") as db_cursor:
+            (current_size,) = await db_cursor.fetchone()
+        if current_size == page_size:
+            return
+        try:
+            await conn.execute("PRAGMA journal_mode=DELETE;")
+            await conn.execute(f"PRAGMA page_size={page_size};")
+            await conn.execute("VACUUM;")
+        except sqlite3.OperationalError as error:
+            logger.warning(f'Page size not changed from {current_size}: {error}')
+            return
+    logger.info(f'Page size changed from {current_size} to {page_size}')
+
+
+# SQL templates of the CRUD statements run by the API
+QUERY_TEMPLATES = {
+    "select_by_id": "SELECT * FROM {table} WHERE {table_id} = ?;",
+    "select_many": "SELECT * FROM {table} WHERE {table_id} >= ? LIMIT ?;",
+    "delete_by_id": "DELETE FROM {table} WHERE {table_id} = ?;",
+    "update_by_id": "UPDATE {table} SET {assignments} WHERE {table_id} = ?;",
+    "insert": "INSERT INTO {table} ({columns}) VALUES ({placeholders});",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def build_query(operation: str, table_name: str, table_id: str = None,
+                columns: tuple = ()) -> str:
+    """
+    Builds the SQL text of a CRUD statement.
+
+    The text is cached per `(operation, table, id column, columns)`, so
+    repeated requests skip the string formatting and always hand sqlite3
+    the same statement, which its per-connection statement cache then
+    reuses without parsing it again.
+
+    Args:
+        operation (str): Key of the statement in `QUERY_TEMPLATES`.
+        table_name (str): Name of the table the statement operates on.
+        table_id (str): Name of the column representing the ID in the table.
+        columns (tuple): Columns inserted or updated by the statement.
+
+    Returns:
+        str: Parameterized SQL statement.
+    """
+    return QUERY_TEMPLATES[operation].format(
+        table=table_name,
+        table_id=table_id,
+        columns=", ".join(columns),
+        placeholders=", ".join(len(columns) * "?"),
+        assignments=", ".join(f"{column} = ?" for column in columns),
+    )
+
+
 class SqlHandler:
     """
     Handles SQLite database operations including
@@ -37,12 +162,19 @@ class SqlHandler:
         """
         Initializes the SqlHandler object.
 
+        The connection is configured like the API pool connections of
+        `connect`, so the single commit of a bulk load needs no full fsync
+        and the load is not slowed down by a small page cache.
+
         Args:
             dbname (str): Name of the SQLite database.
             table_name (str or list): Name of the table(s) to be operated upon.
         """
         self.cnxn = sqlite3.connect(f'{dbname}.db')
         self.cursor = self.cnxn.cursor()
+        self.cursor.execute("PRAGMA journal_mode=WAL;")
+        for pragma in CONNECTION_PRAGMAS:
+            self.cursor.execute(pragma)
         self.dbname = dbname
         self.table_name = table_name
 
@@ -71,6 +203,75 @@ class SqlHandler:
 
         return column_names
 
+    def is_empty(self) -> bool:
+        """
+        Checks whether the specified table has no rows.
+
+        Returns:
+            bool: True if the table is empty.
+        """
+        self.cursor.execute(f"SELECT 1 FROM {self.table_name} LIMIT 1;")
+        return self.cursor.fetchone() is None
+
+    @contextlib.contextmanager
+    def initial_load(self, tables=()):
+        """
+        Runs the inserts of the block without a rollback journal and fsync.
+
+        Meant for the first load into empty tables: the connection takes an
+        exclusive lock and sets `INITIAL_LOAD_PRAGMAS`, which makes the
+        inserts of `insert_many` about a third faster. If the block
+        succeeds, the changes are committed. Either way the connection goes
+        back to normal locking, WAL and synchronous=NORMAL.
+
+        Without a journal a failed load cannot be rolled back, so the rows
+        of `tables` are deleted and committed before the error is raised
+        again. The tables are then empty, and the load can simply be rerun.
+
+        The journal mode can only leave WAL while no other connection has
+        the database open. Otherwise the load keeps the settings of the
+        constructor and a warning is logged.
+
+        Args:
+            tables (iterable of str): The empty tables loaded in the block.
+
+        Raises:
+            RuntimeError: If the load failed and its rows could not be
+            deleted. The database must then be recreated.
+
+        Note:
+            - A crash or power loss during the load can corrupt the
+            database, so only use it on data that can be loaded again.
+        """
+        try:
+            for pragma in INITIAL_LOAD_PRAGMAS:
+                self.cursor.execute(pragma)
+        except sqlite3.OperationalError as error:
+            logger.warning(f'initial load settings not applied: {error}')
+            self.cursor.execute("PRAGMA locking_mode=NORMAL;")
+            self.cursor.execute("PRAGMA journal_mode=WAL;")
+        try:
+            yield self
+            self.cnxn.commit()
+        except BaseException:
+            logger.error(f'the initial load failed, emptying {list(tables)}')
+            try:
+                for table_name in tables:
+                    self.cursor.execute(f"DELETE FROM {table_name};")
+                self.cnxn.commit()
+            except sqlite3.Error as error:
+                raise RuntimeError(
+                    f'The initial load failed and its rows could not be deleted ({error}). '
+                    f'Recreate the database before loading it again.') from error
+            raise
+        finally:
+            # Back to normal locking before WAL is entered again, otherwise
+            # the exclusive lock is kept while the database is in WAL mode
+            self.cursor.execute("PRAGMA locking_mode=NORMAL;")
+            self.cursor.execute("PRAGMA journal_mode=WAL;")
+            for pragma in CONNECTION_PRAGMAS:
+                self.cursor.execute(pragma)
+
     def truncate_table(self) -> None:
         """
         Truncates the specified table.
@@ -111,6 +312,10 @@ class SqlHandler:
         Inserts multiple rows into the specified table
         based on the given Pandas DataFrame.
 
+        The rows are written by `DataFrame.to_sql` with multi-row
+        `INSERT ... VALUES` statements, as many rows per statement as
+        `SQLITE_MAX_VARIABLES` allows, and committed once.
+
         Args:
             df (pd.DataFrame): Pandas DataFrame
             containing the data to be inserted.
@@ -119,38 +324,22 @@ class SqlHandler:
             Exception: If an error occurs
             while inserting the data into the table.
         """
-        df = df.replace(np.nan, None)  # for handling NULLS
-        df.rename(columns=lambda x: x.lower(), inplace=True)
+        df = df.rename(columns=lambda x: x.lower())
         columns = list(df.columns)
         logger.info(f'BEFORE the column intersection: {columns}')
         sql_column_names = [i.lower() for i in self.get_table_columns()]
         columns = list(set(columns) & set(sql_column_names))
         logger.info(f'AFTER the column intersection: {columns}')
-        ncolumns = list(len(columns)*'?')
         data_to_insert = df.loc[:, columns]
-
-        values = [tuple(i) for i in data_to_insert.values]
         logger.info(f'''the shape of the table
                     which is going to be imported {data_to_insert.shape}''')
 
-        if len(columns) > 1:
-            cols, params = ', '.join(columns), ', '.join(ncolumns)
-        else:
-            cols, params = columns[0], ncolumns[0]
-
-        logger.info(f'insert structure: colnames: {cols} params: {params}')
-        logger.info(values[0])
-        query = f"""INSERT INTO  {self.table_name}
-        ({cols}) VALUES ({params});"""
-
-        logger.info(f'QUERY: {query}')
-
-        self.cursor.executemany(query, values)
-        try:
-            for i in self.cursor.messages:
-                logger.info(i)
-        except:
-            pass
+        # to_sql binds NaN as NULL, and sends the rows in chunks that stay
+        # below the bound parameter limit of a single statement
+        chunksize = max(1, SQLITE_MAX_VARIABLES // len(columns))
+        logger.info(f'insert structure: colnames: {columns} rows per statement: {chunksize}')
+        data_to_insert.to_sql(self.table_name, self.cnxn, if_exists='append',
+                              index=False, method='multi', chunksize=chunksize)
 
         self.cnxn.commit()
 
@@ -193,13 +382,16 @@ class SqlHandler:
 
         return df
 
-    def select_by_id(id: int, db_name: str, table_name: str, table_id: str):
+    @staticmethod
+    async def select_by_id(conn: aiosqlite.Connection, id: int,
+                           table_name: str, table_id: str):
         """
         Selects a row from the specified table based on the given ID.
 
         Args:
+            conn (aiosqlite.Connection): Open connection to the database,
+            usually borrowed from the API connection pool.
             id (int): ID value to be used in the WHERE clause.
-            db_name (str): Name of the SQLite database.
             table_name (str): Name of the table to be queried.
             table_id (str): Name of the column
             representing the ID in the table.
@@ -207,31 +399,28 @@ class SqlHandler:
         Returns:
             dict: Dictionary containing the selected data.
         """
-        db = sqlite3.connect(db_name)
-        db.row_factory = sqlite3.Row  # Return rows as dictionaries
-        db_cursor = db.cursor()
-
-        query = f"""
-        SELECT * FROM {table_name} WHERE {table_id} = {id};
-        """
+        query = build_query("select_by_id", table_name, table_id)
         try:
-            db_cursor.execute(query)
-            selected_data = db_cursor.fetchone()
+            async with conn.execute(query, (id,)) as db_cursor:
+                selected_data = await db_cursor.fetchone()
             logger.info(f'Id {id} selected successfully')
-            return {"data": selected_data}
-        except Exception as e:
+            return {"data": dict(selected_data) if selected_data else None}
+        except aiosqlite.Error as e:
             logger.info(f"Error selecting id: {str(e)}")
+            raise
 
-    def select_many(start_id: int, head: int,
-                    db_name: str, table_name: str, table_id: str):
+    @staticmethod
+    async def select_many(conn: aiosqlite.Connection, start_id: int, head: int,
+                          table_name: str, table_id: str):
         """
         Selects multiple rows from the specified table
         based on the start ID and the number of rows.
 
         Args:
+            conn (aiosqlite.Connection): Open connection to the database,
+            usually borrowed from the API connection pool.
             start_id (int): Starting ID value for the selection.
             head (int): Number of rows to be retrieved.
-            db_name (str): Name of the SQLite database.
             table_name (str): Name of the table to be queried.
             table_id (str): Name of the column
             representing the ID in the table.
@@ -239,118 +428,164 @@ class SqlHandler:
         Returns:
             dict: Dictionary containing the selected data.
         """
-        db = sqlite3.connect(db_name)
-        db.row_factory = sqlite3.Row  # Return rows as dictionaries
-        db_cursor = db.cursor()
-
-        query = f"""
-        SELECT * FROM {table_name}
-        WHERE {table_id} >= {start_id} LIMIT {head+1};
-        """
+        query = build_query("select_many", table_name, table_id)
         try:
-            db_cursor.execute(query)
-            selected_data = db_cursor.fetchall()
+            async with conn.execute(query, (start_id, head + 1)) as db_cursor:
+                selected_data = await db_cursor.fetchall()
 
-            results = []
-            for row in selected_data:
-                result = dict(row)
-                results.append(result)
+            results = [dict(row) for row in selected_data]
 
             logger.info(f"""Rows starting from ID {start_id}
                         selected successfully""")
             return {"data": results}
-        except Exception as e:
+        except aiosqlite.Error as e:
             logger.info(f"Error selecting rows: {str(e)}")
+            raise
 
-    def delete_by_id(id: int, db_name: str, table_name: str, table_id: str):
+    @staticmethod
+    async def iter_many(conn: aiosqlite.Connection, start_id: int, head: int,
+                        table_name: str, table_id: str):
+        """
+        Yields the rows `select_many` would return, one at a time.
+
+        Rows are read from the cursor as SQLite produces them, so the
+        result set is never held in memory as a whole.
+
+        Args:
+            conn (aiosqlite.Connection): Open connection to the database,
+            usually borrowed from the API connection pool.
+            start_id (int): Starting ID value for the selection.
+            head (int): Number of rows to be retrieved.
+            table_name (str): Name of the table to be queried.
+            table_id (str): Name of the column
+            representing the ID in the table.
+
+        Yields:
+            dict: The selected rows.
+        """
+        query = build_query("select_many", table_name, table_id)
+        async with conn.execute(query, (start_id, head + 1)) as db_cursor:
+            async for row in db_cursor:
+                yield dict(row)
+
+    @staticmethod
+    async def delete_by_id(conn: aiosqlite.Connection, id: int,
+                           table_name: str, table_id: str):
         """
         Deletes a row from the specified table based on the given ID.
 
         Args:
+            conn (aiosqlite.Connection): Open connection to the database,
+            usually borrowed from the API connection pool.
             id (int): ID value to be used in the WHERE clause.
-            db_name (str): Name of the SQLite database.
             table_name (str): Name of the table to be deleted from.
             table_id (str): Name of the column
             representing the ID in the table.
         """
-        db = sqlite3.connect(db_name)
-        db_cursor = db.cursor()
-        query = f"""
-        DELETE FROM {table_name}
-        WHERE {table_id} = {id};
-        """
+        query = build_query("delete_by_id", table_name, table_id)
         try:
-            db_cursor.execute(query)
-            db.commit()
+            await conn.execute(query, (id,))
+            await conn.commit()
             logger.info(f'Id {id} deleted successfully')
-        except Exception as e:
+        except aiosqlite.Error as e:
             logger.info(f"Error deleting id: {str(e)}")
+            raise
 
-    def update_by_id(id: int, update_values: dict,
-                     db_name: str, table_name: str, table_id: str):
+    @staticmethod
+    async def update_by_id(conn: aiosqlite.Connection, id: int,
+                           update_values: dict,
+                           table_name: str, table_id: str):
         """
         Updates a row in the specified table
         based on the given ID and update values.
 
         Args:
+            conn (aiosqlite.Connection): Open connection to the database,
+            usually borrowed from the API connection pool.
             id (int): ID value to be used in the WHERE clause.
             update_values (dict): Dictionary containing column names as keys
             and new values as values.
-            db_name (str): Name of the SQLite database.
             table_name (str): Name of the table to be updated.
             table_id (str): Name of the column
             representing the ID in the table.
         """
-        db = sqlite3.connect(db_name)
-        db_cursor = db.cursor()
-
         update_values = update_values.model_dump(
             exclude_unset=True, exclude_defaults=True, exclude_none=True)
 
-        columns_to_update = ", ".join([f"{column} = '{update_values[column]}'"
-                                       for column in update_values.keys()])
-
-        query = f"""UPDATE {table_name}
-                    SET {columns_to_update}
-                    WHERE {table_id} = '{id}'"""
+        query = build_query("update_by_id", table_name, table_id,
+                            tuple(update_values))
         try:
-            db_cursor.execute(query)
-            db.commit()
-            db.close()
+            await conn.execute(query, (*update_values.values(), id))
+            await conn.commit()
             logger.info(f'''Row with ID {id}
                         updated successfully for specified columns''')
-        except Exception as e:
+        except aiosqlite.Error as e:
             logger.info(f"Error updating row: {str(e)}")
+            raise
 
-    def insert_by_id(insert_values: dict, db_name: str, table_name: str):
+    @staticmethod
+    async def insert_by_id(conn: aiosqlite.Connection, insert_values: dict,
+                           table_name: str):
         """
         Inserts a new row into the specified table based on the given values.
 
         Args:
+            conn (aiosqlite.Connection): Open connection to the database,
+            usually borrowed from the API connection pool.
             insert_values (dict): Dictionary containing column names as keys
             and values to be inserted as values.
-            db_name (str): Name of the SQLite database.
             table_name (str): Name of the table to insert the new row into.
         """
-        db = sqlite3.connect(db_name)
-        db_cursor = db.cursor()
-
         insert_values = insert_values.model_dump(
             exclude_unset=True, exclude_defaults=True, exclude_none=True)
 
-        columns = ', '.join(insert_values.keys())
-        values = ', '.join([f"'{value}'" for value in insert_values.values()])
-
-        query = f"""INSERT INTO {table_name} ({columns})
-                    VALUES ({values})"""
-
+        query = build_query("insert", table_name,
+                            columns=tuple(insert_values))
         try:
-            db_cursor.execute(query)
-            db.commit()
-            db.close()
+            await conn.execute(query, tuple(insert_values.values()))
+            await conn.commit()
             logger.info('Row inserted successfully')
-        except Exception as e:
+        except aiosqlite.Error as e:
             logger.info(f"Error inserting row: {str(e)}")
+            raise
+
+    @staticmethod
+    async def bulk_insert(conn: aiosqlite.Connection, rows: list,
+                          table_name: str, columns: list) -> int:
+        """
+        Inserts many rows into the specified table in a single transaction.
+
+        All rows are written with one executemany call between an explicit
+        BEGIN and COMMIT, so the journal is synced once per batch instead
+        of once per row.
+
+        Args:
+            conn (aiosqlite.Connection): Open connection to the database,
+            usually borrowed from the API connection pool.
+            rows (list): Pydantic models holding the values to be inserted,
+            or tuples of the values in the order of `columns`.
+            table_name (str): Name of the table to insert the rows into.
+            columns (list): Names of the columns to be filled, in the order
+            of the model fields.
+
+        Returns:
+            int: Number of inserted rows.
+        """
+        query = build_query("insert", table_name, columns=tuple(columns))
+        values = [tuple(row.model_dump(include=set(columns)).values())
+                  if hasattr(row, 'model_dump') else tuple(row)
+                  for row in rows]
+
+        try:
+            await conn.execute("BEGIN")
+            await conn.executemany(query, values)
+            await conn.commit()
+            logger.info(f'{len(values)} rows inserted successfully')
+            return len(values)
+        except aiosqlite.Error as e:
+            await conn.rollback()
+            logger.info(f"Error inserting rows: {str(e)}")
+            raise
 
     def execute_custom_query(self, query, conn_string='temp.db'):
         """
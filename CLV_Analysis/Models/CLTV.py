@@ -8,17 +8,354 @@ Classes:
 - CLTVModel: Customer Lifetime Value (CLTV) Model class.
 
 Note:
-- Ensure that the lifetimes, pandas, matplotlib, and warnings libraries are installed.
+- Ensure that the lifetimes, pandas, matplotlib, numba, joblib, and warnings libraries are installed.
+- numexpr is used for the sales amount when it is installed.
+- load_data(engine='adbc') requires the adbc-driver-sqlite and pyarrow libraries.
 - The CLTVModel class assumes a specific structure in the loaded database and data.
 """
 
+import functools
+import hashlib
+import os
 import sqlite3
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-from lifetimes.plotting import plot_frequency_recency_matrix, plot_probability_alive_matrix, plot_period_transactions
 from lifetimes import BetaGeoFitter, GammaGammaFitter
+from lifetimes.generate_data import beta_geometric_nbd_model
+from lifetimes.utils import ConvergenceError
+from scipy.optimize import minimize
+from joblib import Memory, Parallel, delayed
+from numba import get_num_threads
+from ._rfm_numba import (bgnbd_discounted_purchases, bgnbd_expected_purchases, bgnbd_negative_log_likelihood, filter_rfm, segment_totals,
+                         summarize_sorted)
 import warnings
 
+try:
+    import numexpr as ne
+except ImportError:  # numexpr is optional, the pandas expression is used without it
+    ne = None
+
+# Low-cardinality string columns of the loaded data, stored as integer-coded categories
+CATEGORICAL_COLUMNS = ('product_category', 'SKU')
+
+# ISO date strings of the loaded data, parsed once into datetime64 columns
+DATE_COLUMNS = ('date',)
+
+# Read-side tuning of the model's SQLite connection: a 256 MB page cache,
+# in-memory temp tables for the join and 1 GB of memory-mapped I/O
+READ_PRAGMAS = (
+    "PRAGMA cache_size=-262144;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA mmap_size=1073741824;",
+)
+
+# Sidecar file with the last fitted BG/NBD parameters, used to warm-start the next fit
+BGF_PARAMS_PATH = '.bgf_last_params.npy'
+
+# Directory of the Parquet copies of query results, see load_data(cache=True)
+CACHE_DIR = os.path.expanduser('~/.cache/cltv')
+
+# joblib cache of the fit results, keyed on the content of the model inputs, see fit_bgf_model(cache=True)
+FIT_CACHE = Memory(os.path.join(CACHE_DIR, 'fits'), verbose=0)
+
+
+@functools.lru_cache(maxsize=None)
+def _plotting():
+    """
+    Import matplotlib and the lifetimes plotting functions on first use.
+
+    Keeps them out of the module import, so scoring workflows without plots never load them.
+
+    Returns:
+        Tuple of (matplotlib.pyplot, lifetimes.plotting) modules.
+    """
+    import matplotlib.pyplot as plt
+    from lifetimes import plotting
+    return plt, plotting
+
+
+def _read_arrow(database_path, query):
+    """
+    Run a query through the ADBC SQLite driver and fetch its result as one Arrow table.
+
+    The driver is imported on first use, as it is only needed by load_data(engine='adbc').
+
+    Parameters:
+        - database_path (str): Path to the SQLite database file.
+        - query (str): SQL query to run.
+
+    Returns:
+        pyarrow.Table: Result of the query, built from columnar batches without Python row objects.
+    """
+    import adbc_driver_sqlite.dbapi
+
+    with adbc_driver_sqlite.dbapi.connect(database_path) as conn, conn.cursor() as cursor:
+        for pragma in READ_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.execute(query)
+        return cursor.fetch_arrow_table()
+
+
+def _fit_cohort(frequency, recency, T, monetary, bgf_penalizer, ggf_penalizer):
+    """
+    Fit the BG/NBD and Gamma-Gamma models of one cohort.
+
+    Runs in a joblib worker process, so it is a module-level function of plain arrays.
+
+    Returns:
+        Tuple of (BetaGeoFitter, GammaGammaFitter), or None if a model did not converge.
+    """
+    try:
+        bgf = BetaGeoFitter(penalizer_coef=bgf_penalizer).fit(frequency, recency, T)
+        ggf = GammaGammaFitter(penalizer_coef=ggf_penalizer).fit(frequency, monetary)
+    except ConvergenceError:
+        return None
+    return bgf, ggf
+
+
+def _minimize_bgnbd(frequency, recency, T, penalizer_coef, initial_params=None):
+    """
+    Minimize the bgnbd_negative_log_likelihood kernel.
+
+    Follows BetaGeoFitter.fit: the times are rescaled so the oldest customer has T = 1 and the log of
+    the parameters is optimized from 0.1.
+
+    Returns:
+        Tuple of (log parameters on the rescaled time axis, negative log-likelihood, Hessian, scale).
+
+    Raises:
+        ConvergenceError: If the optimizer does not converge.
+    """
+    scale = 1.0 / T.max()
+    args = (frequency, recency * scale, T * scale, penalizer_coef)
+    x0 = np.full(4, 0.1) if initial_params is None else initial_params
+    output = minimize(bgnbd_negative_log_likelihood, x0, args=args, jac=True, tol=1e-7)
+    if not output.success:
+        raise ConvergenceError("The model did not converge. Try adding a larger penalizer to see if that helps convergence.")
+
+    # Central differences of the analytic gradient, for the standard errors of the parameters
+    step = 1e-5
+    hessian = np.column_stack([
+        (bgnbd_negative_log_likelihood(output.x + h, *args)[1]
+         - bgnbd_negative_log_likelihood(output.x - h, *args)[1]) / (2 * step)
+        for h in np.eye(4) * step])
+    return output.x, output.fun, (hessian + hessian.T) / 2, scale
+
+
+def _fit_bgf(frequency, recency, T, penalizer_coef, engine, initial_params=None):
+    """
+    Fit the BG/NBD model on plain arrays and return its fit results.
+
+    Module-level and free of fitter objects, so the results can be stored by FIT_CACHE.
+
+    Returns:
+        Tuple of (log parameters on the rescaled time axis, negative log-likelihood, Hessian, scale).
+    """
+    if engine == 'numba':
+        return _minimize_bgnbd(frequency, recency, T, penalizer_coef, initial_params)
+    bgf = BetaGeoFitter(penalizer_coef=penalizer_coef).fit(frequency, recency, T, initial_params=initial_params)
+    log_params = np.log(bgf.params_.values * [1, bgf._scale, 1, 1])
+    return log_params, bgf._negative_log_likelihood_, bgf._hessian_, bgf._scale
+
+
+def _fit_ggf(frequency, monetary, penalizer_coef):
+    """
+    Fit the Gamma-Gamma model on plain arrays and return its fit results.
+
+    Returns:
+        Tuple of (parameters p, q and v, negative log-likelihood, Hessian).
+    """
+    ggf = GammaGammaFitter(penalizer_coef=penalizer_coef).fit(frequency, monetary)
+    return ggf.params_.values, ggf._negative_log_likelihood_, ggf._hessian_
+
+
+# The starting point changes the result only within the optimizer tolerance, so it is not part of the key
+_cached_fit_bgf = FIT_CACHE.cache(_fit_bgf, ignore=['initial_params'])
+_cached_fit_ggf = FIT_CACHE.cache(_fit_ggf)
+
+
+def _customer_lifetime_value(bgf, ggf, frequency, recency, T, monetary, time=12, freq="W", discount_rate=0.01):
+    """
+    Calculate the discounted CLTV of every customer on NumPy arrays.
+
+    Follows GammaGammaFitter.customer_lifetime_value of lifetimes, which needs pandas Series
+    and aligns them on every step. Here the cumulative purchases of all periods are predicted
+    in one broadcast (customers x periods) call, so the hypergeometric terms are evaluated once.
+    Module-level, so batches can run in joblib workers.
+
+    Parameters:
+        - bgf (lifetimes.BetaGeoFitter): Fitted BG/NBD model.
+        - ggf (lifetimes.GammaGammaFitter): Fitted Gamma-Gamma model.
+        - frequency, recency, T, monetary (np.ndarray): RFM values of the customers.
+        - time (int, optional): Number of months to predict. Default is 12.
+        - freq (str, optional): Unit of recency and T: "W", "M", "D" or "H". Default is "W" (weekly).
+        - discount_rate (float, optional): Monthly discount rate. Default is 0.01.
+
+    Returns:
+        np.ndarray: CLTV of every customer.
+    """
+    adjusted_monetary = ggf.conditional_expected_average_profit(frequency, monetary)
+    times, discount = _discount_schedule(time, freq, discount_rate)
+
+    cumulative = bgf.predict(times, frequency[:, None], recency[:, None], T[:, None])
+    # The predicted transactions are cumulative, so those of the previous period are subtracted
+    expected_transactions = np.diff(cumulative, axis=1)
+    return adjusted_monetary * (expected_transactions @ discount)
+
+
+def _gamma_gamma_profit(frequency, monetary, p, q, v):
+    """
+    Calculate the expected average profit per transaction of every customer.
+
+    The expression of GammaGammaFitter.conditional_expected_average_profit of lifetimes, on arrays
+    and already unpacked parameters: a weighted average of the monetary value and the population mean.
+
+    Returns:
+        np.ndarray: Expected average profit of every customer.
+    """
+    individual_weight = p * frequency / (p * frequency + q - 1)
+    population_mean = v * p / (q - 1)
+    return (1 - individual_weight) * population_mean + individual_weight * monetary
+
+
+def _customer_lifetime_value_numba(bgf_params, ggf_params, frequency, recency, T, monetary, time=12, freq="W", discount_rate=0.01):
+    """
+    Calculate the discounted CLTV of every customer like _customer_lifetime_value, with the
+    bgnbd_discounted_purchases kernel instead of the broadcast BetaGeoFitter prediction.
+
+    Takes the unpacked parameters instead of the fitters, so batches sent to joblib workers only
+    carry a few floats besides the arrays.
+
+    Parameters:
+        - bgf_params (tuple of float): r, alpha, a and b of the fitted BG/NBD model.
+        - ggf_params (tuple of float): p, q and v of the fitted Gamma-Gamma model.
+        - frequency, recency, T, monetary (np.ndarray): RFM values of the customers.
+        - time (int, optional): Number of months to predict. Default is 12.
+        - freq (str, optional): Unit of recency and T: "W", "M", "D" or "H". Default is "W" (weekly).
+        - discount_rate (float, optional): Monthly discount rate. Default is 0.01.
+
+    Returns:
+        np.ndarray: CLTV of every customer.
+    """
+    adjusted_monetary = _gamma_gamma_profit(frequency, monetary, *ggf_params)
+    times, discount = _discount_schedule(time, freq, discount_rate)
+    return adjusted_monetary * bgnbd_discounted_purchases(times, discount, frequency, recency, T, *bgf_params)
+
+
+@functools.lru_cache(maxsize=16)
+def _discount_schedule(time, freq, discount_rate):
+    """
+    Return the prediction times and discount factors of a CLTV horizon.
+
+    Cached, so the batches and repeated predictions of the same horizon share one read-only copy.
+
+    Parameters:
+        - time (int): Number of months to predict.
+        - freq (str): Unit of recency and T: "W", "M", "D" or "H".
+        - discount_rate (float): Monthly discount rate.
+
+    Returns:
+        Tuple of np.ndarray: The end of every month in the unit of freq, starting with 0, and the
+        discount factor of every month.
+    """
+    factor = {"W": 4.345, "M": 1.0, "D": 30, "H": 30 * 24}[freq]
+    periods = np.arange(1, time + 1) * factor
+    times = np.concatenate(([0.0], periods))
+    discount = (1 + discount_rate) ** -(periods / factor)
+    times.setflags(write=False)
+    discount.setflags(write=False)
+    return times, discount
+
+
+def _in_batches(func, arrays, batch_size, n_jobs=1):
+    """
+    Apply an element-wise function to contiguous slices of arrays and join the results.
+
+    Parameters:
+        - func (callable): Function of the sliced arrays returning one value per element.
+        - arrays (list of np.ndarray): Arrays of equal length.
+        - batch_size (int): Largest number of elements per slice.
+        - n_jobs (int, optional): Number of joblib worker threads. Default is 1, running in this thread.
+
+    Returns:
+        np.ndarray: Results of all slices, in order.
+
+    Note:
+        - The slices run in threads rather than processes: the NumPy and Numba code of the functions
+          releases the GIL, and worker processes started after a parallel Numba kernel on the TBB
+          threading layer keep the interpreter from exiting.
+    """
+    n_batches = max(1, -(-len(arrays[0]) // batch_size))
+    batches = zip(*(np.array_split(values, n_batches) for values in arrays))
+    if n_jobs == 1:
+        results = [func(*batch) for batch in batches]
+    else:
+        results = Parallel(n_jobs=n_jobs, prefer='threads')(delayed(func)(*batch) for batch in batches)
+    return np.concatenate([np.asarray(result) for result in results])
+
+
+def _for_repeat_customers(func, arrays, batch_size, n_jobs=1):
+    """
+    Apply a Gamma-Gamma based function to the repeat customers only, in batches.
+
+    The Gamma-Gamma model is only defined for customers with at least one repeat purchase, so
+    the others are not evaluated and get NaN. Without such customers no array is copied.
+
+    Parameters:
+        - func (callable): Function of the sliced arrays returning one value per customer.
+        - arrays (list of np.ndarray): Arrays of equal length, the frequency first.
+        - batch_size (int): Largest number of customers per slice.
+        - n_jobs (int, optional): Number of joblib worker threads. Default is 1, running in this thread.
+
+    Returns:
+        np.ndarray: Results of all customers, NaN for those without repeat purchases.
+    """
+    repeat = arrays[0] > 0
+    if repeat.all():
+        return _in_batches(func, arrays, batch_size, n_jobs)
+    if not repeat.any():
+        return np.full(len(repeat), np.nan)
+    repeat_results = _in_batches(func, [values[repeat] for values in arrays], batch_size, n_jobs)
+    results = np.full(len(repeat), np.nan, dtype=repeat_results.dtype)
+    results[repeat] = repeat_results
+    return results
+
+
+def _unique_rows(arrays):
+    """
+    Find the distinct rows of equal-length arrays, such as the (frequency, recency, T) of customers.
+
+    Parameters:
+        - arrays (list of np.ndarray): Float arrays of equal length.
+
+    Returns:
+        Tuple of (list of np.ndarray, np.ndarray): The columns of the distinct rows, and the position
+        of every original row among them, so results of the distinct rows are scattered back with
+        results[inverse].
+    """
+    unique, inverse = np.unique(np.column_stack(arrays), axis=0, return_inverse=True)
+    return [np.ascontiguousarray(unique[:, i]) for i in range(unique.shape[1])], inverse.reshape(-1)
+
+
+def _frame_column(name):
+    """
+    Build a read-only property returning a column of the DataFrame it was last bound to.
+
+    The column is looked up on every access, so it always reflects the current DataFrame
+    and no separate Series has to be kept in sync with it.
+
+    Parameters:
+        name (str): Name of the property.
+
+    Returns:
+        property: Returns None until a DataFrame column is bound with CLTVModel._bind_columns.
+    """
+    def get(self):
+        frame, colname = self._frame_columns.get(name, (None, None))
+        return None if frame is None else frame.get(colname)
+    return property(get)
+
+
 class CLTVModel:
     """
     Customer Lifetime Value (CLTV) Model class that calculates and predicts customer lifetime value.
@@ -26,6 +363,7 @@ class CLTVModel:
 
     Parameters:
         database_path (str): Path to the SQLite database file. Default is 'data.db'.
+        assume_unique_transactions (bool): Count sale rows instead of distinct transactions. Default is False.
 
     Attributes:
         conn (sqlite3.Connection): SQLite database connection.
@@ -51,37 +389,58 @@ class CLTVModel:
         segment (pd.Series): Series containing customer segments.
         bgf (lifetimes.BetaGeoFitter): Beta Geo Fitter model.
         ggf (lifetimes.GammaGammaFitter): Gamma-Gamma Fitter model.
+
+    Note:
+        The per-customer Series from total_transactions to cltv, and recency, T, frequency and monetary,
+        are read-only properties. They read their column from the DataFrame the last calculation wrote it to.
     """
 
-    def __init__(self, database_path='data.db'):
+    total_transactions = _frame_column('total_transactions')
+    total_sales_amount = _frame_column('total_sales_amount')
+    average_order_value = _frame_column('average_order_value')
+    purchase_frequency = _frame_column('purchase_frequency')
+    profit_margin = _frame_column('profit_margin')
+    customer_value = _frame_column('customer_value')
+    cltv = _frame_column('cltv')
+    recency = _frame_column('recency')
+    T = _frame_column('T')
+    frequency = _frame_column('frequency')
+    monetary = _frame_column('monetary')
+
+    def __init__(self, database_path='data.db', assume_unique_transactions=False):
         """
         Initialize the CLTVModel object.
 
         Parameters:
             database_path (str): Path to the SQLite database file. Default is 'data.db'.
+            assume_unique_transactions (bool): Promise that no transaction has more than one sale row, so the
+                pandas summaries count the rows of every customer instead of their distinct transactions.
+                Default is False, as a transaction of the default query has a row per product.
         """
+        self.database_path = database_path
+        self.assume_unique_transactions = assume_unique_transactions
         self.conn = sqlite3.connect(database_path)
+        for pragma in READ_PRAGMAS:
+            self.conn.execute(pragma)
         self.df = None
         self.sales_amount = None
         self.customer_summary = None  
+        self._frame_columns = {}
+        self._model_inputs = {}
         self.customer_summary_pr = None
         self.repeat_rate = None
-        self.total_transactions = None
-        self.total_sales_amount = None
-        self.purchase_frequency = None
-        self.average_order_value = None
         self.churn_rate = None
-        self.profit_margin = None
-        self.customer_value =  None
-        self.cltv = None
-        self.recency = None
-        self.T = None
-        self.frequency = None
-        self.monetary = None
         self.cltv_pred = None
         self.predicted_purchases = None
         self.segment = None
         self.bgf = BetaGeoFitter(penalizer_coef=0.001)
+        self._bgf_params_cache = None
+        self._ggf_params_cache = None
+        self._profit_cache = None
+        self._bgf_init_params = np.load(BGF_PARAMS_PATH) if os.path.exists(BGF_PARAMS_PATH) else None
+        self._fit_sample = None
+        self.cohort = None
+        self.cohort_models = {}
         self.ggf = GammaGammaFitter(penalizer_coef=0.01)
 
     def load_data(self, query='''
@@ -93,33 +452,172 @@ class CLTVModel:
             p.product_category,
             p.SKU,
             s.quantity,
-            p.price as unit_price
+            p.price as unit_price,
+            p.price * s.quantity as sales_amount
         FROM
             date d 
         JOIN
             sales_fact s ON d.date_id = s.date_id
         JOIN
             product p ON s.product_id = p.product_id;
-        '''):
+        ''', chunksize=None, dtype_backend=None, cache=False, customer_id_col='customer_id', engine='sqlite3'):
         """
         Load data from the database and set it as the DataFrame 'df'.
 
         Parameters:
-            query (str): SQL query to retrieve the data. Default is the provided query.
+            query (str): SQL query to retrieve the data. Default is the provided query,
+                which also computes the sales amount in SQLite.
+            chunksize (int, optional): Number of rows fetched at a time. Default is None, fetching all rows at once.
+            dtype_backend (str, optional): Backend of the loaded columns, 'numpy_nullable' or 'pyarrow'.
+                Default is None, loading NumPy columns. 'pyarrow' requires the pyarrow library. The Numba
+                kernels get the nullable and Arrow-backed columns as float64 arrays with NaN for missing values.
+            cache (bool, optional): Keep a Parquet copy of the result in CACHE_DIR and read it instead of
+                running the query again while the database is unchanged. Requires the pyarrow library.
+                Default is False.
+            customer_id_col (str, optional): Column name for customer ID. Default is 'customer_id'.
+            engine (str, optional): 'sqlite3' reads the rows through pd.read_sql_query, 'adbc' fetches
+                columnar Arrow batches through the ADBC SQLite driver, skipping the Python row objects.
+                'adbc' requires the adbc-driver-sqlite and pyarrow libraries and ignores chunksize.
+                Default is 'sqlite3'.
 
         Returns:
-            pd.DataFrame: Loaded DataFrame.
+            pd.DataFrame: Loaded DataFrame, sorted by customer ID. The string columns 'product_category'
+                and 'SKU' are categorical and the 'date' column is datetime64.
+
+        Raises:
+            ValueError: If engine is neither 'sqlite3' nor 'adbc'.
         """
-        self.df = pd.read_sql_query(query, self.conn)
+        if engine not in ('sqlite3', 'adbc'):
+            raise ValueError(f"The engine must be 'sqlite3' or 'adbc', got {engine!r}.")
+        if cache:
+            cache_path = self._cache_path(query, dtype_backend)
+            if os.path.exists(cache_path):
+                self.df = pd.read_parquet(cache_path, engine='pyarrow', memory_map=True)
+                return self.df
+
+        read_kwargs = {} if dtype_backend is None else {'dtype_backend': dtype_backend}
+        if engine == 'adbc':
+            self.df = _read_arrow(self.database_path, query).to_pandas(
+                self_destruct=True, types_mapper=pd.ArrowDtype if dtype_backend == 'pyarrow' else None)
+            if dtype_backend == 'numpy_nullable':
+                self.df = self.df.convert_dtypes(dtype_backend='numpy_nullable')
+        elif chunksize is None:
+            self.df = pd.read_sql_query(query, self.conn, **read_kwargs)
+        else:
+            chunks = list(pd.read_sql_query(query, self.conn, chunksize=chunksize, **read_kwargs))
+            self.df = pd.concat(chunks, ignore_index=True, copy=False)
+        for col in CATEGORICAL_COLUMNS:
+            if col in self.df.columns:
+                self.df[col] = self.df[col].astype('category')
+        for col in DATE_COLUMNS:
+            if col in self.df.columns:
+                self.df[col] = pd.to_datetime(self.df[col], format='ISO8601', cache=True)
+        # Sorted customer IDs let every per-customer groupby skip its sort
+        if customer_id_col in self.df.columns:
+            self.df = self.df.sort_values(customer_id_col, kind='mergesort', ignore_index=True)
+
+        if cache:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            self.df.to_parquet(cache_path, engine='pyarrow', compression='zstd', row_group_size=250_000)
         return self.df
 
-    def check_data(self, head=7, df = None):
+    def load_customer_summary(self, query='''
+        SELECT
+            s.customer_id,
+            COUNT(DISTINCT s.transaction_id) AS total_transactions,
+            SUM(p.price * s.quantity) AS total_sales_amount
+        FROM
+            date d
+        JOIN
+            sales_fact s ON d.date_id = s.date_id
+        JOIN
+            product p ON s.product_id = p.product_id
+        GROUP BY
+            s.customer_id
+        ORDER BY
+            s.customer_id;
+        ''', customer_id_col='customer_id', total_transactions_colname='total_transactions',
+                              total_sales_amount_colname='total_sales_amount'):
+        """
+        Aggregate the customer summary in the database and set it as 'customer_summary'.
+
+        The same summary as load_data followed by calculate_customer_summary, but the sales rows
+        never leave SQLite: only one row per customer is read.
+
+        Parameters:
+            - query (str): SQL query returning one row per customer. Default is the provided query,
+              which covers the same sales as the query of load_data.
+            - customer_id_col (str, optional): Column name for customer ID. Default is 'customer_id'.
+            - total_transactions_colname (str, optional): Column name for total transactions. Default is 'total_transactions'.
+            - total_sales_amount_colname (str, optional): Column name for total sales amount. Default is 'total_sales_amount'.
+
+        Returns:
+            pd.DataFrame: Customer summary DataFrame with total transactions and total sales amount,
+            indexed by customer ID and stored as float32 like calculate_customer_summary.
+        """
+        summary = pd.read_sql_query(query, self.conn, index_col=customer_id_col)
+        self.customer_summary = summary.astype({total_transactions_colname: np.float32,
+                                                total_sales_amount_colname: np.float32})
+        self._bind_columns(self.customer_summary, total_transactions=total_transactions_colname,
+                           total_sales_amount=total_sales_amount_colname)
+        return self.customer_summary
+
+    def _cache_path(self, query, dtype_backend=None):
+        """
+        Return the path of the Parquet copy of a query result.
+
+        Parameters:
+            query (str): SQL query of the result.
+            dtype_backend (str, optional): Backend of the loaded columns. Default is None.
+
+        Returns:
+            str: Path in CACHE_DIR named after the query, the backend and the modification time
+                of the database and its write-ahead log, so any write to the database gives a new path.
+        """
+        mtimes = [os.path.getmtime(path) for path in (self.database_path, self.database_path + '-wal')
+                  if os.path.exists(path)]
+        key = hashlib.sha1(f"{query}{dtype_backend}{mtimes}".encode()).hexdigest()
+        return os.path.join(CACHE_DIR, f"{key}.parquet")
+
+    def _bind_columns(self, frame, **colnames):
+        """
+        Bind per-customer properties to columns of a DataFrame.
+
+        Parameters:
+            - frame (pd.DataFrame): DataFrame holding the columns.
+            - **colnames (str): Column name of every property, e.g. total_transactions='total_transactions'.
+        """
+        for name, colname in colnames.items():
+            self._frame_columns[name] = (frame, colname)
+
+    @staticmethod
+    def _require_columns(df, *columns):
+        """
+        Check that a DataFrame has the given columns.
+
+        Parameters:
+            - df (pd.DataFrame): DataFrame to check.
+            - *columns (str): Names of the required columns.
+
+        Raises:
+            ValueError: If one of the columns is not present in the DataFrame.
+
+        Notes:
+            - The names are looked up in the hash table that the column Index builds once and keeps,
+              so a check costs the same on wide DataFrames and no copy of the columns is made.
+        """
+        missing = next((col for col in columns if col not in df.columns), None)
+        if missing is not None:
+            raise ValueError(f"The {missing} column is required in {df}.")
+
+    def check_data(self, head=7, df = None, verbose = False):
         """
         Display information about the DataFrame, including shape, info, unique values, missing values, quantiles, and head.
 
         Parameters:
             head (int): Number of rows to display. Default is 7.
             df (pd.DataFrame): DataFrame to check. Default is the 'df' attribute.
+            verbose (bool): Also display the column info of the DataFrame. Default is False.
 
         Returns:
             None
@@ -128,20 +626,49 @@ class CLTVModel:
             df = self.df
         print("################### Shape ####################")
         print(df.shape)
-        print("#################### Info #####################")
-        print(df.info())
+        if verbose:
+            print("#################### Info #####################")
+            df.info()
         print("################### Nunique ###################")
         print(df.nunique())
         print("##################### NA #####################")
-        print(df.isnull().sum())
+        print(df.isna().sum())
         print("################## Quantiles #################")
-        print(df.describe([0, 0.05, 0.50, 0.95, 0.99, 1]).T)
+        print(self._describe_fast(df, [0, 0.05, 0.50, 0.95, 0.99, 1]))
         print("#################### Head ####################")
         print(df.head(head))
 
+    @staticmethod
+    def _describe_fast(df, qs):
+        """
+        Summarize the numeric columns of a DataFrame like the transposed output of DataFrame.describe.
+
+        All quantiles of a column are computed by a single np.quantile call on its values.
+
+        Parameters:
+            df (pd.DataFrame): DataFrame to summarize.
+            qs (list of float): Quantiles to compute, between 0 and 1.
+
+        Returns:
+            pd.DataFrame: Count, mean, standard deviation, minimum, quantiles and maximum of every numeric column.
+        """
+        labels = ['count', 'mean', 'std', 'min'] + [f"{q * 100:g}%" for q in qs] + ['max']
+        rows = {}
+        for col, values in df.select_dtypes('number').items():
+            values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            values = values[~np.isnan(values)]
+            if len(values) == 0:
+                rows[col] = [0.0] + [np.nan] * (len(labels) - 1)
+                continue
+            std = values.std(ddof=1) if len(values) > 1 else np.nan
+            rows[col] = [float(len(values)), values.mean(), std, values.min(),
+                         *np.quantile(values, qs, method='linear'), values.max()]
+        return pd.DataFrame.from_dict(rows, orient='index', columns=labels)
+
     def calculate_sales_amount(self, df = None, unit_price_col= "unit_price", quantity_col = 'quantity', sales_amount_colname = "sales_amount"):
         """
         Calculate and set the sales amount based on unit price and quantity.
+        If the sales amount column was already loaded from the database, it is used as is.
 
         Parameters:
             - df (pd.DataFrame, optional): DataFrame to perform calculations on. Default is the 'df' attribute.
@@ -154,12 +681,18 @@ class CLTVModel:
         """
         if df is None:
             df = self.df
-        if unit_price_col not in df.columns:
-            raise ValueError(f"The {unit_price_col} column is required in {df}.")
-        if quantity_col not in df.columns:
-            raise ValueError(f"The {quantity_col} column is required in {df}.")
+        if sales_amount_colname in df.columns:
+            self.sales_amount = df[sales_amount_colname]
+            return df
+        self._require_columns(df, unit_price_col, quantity_col)
  
-        df[sales_amount_colname] = df[unit_price_col] * df[quantity_col]
+        # numexpr works on plain NumPy arrays; nullable and Arrow-backed columns use pandas
+        if ne is not None and all(isinstance(df[col].dtype, np.dtype) for col in (unit_price_col, quantity_col)):
+            unit_price = df[unit_price_col].to_numpy()
+            quantity = df[quantity_col].to_numpy()
+            df[sales_amount_colname] = ne.evaluate('unit_price * quantity')
+        else:
+            df[sales_amount_colname] = df[unit_price_col] * df[quantity_col]
         self.sales_amount = df[sales_amount_colname]
         return df
 
@@ -179,26 +712,145 @@ class CLTVModel:
 
         Returns:
             pd.DataFrame: Customer summary DataFrame with total transactions and total sales amount.
+
+        Notes:
+            - Both columns are stored as float32, so the elementwise CLV arithmetic on them moves half the
+              memory of float64. The totals are summed in float64 first, and float32 holds every count
+              up to 2**24 exactly. Nullable and Arrow-backed totals keep their dtype.
         """
         if df is None:
             df = self.df
-        if customer_id_col not in df.columns:
-            raise ValueError(f"The {customer_id_col} column is required in {df}.")
-        if transaction_id_col not in df.columns:
-            raise ValueError(f"The {transaction_id_col} column is required in {df}.")
         if sales_amount_col is None:
             sales_amount_col = self.sales_amount
-        if sales_amount_col.name not in df.columns:
-            raise ValueError(f"The {sales_amount_col.name} column is required in {df}.")
+        self._require_columns(df, customer_id_col, transaction_id_col, sales_amount_col.name)
             
-        self.customer_summary = df.groupby(customer_id_col).agg({
-            transaction_id_col: lambda x: x.nunique(),
-            sales_amount_col.name: lambda x: x.sum()
-        })
-        self.customer_summary.columns = [total_transactions_colname, total_sales_amount_colname]
-        self.total_transactions = self.customer_summary[total_transactions_colname]
-        self.total_sales_amount = self.customer_summary[total_sales_amount_colname]
+        if self._can_summarize_runs(df, customer_id_col, transaction_id_col, sales_amount_col.name):
+            customers, totals, counts, _, _ = self._summarize_runs(df, customer_id_col, transaction_id_col,
+                                                                   sales_amount_col.name)
+            self.customer_summary = pd.DataFrame(
+                {total_transactions_colname: counts.astype(np.float32),
+                 total_sales_amount_colname: totals.astype(np.float32)},
+                index=pd.Index(customers, name=customer_id_col))
+        else:
+            self.customer_summary = pd.concat([
+                self._count_transactions(df, customer_id_col, transaction_id_col,
+                                         self.assume_unique_transactions).rename(total_transactions_colname),
+                df.groupby(customer_id_col, sort=self._needs_sort(df[customer_id_col]),
+                           observed=True)[sales_amount_col.name].sum().rename(total_sales_amount_colname)
+            ], axis=1)
+            self.customer_summary = self.customer_summary.astype(
+                {col: np.float32 for col, dtype in self.customer_summary.dtypes.items()
+                 if isinstance(dtype, np.dtype)})
+        self._bind_columns(self.customer_summary, total_transactions=total_transactions_colname,
+                           total_sales_amount=total_sales_amount_colname)
         return self.customer_summary
+
+    @classmethod
+    def _summarize_runs(cls, df, customer_id_col, transaction_id_col, sales_amount_colname, dates=None):
+        """
+        Total the sales, count the transactions and find the first and last date of every customer
+        with the summarize_sorted kernel.
+
+        Only for DataFrames accepted by _can_summarize_runs. Unsorted sales are put in customer order
+        by one stable argsort first, which keeps the sales of every customer in their original order.
+
+        Parameters:
+            - df (pd.DataFrame): DataFrame with the sales.
+            - customer_id_col (str): Column name for customer ID.
+            - transaction_id_col (str): Column name for transaction ID.
+            - sales_amount_colname (str): Column name for sales amount.
+            - dates (pd.Series, optional): datetime64 dates of the sales without missing values.
+              Default is None, skipping the dates.
+
+        Returns:
+            Tuple of np.ndarray: ID of every customer in ascending order, their total sales amount,
+            their number of distinct transactions, and their first and last date as int64 ticks of the
+            datetime64 unit of the dates (None without dates).
+        """
+        customer_ids = df[customer_id_col].to_numpy()
+        transaction_ids = df[transaction_id_col].to_numpy()
+        amounts = df[sales_amount_colname].to_numpy()
+        date_values = np.empty(0, dtype='datetime64[ns]') if dates is None else dates.to_numpy()
+        if cls._needs_sort(df[customer_id_col]):
+            order = np.argsort(customer_ids, kind='stable')
+            customer_ids, transaction_ids, amounts = customer_ids[order], transaction_ids[order], amounts[order]
+            if dates is not None:
+                date_values = date_values[order]
+
+        # Integer keys in customer order: one native scan over the runs of every customer
+        low, high = transaction_ids.min(), transaction_ids.max()
+        # Dense IDs are codes as they are; sparse ones are factorized so every marker array of the
+        # kernel stays no longer than the sales
+        if high - low < len(transaction_ids):
+            transaction_codes, n_codes = transaction_ids - low, high - low + 1
+        else:
+            transaction_codes, uniques = pd.factorize(transaction_ids)
+            n_codes = len(uniques)
+        customers, totals, counts, first_dates, last_dates = summarize_sorted(
+            customer_ids, amounts, transaction_codes, n_codes, date_values.view(np.int64), get_num_threads())
+        if dates is None:
+            return customers, totals, counts, None, None
+        return customers, totals, counts, first_dates, last_dates
+
+    @staticmethod
+    def _can_summarize_runs(df, customer_id_col, transaction_id_col, sales_amount_colname):
+        """
+        Tell whether the customer summary of a DataFrame can be built by the summarize_sorted kernel.
+
+        Parameters:
+            - df (pd.DataFrame): DataFrame with the sales.
+            - customer_id_col (str): Column name for customer ID.
+            - transaction_id_col (str): Column name for transaction ID.
+            - sales_amount_colname (str): Column name for sales amount.
+
+        Returns:
+            bool: True if the DataFrame is not empty, has NumPy integer customer and transaction IDs
+            and a NumPy float sales amount.
+        """
+        def has_kind(col, kinds):
+            return isinstance(df[col].dtype, np.dtype) and df[col].dtype.kind in kinds
+
+        return (len(df) > 0 and has_kind(customer_id_col, 'iu') and has_kind(transaction_id_col, 'iu')
+                and has_kind(sales_amount_colname, 'f'))
+
+    @staticmethod
+    def _needs_sort(keys):
+        """
+        Tell whether a groupby over the given keys has to sort them.
+
+        Parameters:
+            - keys (pd.Series): Group keys, e.g. the customer IDs.
+
+        Returns:
+            bool: False if the keys are already in ascending order, as after load_data, so the
+            groups come out sorted without sorting.
+        """
+        return not keys.is_monotonic_increasing
+
+    @staticmethod
+    def _count_transactions(df, customer_id_col, transaction_id_col, assume_unique=False):
+        """
+        Count the distinct transactions of each customer.
+
+        The (customer, transaction) pairs are deduplicated once over the whole DataFrame,
+        then the remaining rows are counted per customer.
+
+        Parameters:
+            - df (pd.DataFrame): DataFrame with the customer and transaction columns.
+            - customer_id_col (str): Column name for customer ID.
+            - transaction_id_col (str): Column name for transaction ID.
+            - assume_unique (bool, optional): Skip the deduplication, as every row is its own transaction.
+              Default is False.
+
+        Returns:
+            pd.Series: Number of distinct transactions, indexed by customer ID.
+        """
+        if assume_unique:
+            pairs = df[[customer_id_col]]
+        else:
+            pairs = df[[customer_id_col, transaction_id_col]].drop_duplicates()
+        return pairs.groupby(customer_id_col, sort=CLTVModel._needs_sort(pairs[customer_id_col]),
+                             observed=True).size()
     
     def calculate_average_order_value(self, customer_summary = None,
                                       total_sales_amount_col = None, total_transactions_col = None,
@@ -219,15 +871,12 @@ class CLTVModel:
             customer_summary = self.customer_summary
         if total_sales_amount_col is None:
             total_sales_amount_col = self.total_sales_amount
-        if total_sales_amount_col.name not in customer_summary.columns:
-            raise ValueError(f"The {total_sales_amount_col.name} column is required in {customer_summary}.")
         if total_transactions_col is None:
             total_transactions_col = self.total_transactions
-        if total_transactions_col.name not in customer_summary.columns:
-            raise ValueError(f"The {total_transactions_col.name} column is required in {customer_summary}.")
+        self._require_columns(customer_summary, total_sales_amount_col.name, total_transactions_col.name)
         
         customer_summary[average_order_value_colname] = total_sales_amount_col/ total_transactions_col
-        self.average_order_value = customer_summary[average_order_value_colname]
+        self._bind_columns(customer_summary, average_order_value=average_order_value_colname)
         return customer_summary
 
     def calculate_purchase_frequency(self, customer_summary = None, 
@@ -247,13 +896,12 @@ class CLTVModel:
             customer_summary = self.customer_summary
         if total_transactions_col is None:
             total_transactions_col = self.total_transactions
-        if total_transactions_col.name not in customer_summary.columns:
-            raise ValueError(f"The {total_transactions_col.name} column is required in {customer_summary}.")
+        self._require_columns(customer_summary, total_transactions_col.name)
         if customer_summary.shape[0] == 0:
             raise ValueError(f"The {customer_summary} DataFrame is empty.")
     
         customer_summary[purchase_frequency_colname] = total_transactions_col / customer_summary.shape[0]
-        self.purchase_frequency = customer_summary[purchase_frequency_colname]
+        self._bind_columns(customer_summary, purchase_frequency=purchase_frequency_colname)
         return customer_summary
     
     def calculate_repeat_rate(self, customer_summary=None, total_transactions_col=None):
@@ -280,20 +928,20 @@ class CLTVModel:
         if total_transactions_col is None:
             total_transactions_col = self.total_transactions
 
-        if total_transactions_col.name not in customer_summary.columns:
-            raise ValueError(f"The {total_transactions_col.name} column is required in {customer_summary}.")
+        self._require_columns(customer_summary, total_transactions_col.name)
 
         if len(customer_summary) == 0:
             raise ValueError(f"The {customer_summary} DataFrame is empty.")
 
-        repeat_rate_df = customer_summary[total_transactions_col > 1]
+        # Count the repeat customers on the boolean mask, without selecting their rows
+        repeat_customers = int((total_transactions_col > 1).sum())
 
-        if len(repeat_rate_df) == 0:
+        if repeat_customers == 0:
             warnings.warn("No customers with more than one transaction found. Repeat rate will be 0.", Warning)
             self.repeat_rate = 0
             return self.repeat_rate
         else:
-            repeat_rate = len(repeat_rate_df) / len(customer_summary)
+            repeat_rate = repeat_customers / len(customer_summary)
             self.repeat_rate = repeat_rate
             return repeat_rate
 
@@ -344,11 +992,10 @@ class CLTVModel:
         if total_sales_amount_col is None:
             total_sales_amount_col = self.total_sales_amount
 
-        if total_sales_amount_col.name not in customer_summary.columns:
-            raise ValueError(f"The {total_sales_amount_col.name} column is required in {customer_summary}.")
+        self._require_columns(customer_summary, total_sales_amount_col.name)
 
         customer_summary[profit_margin_colname] = total_sales_amount_col * profit_margin_rate
-        self.profit_margin = customer_summary[profit_margin_colname]
+        self._bind_columns(customer_summary, profit_margin=profit_margin_colname)
         return customer_summary
 
     def calculate_customer_value(self, customer_summary = None, average_order_value_col = None, purchase_frequency_col = None,
@@ -375,14 +1022,11 @@ class CLTVModel:
             customer_summary = self.customer_summary
         if average_order_value_col is None:
             average_order_value_col = self.average_order_value
-        if average_order_value_col.name not in customer_summary.columns:
-            raise ValueError(f"The {average_order_value_col.name} column is required in {customer_summary}.")
         if purchase_frequency_col is None:
             purchase_frequency_col = self.purchase_frequency
-        if purchase_frequency_col.name not in customer_summary.columns:
-            raise ValueError(f"The {purchase_frequency_col.name} column is required in {customer_summary}.")
+        self._require_columns(customer_summary, average_order_value_col.name, purchase_frequency_col.name)
         customer_summary[customer_value_colname] = average_order_value_col * purchase_frequency_col
-        self.customer_value = customer_summary[customer_value_colname]
+        self._bind_columns(customer_summary, customer_value=customer_value_colname)
         return customer_summary
 
     def calculate_cltv(self, customer_summary = None ,churn_rate = None, customer_value_col = None, 
@@ -412,17 +1056,93 @@ class CLTVModel:
             churn_rate = self.churn_rate
         if customer_value_col is None:
             customer_value_col = self.customer_value
-        if customer_value_col.name not in customer_summary.columns:
-            raise ValueError(f"The {customer_value_col.name} column is required in {customer_summary}.")
         if profit_margin_col is None:
             profit_margin_col = self.profit_margin
-        if profit_margin_col.name not in customer_summary.columns:
-            raise ValueError(f"The {profit_margin_col.name} column is required in {customer_summary}.")
+        self._require_columns(customer_summary, customer_value_col.name, profit_margin_col.name)
         
         customer_summary[cltv_colname] = (customer_value_col / churn_rate) * profit_margin_col
-        self.cltv = customer_summary[cltv_colname]
+        self._bind_columns(customer_summary, cltv=cltv_colname)
         return customer_summary
 
+    def compute_all_customer_metrics(self, profit_margin_rate=0.10, customer_summary = None, churn_rate = None,
+                                     total_transactions_colname = 'total_transactions',
+                                     total_sales_amount_colname = 'total_sales_amount'):
+        """
+        Calculate and set average order value, purchase frequency, profit margin, customer value and CLTV at once.
+
+        Parameters:
+            - profit_margin_rate (float, optional): Profit margin rate to be applied. Default is 0.10.
+            - customer_summary (pd.DataFrame, optional): Customer summary DataFrame. Default is the 'customer_summary' attribute.
+            - churn_rate (float, optional): Churn rate of customers. Default is the 'churn_rate' attribute,
+              calculated from the repeat rate if not set yet.
+            - total_transactions_colname (str, optional): Column name for total transactions. Default is 'total_transactions'.
+            - total_sales_amount_colname (str, optional): Column name for total sales amount. Default is 'total_sales_amount'.
+
+        Returns:
+            pd.DataFrame: Customer summary DataFrame with the 'average_order_value', 'purchase_frequency',
+            'profit_margin', 'customer_value' and 'clv' columns added.
+
+        Raises:
+            ValueError: If the required columns are not present in the customer_summary DataFrame or if the DataFrame is empty.
+
+        Notes:
+            Gives the same results as calling the per-metric methods in order, but computes every metric
+            on NumPy arrays and assigns all columns in a single step.
+        """
+        if customer_summary is None:
+            customer_summary = self.customer_summary
+        if len(customer_summary) == 0:
+            raise ValueError(f"The {customer_summary} DataFrame is empty.")
+        self._require_columns(customer_summary, total_transactions_colname, total_sales_amount_colname)
+        if churn_rate is None:
+            if self.churn_rate is None:
+                self.calculate_repeat_rate(customer_summary, customer_summary[total_transactions_colname])
+                self.calculate_churn_rate()
+            churn_rate = self.churn_rate
+
+        total_transactions = customer_summary[total_transactions_colname].to_numpy()
+        total_sales_amount = customer_summary[total_sales_amount_colname].to_numpy()
+
+        average_order_value = total_sales_amount / total_transactions
+        purchase_frequency = total_transactions / len(customer_summary)
+        profit_margin = total_sales_amount * profit_margin_rate
+        customer_value = average_order_value * purchase_frequency
+        cltv = (customer_value / churn_rate) * profit_margin
+
+        metric_colnames = ['average_order_value', 'purchase_frequency', 'profit_margin', 'customer_value', 'clv']
+        customer_summary[metric_colnames] = np.column_stack(
+            [average_order_value, purchase_frequency, profit_margin, customer_value, cltv])
+
+        self._bind_columns(customer_summary, average_order_value='average_order_value',
+                           purchase_frequency='purchase_frequency', profit_margin='profit_margin',
+                           customer_value='customer_value', cltv='clv')
+        return customer_summary
+
+    def build_customer_summary(self, profit_margin_rate=0.10, df = None, churn_rate = None):
+        """
+        Build the customer summary with all its metrics from the loaded data in one call.
+
+        Parameters:
+            - profit_margin_rate (float, optional): Profit margin rate to be applied. Default is 0.10.
+            - df (pd.DataFrame, optional): DataFrame to perform calculations on. Default is the 'df' attribute.
+            - churn_rate (float, optional): Churn rate of customers. Default is None, calculating it
+              from the repeat rate of the new summary.
+
+        Returns:
+            pd.DataFrame: Customer summary DataFrame with the total transactions, total sales amount,
+            average order value, purchase frequency, profit margin, customer value and CLTV columns.
+
+        Notes:
+            The transactions are aggregated once by calculate_customer_summary, then every derived
+            metric is added by a single compute_all_customer_metrics pass.
+        """
+        df = self.calculate_sales_amount(df)
+        customer_summary = self.calculate_customer_summary(df)
+        if churn_rate is None:
+            self.calculate_repeat_rate(customer_summary)
+            churn_rate = self.calculate_churn_rate()
+        return self.compute_all_customer_metrics(profit_margin_rate, customer_summary, churn_rate)
+
     def calculate_cltv_pr(self, date_col = 'date', transaction_id_col = 'transaction_id', customer_id_col = 'customer_id', sales_amount_col = None, df=None):
         """
         Calculate and set customer lifetime value (CLTV) using the probabilistic model.
@@ -442,35 +1162,52 @@ class CLTVModel:
 
         Notes:
             CLTV is calculated using a probabilistic model based on recency, frequency, and monetary values.
+            Data with integer customer IDs is summarized in one scan of the customer runs.
         """
         if df is None:
             df = self.df
         if sales_amount_col is None:
             sales_amount_col = self.sales_amount
-        if sales_amount_col.name not in df.columns:
-            raise ValueError(f"The {sales_amount_col.name} column is required in {df}.")
-        if date_col not in df.columns:
-            raise ValueError(f"The {date_col} column is required in {df}.")
-        if transaction_id_col not in df.columns:
-            raise ValueError(f"The {transaction_id_col} column is required in {df}.")
-        if customer_id_col not in df.columns:
-            raise ValueError(f"The {customer_id_col} column is required in {df}.")
+        self._require_columns(df, sales_amount_col.name, date_col, transaction_id_col, customer_id_col)
 
         recency_col, T_col, frequency_col, monetary_col = self._calculate_cltv_pr_columns()
 
-        customer_summary_pr = df.groupby(customer_id_col).agg({
-            date_col: [lambda InvoiceDate: self._calculate_recency_T(InvoiceDate),
-                          lambda InvoiceDate: self._calculate_recency_today(InvoiceDate)],
-            transaction_id_col: lambda Invoice: Invoice.nunique(),
-            sales_amount_col.name: lambda TotalPrice: TotalPrice.sum()
-        })
-
-        customer_summary_pr.columns = customer_summary_pr.columns.droplevel(0)
-        customer_summary_pr.columns = [recency_col, T_col, frequency_col, monetary_col]
-        self.recency = customer_summary_pr[recency_col]
-        self.T = customer_summary_pr[T_col]
-        self.frequency = customer_summary_pr[frequency_col]
-        self.monetary = customer_summary_pr[monetary_col]
+        # Parse the dates once and derive recency and T from the first and last date per customer
+        dates = pd.to_datetime(df[date_col], cache=True)
+        if (self._can_summarize_runs(df, customer_id_col, transaction_id_col, sales_amount_col.name)
+                and isinstance(dates.dtype, np.dtype) and not dates.hasnans):
+            # Integer keys: one kernel scan over the runs of every customer, then integer day
+            # arithmetic on the date ticks. The latest last date is the latest date of all sales
+            customers, monetary, frequency, first_date, last_date = self._summarize_runs(
+                df, customer_id_col, transaction_id_col, sales_amount_col.name, dates)
+            ticks_per_day = np.timedelta64(1, 'D') // np.timedelta64(1, np.datetime_data(dates.dtype)[0])
+            today = last_date.max() + ticks_per_day
+            customer_summary_pr = pd.DataFrame({
+                recency_col: (last_date - first_date) // ticks_per_day,
+                T_col: (today - first_date) // ticks_per_day,
+                frequency_col: frequency,
+                monetary_col: monetary
+            }, index=pd.Index(customers, name=customer_id_col))
+        else:
+            today = dates.max() + pd.Timedelta(days=1)
+            grouped = df[[customer_id_col, sales_amount_col.name]].assign(
+                **{date_col: dates}).groupby(customer_id_col, sort=self._needs_sort(df[customer_id_col]),
+                                             observed=True).agg(
+                first_date=(date_col, 'min'),
+                last_date=(date_col, 'max'),
+                monetary=(sales_amount_col.name, 'sum')
+            )
+            frequency = self._count_transactions(df, customer_id_col, transaction_id_col,
+                                                     self.assume_unique_transactions)
+
+            customer_summary_pr = pd.DataFrame({
+                recency_col: (grouped['last_date'] - grouped['first_date']).dt.days,
+                T_col: (today - grouped['first_date']).dt.days,
+                frequency_col: frequency,
+                monetary_col: grouped['monetary']
+            })
+        self._bind_columns(customer_summary_pr, recency=recency_col, T=T_col,
+                           frequency=frequency_col, monetary=monetary_col)
 
         self.customer_summary_pr = customer_summary_pr
         self._calculate_monetary_frequency_filter()
@@ -492,42 +1229,42 @@ class CLTVModel:
         """
        return recency_colname, T_colname, frequency_colname, monetary_colname
 
-
     def _calculate_recency_T(self, InvoiceDate):
         """
-        Calculate recency and T (age of the customer) based on the given InvoiceDate.
+        Calculate recency based on the given InvoiceDate.
+
+        Deprecated: calculate_cltv_pr computes the recency of all customers at once.
 
         Parameters:
             InvoiceDate (pd.Series): Series containing invoice dates.
 
         Returns:
-            Tuple of int: Recency and T.
+            int: Days between the first and the last invoice date.
         """
+        warnings.warn("_calculate_recency_T is deprecated; use calculate_cltv_pr.", DeprecationWarning, stacklevel=2)
         InvoiceDate = pd.to_datetime(InvoiceDate)
         return (InvoiceDate.max() - InvoiceDate.min()).days
 
     def _calculate_recency_today(self, InvoiceDate, df = None, date_col = 'date', days=1):
         """
-        Calculate recency considering today's date based on the given InvoiceDate.
+        Calculate T (age of the customer) considering today's date based on the given InvoiceDate.
+
+        Deprecated: calculate_cltv_pr computes T of all customers at once.
 
         Parameters:
             - InvoiceDate (pd.Series): Series containing invoice dates.
             - df (pd.DataFrame, optional): DataFrame to retrieve the maximum date. Default is the 'df' attribute.
             - date_col (str, optional): Column name for date. Default is 'date'.
-            - days (int, optional): Number of days to consider for recency. Default is 1.
+            - days (int, optional): Number of days after the last date of df that count as today. Default is 1.
 
         Returns:
-            int: Recency considering today's date.
-
-        Notes:
-            The default value for the 'days' parameter is 1.
+            int: Days between the first invoice date and today.
         """
+        warnings.warn("_calculate_recency_today is deprecated; use calculate_cltv_pr.", DeprecationWarning, stacklevel=2)
         if df is None:
             df = self.df
-        InvoiceDate = pd.to_datetime(InvoiceDate)
-        max_date = pd.to_datetime(df[date_col].max())
-        today = max_date + pd.Timedelta(days=days)
-        return (today - InvoiceDate.min()).days
+        today = pd.to_datetime(df[date_col]).max() + pd.Timedelta(days=days)
+        return (today - pd.to_datetime(InvoiceDate).min()).days
 
     def _calculate_monetary_frequency_filter(self, customer_summary_pr=None, monetary_col=None, frequency_col=None,
                                          recency_col=None, T_col=None):
@@ -551,37 +1288,38 @@ class CLTVModel:
             customer_summary_pr = self.customer_summary_pr
         if monetary_col is None:
             monetary_col = self.monetary
-        if monetary_col.name not in customer_summary_pr.columns:
-            raise ValueError(f"The {monetary_col.name} column is required in {customer_summary_pr}.")
         if frequency_col is None:
             frequency_col = self.frequency
-        if frequency_col.name not in customer_summary_pr.columns:
-            raise ValueError(f"The {frequency_col.name} column is required in {customer_summary_pr}.")
         if recency_col is None:
             recency_col = self.recency
-        if recency_col.name not in customer_summary_pr.columns:
-            raise ValueError(f"The {recency_col.name} column is required in {customer_summary_pr}.")
         if T_col is None:
             T_col = self.T
-        if T_col.name not in customer_summary_pr.columns:
-            raise ValueError(f"The {T_col.name} column is required in {customer_summary_pr}.")
-
-        self.monetary = monetary_col / frequency_col
-        customer_summary_pr[monetary_col.name] = self.monetary
-
-        customer_summary_pr = customer_summary_pr[frequency_col > 1]
-        self.frequency = customer_summary_pr[frequency_col.name]
-
-        self.recency = recency_col / 7
-        customer_summary_pr[recency_col.name] = self.recency
-
-        self.T = T_col / 7
-        customer_summary_pr[T_col.name] = self.T
+        self._require_columns(customer_summary_pr, monetary_col.name, frequency_col.name, recency_col.name, T_col.name)
 
+        # The unfiltered summary keeps the average sales amount per transaction. Columns of this summary
+        # are divided as arrays, without aligning their indexes
+        if all(col.index is customer_summary_pr.index and isinstance(col.dtype, np.dtype)
+               for col in (monetary_col, frequency_col)):
+            customer_summary_pr[monetary_col.name] = monetary_col.to_numpy() / frequency_col.to_numpy()
+        else:
+            customer_summary_pr[monetary_col.name] = monetary_col / frequency_col
+
+        positions, frequency, recency, T, monetary = filter_rfm(
+            *(self._kernel_values(col) for col in (frequency_col, recency_col, T_col, monetary_col)))
+        filtered = {frequency_col.name: frequency, recency_col.name: recency,
+                    T_col.name: T, monetary_col.name: monetary}
+        customer_summary_pr = pd.DataFrame(
+            {col: filtered[col] if col in filtered else customer_summary_pr[col].to_numpy()[positions]
+             for col in customer_summary_pr.columns},
+            index=customer_summary_pr.index[positions], copy=False)
+
+        self._bind_columns(customer_summary_pr, frequency=frequency_col.name, recency=recency_col.name,
+                           T=T_col.name, monetary=monetary_col.name)
         self.customer_summary_pr = customer_summary_pr
 
     def fit_bgf_model(self, customer_summary_pr = None, frequency_colname = "frequency",
-                      recency_colname = "recency", T_colname = "T"):
+                      recency_colname = "recency", T_colname = "T", warm_start = True, engine = 'lifetimes',
+                      cache = False):
         """
         Fit the Beta Geo Fitter (BG/NBD) model using the provided frequency, recency, and T values.
 
@@ -590,53 +1328,125 @@ class CLTVModel:
             - frequency_colname (str, optional): Column name for customer transaction frequency. Default is 'frequency'.
             - recency_colname (str, optional): Column name for recency (time since the last transaction). Default is 'recency'.
             - T_colname (str, optional): Column name for T (age of the customer). Default is 'T'.
+            - warm_start (bool, optional): Start the optimizer from the parameters of the last fit. Default is True.
+            - engine (str, optional): 'lifetimes' fits with BetaGeoFitter.fit, 'numba' minimizes the same objective
+              with the Numba-compiled bgnbd_negative_log_likelihood kernel and its analytic gradient. Default is 'lifetimes'.
+            - cache (bool, optional): Keep the fit results in FIT_CACHE and reuse them when the model is fitted
+              again on the same frequency, recency and T values. Default is False.
 
         Returns:
             None
+
+        Raises:
+            ValueError: If the required columns are not present in the customer_summary_pr DataFrame, or if
+                engine is neither 'lifetimes' nor 'numba'.
+            ConvergenceError: If the optimizer does not converge.
+
+        Notes:
+            - The fitted parameters are saved to BGF_PARAMS_PATH, so the first fit of a later session is warm-started too.
+            - Both engines leave a fitted 'bgf' attribute, usable for the plots and predictions alike.
+            - With cache, the key is a hash of the values, the penalizer and the engine. A restarted process
+              fitting unchanged data skips the optimizer and only rebuilds the 'bgf' attribute.
         """
+        if engine not in ('lifetimes', 'numba'):
+            raise ValueError(f"The engine must be 'lifetimes' or 'numba', got {engine!r}.")
         if customer_summary_pr is None:
             customer_summary_pr = self.customer_summary_pr
-        
-        frequency_col = customer_summary_pr[frequency_colname]
-        recency_col = customer_summary_pr[recency_colname]
-        T_col = customer_summary_pr[T_colname]
+        self._require_columns(customer_summary_pr, frequency_colname, recency_colname, T_colname)
+
+        frequency_col = self._model_input(customer_summary_pr[frequency_colname])
+        recency_col = self._model_input(customer_summary_pr[recency_colname])
+        T_col = self._model_input(customer_summary_pr[T_colname])
+
+        initial_params = self._bgf_init_params if warm_start else None
+        if cache:
+            self._load_bgf_fit(frequency_col, recency_col, T_col, *_cached_fit_bgf(
+                frequency_col, recency_col, T_col, self.bgf.penalizer_coef, engine, initial_params))
+        elif engine == 'numba':
+            self._load_bgf_fit(frequency_col, recency_col, T_col, *_minimize_bgnbd(
+                frequency_col, recency_col, T_col, self.bgf.penalizer_coef, initial_params))
+        else:
+            self.bgf.fit(frequency_col, recency_col, T_col, initial_params=initial_params)
 
-        self.bgf.fit(frequency_col, recency_col, T_col)
+        # lifetimes optimizes the log of the parameters, with alpha on the rescaled time axis
+        self._bgf_init_params = np.log(self.bgf.params_.values * [1, self.bgf._scale, 1, 1])
+        np.save(BGF_PARAMS_PATH, self._bgf_init_params)
 
-    def plot_frequency_recency_matrix(self, BetaGeoFitter = None):
+    def _load_bgf_fit(self, frequency, recency, T, log_params, negative_log_likelihood, hessian, scale):
+        """
+        Set the fit results of the BG/NBD model on the 'bgf' attribute, as BetaGeoFitter.fit does.
+
+        Parameters:
+            - frequency (np.ndarray): Frequency of every customer.
+            - recency (np.ndarray): Recency of every customer.
+            - T (np.ndarray): Age of every customer.
+            - log_params (np.ndarray): Log of r, alpha, a and b, with alpha on the rescaled time axis.
+            - negative_log_likelihood (float): Objective at the fitted parameters.
+            - hessian (np.ndarray): Hessian of the objective in the log parameters.
+            - scale (float): Factor that rescaled the times, 1 / max(T).
+        """
+        bgf = self.bgf
+        bgf._scale = scale
+        bgf._negative_log_likelihood_ = negative_log_likelihood
+        bgf._hessian_ = hessian
+        bgf.params_ = pd.Series(np.exp(log_params), index=["r", "alpha", "a", "b"])
+        bgf.params_["alpha"] /= scale
+        bgf.data = pd.DataFrame({"frequency": frequency.astype(int), "recency": recency, "T": T,
+                                 "weights": np.ones(len(T), dtype=int)})
+        bgf.generate_new_data = lambda size=1: beta_geometric_nbd_model(
+            T, *bgf._unload_params("r", "alpha", "a", "b"), size=size)
+        bgf.predict = bgf.conditional_expected_number_of_purchases_up_to_time
+        bgf.variance_matrix_ = bgf._compute_variance_matrix()
+        bgf.standard_errors_ = bgf._compute_standard_errors()
+        bgf.confidence_intervals_ = bgf._compute_confidence_intervals()
+
+    def plot_frequency_recency_matrix(self, BetaGeoFitter = None, show = True):
         """
         Plot the frequency-recency matrix using the fitted BG/NBD model.
 
         Parameters:
         - BetaGeoFitter (lifetimes.BetaGeoFitter, optional): An instance of the BetaGeoFitter model. If not provided,
           the internal BetaGeoFitter instance associated with the CLTVModel will be used.
+        - show (bool, optional): Display the figure, then close it to release its memory. Default is True.
+          Pass False to only build and return it, leaving the figure open.
 
         Returns:
-            None
+            matplotlib.axes.Axes: Axes of the plot.
         """
         if BetaGeoFitter is None:
             BetaGeoFitter = self.bgf
-        plot_frequency_recency_matrix(BetaGeoFitter)
-        plt.show()
-
-    def plot_probability_alive_matrix(self, BetaGeoFitter = None):
+        plt, plotting = _plotting()
+        ax = plotting.plot_frequency_recency_matrix(BetaGeoFitter)
+        if show:
+            plt.show()
+            plt.close(ax.figure)
+        return ax
+
+    def plot_probability_alive_matrix(self, BetaGeoFitter = None, show = True):
         """
         Plot the probability alive matrix using the fitted BG/NBD model.
 
         Parameters:
         - BetaGeoFitter (lifetimes.BetaGeoFitter, optional): An instance of the BetaGeoFitter model. If not provided,
           the internal BetaGeoFitter instance associated with the CLTVModel will be used.
+        - show (bool, optional): Display the figure, then close it to release its memory. Default is True.
+          Pass False to only build and return it, leaving the figure open.
 
         Returns:
-            None
+            matplotlib.axes.Axes: Axes of the plot.
         """
         if BetaGeoFitter is None:
             BetaGeoFitter = self.bgf
 
-        plot_probability_alive_matrix(BetaGeoFitter)
-        plt.show()
+        plt, plotting = _plotting()
+        ax = plotting.plot_probability_alive_matrix(BetaGeoFitter)
+        if show:
+            plt.show()
+            plt.close(ax.figure)
+        return ax
 
-    def predict_purchases(self, t=1, customer_summary_pr=None, frequency_col=None, recency_col=None, T_col=None, predicted_purchases_colname='predicted_purchases'):
+    def predict_purchases(self, t=1, customer_summary_pr=None, frequency_col=None, recency_col=None, T_col=None, predicted_purchases_colname='predicted_purchases',
+                          batch_size=50_000, top_k=None, engine='lifetimes', deduplicate=False, sort=True):
         """
         Predict the number of purchases a customer will make in the future.
 
@@ -647,48 +1457,170 @@ class CLTVModel:
             - recency_col (pd.Series, optional): Series containing recency (time since the last transaction). Default is the 'recency' attribute.
             - T_col (pd.Series, optional): Series containing T (age of the customer). Default is the 'T' attribute.
             - predicted_purchases_colname (str, optional): Column name for predicted purchases. Default is 'predicted_purchases'.
+            - batch_size (int, optional): Largest number of customers predicted at once. Default is 50,000.
+            - top_k (int, optional): Return only the top_k customers with the most predicted purchases. Default is None, returning all.
+            - engine (str, optional): 'lifetimes' to predict with the BetaGeoFitter, or 'numba' to predict with the
+              parallel bgnbd_expected_purchases kernel. Default is 'lifetimes'.
+            - deduplicate (bool, optional): Predict every distinct (frequency, recency, T) once and share the result
+              among the customers that have it. Default is False.
+            - sort (bool, optional): Sort the returned DataFrame by predicted purchases. Default is True. Pass False
+              to return customer_summary_pr itself, e.g. when a later step sorts anyway.
 
         Returns:
             pd.DataFrame: Customer summary DataFrame sorted by predicted purchases.
+
+        Raises:
+            ValueError: If the engine is not 'lifetimes' or 'numba'.
+
+        Notes:
+            - With top_k, the customers are selected by a partition instead of a full sort. The rows
+              keep the ascending order, so they are the tail of the fully sorted DataFrame.
+            - The 'numba' engine gives the same predictions up to rounding, for a scalar t. It needs
+              no intermediate arrays, so batch_size is not used with it.
+            - deduplicate pays off when many customers share their RFM values, e.g. summaries in whole
+              weeks. Finding the distinct rows is a sort, so it costs more than it saves on distinct data.
         """
         if customer_summary_pr is None:
             customer_summary_pr = self.customer_summary_pr
         if frequency_col is None:
             frequency_col = self.frequency
-        if frequency_col.name not in customer_summary_pr.columns:
-            raise ValueError(f"The {frequency_col.name} column is required in {customer_summary_pr}.")
         if recency_col is None:
             recency_col = self.recency
-        if recency_col.name not in customer_summary_pr.columns:
-            raise ValueError(f"The {recency_col.name} column is required in {customer_summary_pr}.")
         if T_col is None:
             T_col = self.T
-        if T_col.name not in customer_summary_pr.columns:
-            raise ValueError(f"The {T_col.name} column is required in {customer_summary_pr}.")
-
-        customer_summary_pr[predicted_purchases_colname] = self.bgf.conditional_expected_number_of_purchases_up_to_time(
-            t, frequency_col, recency_col, T_col)
+        self._require_columns(customer_summary_pr, frequency_col.name, recency_col.name, T_col.name)
+
+        inputs = [self._model_input(col) for col in (frequency_col, recency_col, T_col)]
+        if deduplicate:
+            inputs, inverse = _unique_rows(inputs)
+        if engine == 'numba':
+            predicted_purchases = bgnbd_expected_purchases(
+                float(t), *inputs, *self._bgf_params())
+        elif engine == 'lifetimes':
+            predicted_purchases = _in_batches(
+                lambda frequency, recency, T: self.bgf.conditional_expected_number_of_purchases_up_to_time(
+                    t, frequency, recency, T),
+                inputs, batch_size)
+        else:
+            raise ValueError(f"The engine must be 'lifetimes' or 'numba', got {engine!r}.")
+        if deduplicate:
+            predicted_purchases = predicted_purchases[inverse]
+        customer_summary_pr[predicted_purchases_colname] = pd.Series(predicted_purchases, index=frequency_col.index)
         self.predicted_purchases = customer_summary_pr[predicted_purchases_colname]
+        if top_k is not None:
+            return self._top_k(customer_summary_pr, predicted_purchases_colname, top_k, ascending=True)
+        if not sort:
+            return customer_summary_pr
         return customer_summary_pr.sort_values(by=predicted_purchases_colname)
- 
-    def plot_period_transactions(self, BetaGeoFitter = None):
+
+    def predict_purchases_horizons(self, ts=(1, 4, 12, 52), customer_summary_pr=None, frequency_col=None,
+                                   recency_col=None, T_col=None, batch_size=50_000, engine='lifetimes'):
+        """
+        Predict the number of purchases of every customer for several time periods at once.
+
+        Parameters:
+            - ts (sequence of int, optional): Time periods of the predictions. Default is (1, 4, 12, 52).
+            - customer_summary_pr (pd.DataFrame, optional): Customer summary DataFrame. Default is the 'customer_summary_pr' attribute.
+            - frequency_col (pd.Series, optional): Series containing customer transaction frequency. Default is the 'frequency' attribute.
+            - recency_col (pd.Series, optional): Series containing recency (time since the last transaction). Default is the 'recency' attribute.
+            - T_col (pd.Series, optional): Series containing T (age of the customer). Default is the 'T' attribute.
+            - batch_size (int, optional): Largest number of customers predicted at once. Default is 50,000.
+            - engine (str, optional): 'lifetimes' to predict with the BetaGeoFitter, or 'numba' to predict with the
+              parallel bgnbd_expected_purchases kernel. Default is 'lifetimes'.
+
+        Returns:
+            pd.DataFrame: Predicted purchases with a row per customer and a column per time period.
+            customer_summary_pr is not changed.
+
+        Raises:
+            ValueError: If the engine is not 'lifetimes' or 'numba'.
+
+        Notes:
+            - The 'lifetimes' engine evaluates all time periods of a batch in one broadcast call, so the
+              per-customer terms are computed once instead of once per period.
+            - The 'numba' engine runs the kernel once per time period. Each run is already parallel over
+              the customers, so the periods are not spread over threads.
+        """
+        if customer_summary_pr is None:
+            customer_summary_pr = self.customer_summary_pr
+        if frequency_col is None:
+            frequency_col = self.frequency
+        if recency_col is None:
+            recency_col = self.recency
+        if T_col is None:
+            T_col = self.T
+        self._require_columns(customer_summary_pr, frequency_col.name, recency_col.name, T_col.name)
+
+        inputs = [self._model_input(col) for col in (frequency_col, recency_col, T_col)]
+        horizons = np.asarray(ts, dtype=np.float64)
+        if engine == 'numba':
+            params = self._bgf_params()
+            predicted = np.column_stack([bgnbd_expected_purchases(t, *inputs, *params) for t in horizons])
+        elif engine == 'lifetimes':
+            predicted = _in_batches(
+                lambda frequency, recency, T: self.bgf.conditional_expected_number_of_purchases_up_to_time(
+                    horizons, frequency[:, None], recency[:, None], T[:, None]),
+                inputs, batch_size)
+        else:
+            raise ValueError(f"The engine must be 'lifetimes' or 'numba', got {engine!r}.")
+        return pd.DataFrame(predicted, index=frequency_col.index, columns=pd.Index(ts, name='t'))
+
+    def _bgf_params(self):
+        """
+        Return the fitted r, alpha, a and b of the BG/NBD model as floats.
+
+        The parameters are unpacked once per fit: they are kept with the params_ Series they were
+        read from, and lifetimes sets a new Series on every fit.
+
+        Returns:
+            Tuple of float: The r, alpha, a and b parameters.
+        """
+        params = getattr(self.bgf, 'params_', None)
+        if params is None or self._bgf_params_cache is None or self._bgf_params_cache[0] is not params:
+            unpacked = tuple(float(value) for value in self.bgf._unload_params("r", "alpha", "a", "b"))
+            self._bgf_params_cache = (params, unpacked)
+        return self._bgf_params_cache[1]
+
+    def _ggf_params(self):
+        """
+        Return the fitted p, q and v of the Gamma-Gamma model as floats.
+
+        Unpacked once per fit, like _bgf_params.
+
+        Returns:
+            Tuple of float: The p, q and v parameters.
+        """
+        params = getattr(self.ggf, 'params_', None)
+        if params is None or self._ggf_params_cache is None or self._ggf_params_cache[0] is not params:
+            unpacked = tuple(float(value) for value in self.ggf._unload_params("p", "q", "v"))
+            self._ggf_params_cache = (params, unpacked)
+        return self._ggf_params_cache[1]
+
+    def plot_period_transactions(self, BetaGeoFitter = None, show = True):
         """
         Plot the actual and predicted number of transactions in each time period.
 
         Parameters:
         - BetaGeoFitter (lifetimes.BetaGeoFitter, optional): An instance of the BetaGeoFitter model. If not provided,
           the internal BetaGeoFitter instance associated with the CLTVModel will be used.
+        - show (bool, optional): Display the figure, then close it to release its memory. Default is True.
+          Pass False to only build and return it, leaving the figure open.
 
         Returns:
-            None
+            matplotlib.axes.Axes: Axes of the plot.
         """
         if BetaGeoFitter is None:
             BetaGeoFitter = self.bgf
 
-        plot_period_transactions(BetaGeoFitter)
-        plt.show()
+        plt, plotting = _plotting()
+        ax = plotting.plot_period_transactions(BetaGeoFitter)
+        if show:
+            plt.show()
+            plt.close(ax.figure)
+        return ax
 
-    def fit_ggf_model(self, customer_summary_pr=None, frequency_colname="frequency", monetary_colname="monetary"):
+    def fit_ggf_model(self, customer_summary_pr=None, frequency_colname="frequency", monetary_colname="monetary",
+                      cache=False):
         """
         Fit the Gamma-Gamma Fitter (GGF) model using the provided frequency and monetary values.
 
@@ -696,21 +1628,302 @@ class CLTVModel:
             - customer_summary_pr (pd.DataFrame, optional): Customer summary DataFrame. Default is the 'customer_summary_pr' attribute.
             - frequency_colname (str, optional): Column name for customer transaction frequency. Default is 'frequency'.
             - monetary_colname (str, optional): Column name for customer monetary value. Default is 'monetary'.
+            - cache (bool, optional): Keep the fit results in FIT_CACHE and reuse them when the model is fitted
+              again on the same frequency and monetary values. Default is False.
 
         Returns:
             None
+
+        Raises:
+            ValueError: If the required columns are not present in the customer_summary_pr DataFrame.
+
+        Notes:
+            - Customers with a frequency of 0 are left out of the fit.
         """
         if customer_summary_pr is None:
             customer_summary_pr = self.customer_summary_pr
-        
-        frequency_col = customer_summary_pr[frequency_colname]
-        monetary_col = customer_summary_pr[monetary_colname]
+        self._require_columns(customer_summary_pr, frequency_colname, monetary_colname)
+
+        frequency_col = self._model_input(customer_summary_pr[frequency_colname])
+        monetary_col = self._model_input(customer_summary_pr[monetary_colname])
+        repeat = frequency_col > 0
+        if not repeat.all():
+            # The Gamma-Gamma model is only defined for repeat customers
+            frequency_col, monetary_col = frequency_col[repeat], monetary_col[repeat]
+
+        if not cache:
+            self.ggf.fit(frequency_col, monetary_col)
+            return
+
+        params, negative_log_likelihood, hessian = _cached_fit_ggf(frequency_col, monetary_col, self.ggf.penalizer_coef)
+        ggf = self.ggf
+        ggf._negative_log_likelihood_ = negative_log_likelihood
+        ggf._hessian_ = hessian
+        ggf.data = pd.DataFrame({"monetary_value": monetary_col, "frequency": frequency_col,
+                                 "weights": np.ones(len(frequency_col), dtype=int)})
+        ggf.params_ = pd.Series(params, index=["p", "q", "v"])
+        ggf.variance_matrix_ = ggf._compute_variance_matrix()
+        ggf.standard_errors_ = ggf._compute_standard_errors()
+        ggf.confidence_intervals_ = ggf._compute_confidence_intervals()
+
+    @staticmethod
+    def _kernel_values(column, dtype=np.float64):
+        """
+        Return the values of a column as a NumPy array the Numba kernels can compile for.
+
+        Parameters:
+            - column (pd.Series): Column of the customer summary.
+            - dtype (np.dtype, optional): Type of the array for nullable and Arrow-backed columns. Default is float64.
+
+        Returns:
+            np.ndarray: The values of a NumPy column as they are. Nullable and Arrow-backed columns, whose
+            `to_numpy()` gives object arrays, are converted to the dtype with missing values as NaN.
+        """
+        if isinstance(column.dtype, np.dtype):
+            return column.to_numpy()
+        return column.to_numpy(dtype=dtype, na_value=np.nan)
+
+    @staticmethod
+    def _as_model_input(column, dtype=np.float64):
+        """
+        Return a column as a C-contiguous float array for the lifetimes fitters.
+
+        Parameters:
+            - column (pd.Series): Column of the customer summary.
+            - dtype (np.dtype, optional): Float type of the array. Default is float64.
+
+        Returns:
+            np.ndarray: The values of the column. No copy is made when they already have this layout.
+        """
+        values = np.ascontiguousarray(CLTVModel._kernel_values(column, dtype), dtype=dtype)
+        assert values.flags.c_contiguous and values.flags.aligned
+        return values
+
+    def _model_input(self, column, dtype=np.float64):
+        """
+        Return a customer summary column as a model input, converting it once.
+
+        The float array of every column name and dtype is kept together with the values it was made
+        from, and reused while the column still holds the same values array. Repeated predictions on
+        the same customer summary therefore skip the conversion.
+
+        Parameters:
+            - column (pd.Series): Column of the customer summary.
+            - dtype (np.dtype, optional): Float type of the array. Default is float64.
+
+        Returns:
+            np.ndarray: The values of the column as a C-contiguous array of the dtype.
+
+        Notes:
+            - Replacing a column gives it a new values array and a new conversion. Edits made
+              in place to an existing column are not seen.
+        """
+        values = column.to_numpy()
+        key = (column.name, np.dtype(dtype))
+        cached = self._model_inputs.get(key)
+        if cached is not None:
+            source, model_input = cached
+            if (source.__array_interface__['data'][0] == values.__array_interface__['data'][0]
+                    and source.shape == values.shape and source.dtype == values.dtype):
+                return model_input
+        model_input = self._as_model_input(column, dtype)
+        # Keeping the source alive means its memory cannot be reused by another array
+        self._model_inputs[key] = (values, model_input)
+        return model_input
+
+    def fit_on_sample(self, n=50_000, random_state=0, customer_summary_pr=None):
+        """
+        Fit the BG/NBD and Gamma-Gamma models on a sample of the customers.
+
+        Parameters:
+            - n (int, optional): Number of customers to fit on. Default is 50,000.
+            - random_state (int, optional): Seed of the random sample. Default is 0.
+            - customer_summary_pr (pd.DataFrame, optional): Customer summary DataFrame. Default is the 'customer_summary_pr' attribute.
+
+        Returns:
+            pd.DataFrame: The customers the models were fitted on.
+
+        Notes:
+            - With at most n customers, the models are fitted on all of them.
+            - The sample is kept in the '_fit_sample' attribute; the prediction methods keep using the full customer summary.
+        """
+        if customer_summary_pr is None:
+            customer_summary_pr = self.customer_summary_pr
+
+        if len(customer_summary_pr) > n:
+            sample = self._sample_stratified(customer_summary_pr, n, random_state)
+        else:
+            sample = customer_summary_pr
+        self._fit_sample = sample
+
+        self.fit_bgf_model(customer_summary_pr=sample)
+        self.fit_ggf_model(customer_summary_pr=sample)
+        return sample
+
+    def _sample_stratified(self, customer_summary_pr, n, random_state=0, frequency_colname="frequency", n_buckets=10):
+        """
+        Draw a sample of customers stratified by frequency.
+
+        Parameters:
+            - customer_summary_pr (pd.DataFrame): Customer summary DataFrame.
+            - n (int): Approximate number of customers to draw.
+            - random_state (int, optional): Seed of the random sample. Default is 0.
+            - frequency_colname (str, optional): Column name for customer transaction frequency. Default is 'frequency'.
+            - n_buckets (int, optional): Number of frequency quantile buckets. Default is 10.
+
+        Returns:
+            pd.DataFrame: The sampled customers, in their original order.
+
+        Notes:
+            - Every bucket contributes in proportion to its size, so the rare high-frequency customers are kept.
+        """
+        buckets = pd.qcut(customer_summary_pr[frequency_colname], q=n_buckets,
+                          labels=False, duplicates='drop').to_numpy()
+        rng = np.random.default_rng(random_state)
+        fraction = n / len(customer_summary_pr)
+
+        positions = []
+        for bucket in np.unique(buckets):
+            members = np.flatnonzero(buckets == bucket)
+            size = min(len(members), max(1, round(fraction * len(members))))
+            positions.append(rng.choice(members, size=size, replace=False))
+        return customer_summary_pr.iloc[np.sort(np.concatenate(positions))]
+
+    def fit_cohort_models(self, cohort_freq='M', min_customers=100, n_jobs=1, df=None, customer_summary_pr=None,
+                          customer_id_col='customer_id', date_col='date', frequency_colname='frequency',
+                          recency_colname='recency', T_colname='T', monetary_colname='monetary'):
+        """
+        Fit separate BG/NBD and Gamma-Gamma models for every acquisition cohort, serially or in parallel.
+
+        Parameters:
+            - cohort_freq (str, optional): Period of the cohorts, e.g. 'M' for the month or 'Y' for the year
+              of the first purchase. Default is 'M'.
+            - min_customers (int, optional): Smallest cohort that gets its own models. Default is 100.
+            - n_jobs (int, optional): Number of worker processes. Default is 1, fitting the cohorts one
+              after another in this process. -1 fits them in loky worker processes on all cores.
+            - df (pd.DataFrame, optional): DataFrame with the transactions. Default is the 'df' attribute.
+            - customer_summary_pr (pd.DataFrame, optional): Customer summary DataFrame. Default is the 'customer_summary_pr' attribute.
+            - customer_id_col (str, optional): Column name for customer ID. Default is 'customer_id'.
+            - date_col (str, optional): Column name for date. Default is 'date'.
+            - frequency_colname (str, optional): Column name for customer transaction frequency. Default is 'frequency'.
+            - recency_colname (str, optional): Column name for recency. Default is 'recency'.
+            - T_colname (str, optional): Column name for T (age of the customer). Default is 'T'.
+            - monetary_colname (str, optional): Column name for customer monetary value. Default is 'monetary'.
+
+        Returns:
+            dict: The (BetaGeoFitter, GammaGammaFitter) models of every fitted cohort, keyed by cohort period.
+
+        Raises:
+            ValueError: If the required columns are not present in the DataFrames.
+
+        Notes:
+            - The cohort of every customer is kept in the 'cohort' attribute and the models in 'cohort_models'.
+            - Customers of smaller cohorts, or of cohorts whose models did not converge, are predicted
+              with the global models by the cohort prediction methods.
+            - Importing this module makes Numba prefer its OpenMP and workqueue threading layers over TBB
+              for the whole process, as the loky workers keep the interpreter from exiting once a kernel
+              has run on TBB. This also applies to any other Numba code, unless NUMBA_THREADING_LAYER or
+              NUMBA_THREADING_LAYER_PRIORITY is set.
+        """
+        if df is None:
+            df = self.df
+        if customer_summary_pr is None:
+            customer_summary_pr = self.customer_summary_pr
+        self._require_columns(df, customer_id_col, date_col)
+        self._require_columns(customer_summary_pr, frequency_colname, recency_colname, T_colname, monetary_colname)
+
+        first_purchase = pd.to_datetime(df[date_col], cache=True).groupby(df[customer_id_col]).min()
+        self.cohort = first_purchase.dt.to_period(cohort_freq).reindex(customer_summary_pr.index)
+
+        cohorts = [(period, sub) for period, sub in customer_summary_pr.groupby(self.cohort, observed=True)
+                   if len(sub) >= min_customers]
+        models = Parallel(n_jobs=n_jobs, backend='loky')(
+            delayed(_fit_cohort)(*(self._as_model_input(sub[col]) for col in
+                                   (frequency_colname, recency_colname, T_colname, monetary_colname)),
+                                 self.bgf.penalizer_coef, self.ggf.penalizer_coef)
+            for _, sub in cohorts)
+        self.cohort_models = {period: fitted for (period, _), fitted in zip(cohorts, models) if fitted is not None}
+        return self.cohort_models
+
+    def _predict_by_cohort(self, customer_summary_pr, predict):
+        """
+        Apply a prediction function with the models of every customer's cohort.
+
+        Parameters:
+            - customer_summary_pr (pd.DataFrame): Customer summary DataFrame.
+            - predict (callable): Function of (bgf, ggf, customers) returning the predictions of the customers.
 
-        self.ggf.fit(frequency_col, monetary_col)
+        Returns:
+            pd.Series: Predictions aligned with customer_summary_pr. Customers without a cohort model are
+            predicted with the global 'bgf' and 'ggf' models.
+        """
+        cohort = self.cohort.reindex(customer_summary_pr.index)
+        predictions = pd.Series(np.nan, index=customer_summary_pr.index)
+        routed = cohort.isin(list(self.cohort_models))
+        for period, (bgf, ggf) in self.cohort_models.items():
+            mask = (cohort == period).to_numpy()
+            if mask.any():
+                predictions[mask] = np.asarray(predict(bgf, ggf, customer_summary_pr[mask]))
+        rest = ~routed.to_numpy()
+        if rest.any():
+            predictions[rest] = np.asarray(predict(self.bgf, self.ggf, customer_summary_pr[rest]))
+        return predictions
+
+    def predict_cohort_purchases(self, t=1, customer_summary_pr=None, frequency_colname='frequency',
+                                 recency_colname='recency', T_colname='T',
+                                 predicted_purchases_colname='predicted_purchases'):
+        """
+        Predict the number of purchases a customer will make in the future with the model of its cohort.
+
+        Parameters:
+            - t (int, optional): Time period for future predictions. Default is 1.
+            - customer_summary_pr (pd.DataFrame, optional): Customer summary DataFrame. Default is the 'customer_summary_pr' attribute.
+            - frequency_colname (str, optional): Column name for customer transaction frequency. Default is 'frequency'.
+            - recency_colname (str, optional): Column name for recency. Default is 'recency'.
+            - T_colname (str, optional): Column name for T (age of the customer). Default is 'T'.
+            - predicted_purchases_colname (str, optional): Column name for predicted purchases. Default is 'predicted_purchases'.
+
+        Returns:
+            pd.DataFrame: Customer summary DataFrame sorted by predicted purchases.
+        """
+        if customer_summary_pr is None:
+            customer_summary_pr = self.customer_summary_pr
+        self._require_columns(customer_summary_pr, frequency_colname, recency_colname, T_colname)
+
+        customer_summary_pr[predicted_purchases_colname] = self._predict_by_cohort(
+            customer_summary_pr, lambda bgf, ggf, customers: bgf.conditional_expected_number_of_purchases_up_to_time(
+                t, customers[frequency_colname], customers[recency_colname], customers[T_colname]))
+        self.predicted_purchases = customer_summary_pr[predicted_purchases_colname]
+        return customer_summary_pr.sort_values(by=predicted_purchases_colname)
+
+    def calculate_cohort_expected_average_profit(self, customer_summary_pr=None, frequency_colname="frequency",
+                                                 monetary_colname="monetary",
+                                                 exp_avg_profit_colname="expected_average_profit"):
+        """
+        Calculate the expected average profit per transaction with the model of every customer's cohort.
+
+        Parameters:
+            - customer_summary_pr (pd.DataFrame, optional): Customer summary DataFrame. Default is the 'customer_summary_pr' attribute.
+            - frequency_colname (str, optional): Column name for customer transaction frequency. Default is 'frequency'.
+            - monetary_colname (str, optional): Column name for customer monetary value. Default is 'monetary'.
+            - exp_avg_profit_colname (str, optional): Column name for expected average profit. Default is 'expected_average_profit'.
+
+        Returns:
+            pd.DataFrame: Customer summary DataFrame sorted by expected average profit (descending).
+        """
+        if customer_summary_pr is None:
+            customer_summary_pr = self.customer_summary_pr
+        self._require_columns(customer_summary_pr, frequency_colname, monetary_colname)
+
+        customer_summary_pr[exp_avg_profit_colname] = self._predict_by_cohort(
+            customer_summary_pr, lambda bgf, ggf, customers: ggf.conditional_expected_average_profit(
+                customers[frequency_colname], customers[monetary_colname]))
+        return customer_summary_pr.sort_values(exp_avg_profit_colname, ascending=False)
 
     def calculate_expected_average_profit(self,customer_summary_pr = None, 
                       frequency_colname="frequency", monetary_colname="monetary",
-                      exp_avg_profit_colname = "expected_average_profit"):
+                      exp_avg_profit_colname = "expected_average_profit", batch_size=50_000, top_k=None,
+                      n_jobs=1, deduplicate=False, sort=True):
         """
         Calculate the expected average profit per transaction.
 
@@ -719,22 +1932,81 @@ class CLTVModel:
             - frequency_colname (str, optional): Column name for customer transaction frequency. Default is 'frequency'.
             - monetary_colname (str, optional): Column name for customer monetary value. Default is 'monetary'.
             - exp_avg_profit_colname (str, optional): Column name for expected average profit. Default is 'expected_average_profit'.
+            - batch_size (int, optional): Largest number of customers calculated at once. Default is 50,000.
+            - top_k (int, optional): Return only the top_k customers with the highest expected average profit. Default is None, returning all.
+            - n_jobs (int, optional): Number of worker threads for the batches. Default is 1, calculating in this thread.
+            - deduplicate (bool, optional): Calculate every distinct (frequency, monetary) once and share the result
+              among the customers that have it. Default is False.
+            - sort (bool, optional): Sort the returned DataFrame by expected average profit. Default is True. Pass False
+              to return customer_summary_pr itself, e.g. when a later step sorts anyway.
 
         Returns:
             pd.DataFrame: Customer summary DataFrame sorted by expected average profit (descending).
+
+        Raises:
+            ValueError: If the required columns are not present in the customer_summary_pr DataFrame.
+
+        Notes:
+            - Customers with a frequency of 0 are not evaluated and get NaN.
+            - With top_k, the customers are selected by a partition instead of a full sort.
+            - The profit is calculated and stored as float32, which halves the memory traffic of the
+              calculation. The CLTV predictions still use float64.
+            - The profits of the last call are reused while the frequency and monetary columns hold the
+              same values arrays and the Gamma-Gamma model is not refitted.
         """
         if customer_summary_pr is None:
             customer_summary_pr = self.customer_summary_pr
-        
-        frequency_col = customer_summary_pr[frequency_colname]
-        monetary_col = customer_summary_pr[monetary_colname]
-        exp_avg_profit = self.ggf.conditional_expected_average_profit(frequency_col, monetary_col)
+        self._require_columns(customer_summary_pr, frequency_colname, monetary_colname)
+
+        # The profit is a closed-form expression of float32 inputs, no optimizer needs the precision
+        frequency_col = self._model_input(customer_summary_pr[frequency_colname], np.float32)
+        monetary_col = self._model_input(customer_summary_pr[monetary_colname], np.float32)
+        exp_avg_profit = self._expected_average_profit(frequency_col, monetary_col, batch_size, n_jobs, deduplicate)
         customer_summary_pr[exp_avg_profit_colname] = exp_avg_profit
+        if top_k is not None:
+            return self._top_k(customer_summary_pr, exp_avg_profit_colname, top_k)
+        if not sort:
+            return customer_summary_pr
         return customer_summary_pr.sort_values(exp_avg_profit_colname,
                                                ascending=False)
 
+    def _expected_average_profit(self, frequency, monetary, batch_size=50_000, n_jobs=1, deduplicate=False):
+        """
+        Return the Gamma-Gamma expected average profit of model input arrays, calculating it once.
+
+        The result is kept with the input arrays it was calculated from and the params_ Series of the
+        fit. _model_input returns the same arrays for unchanged columns, so repeated calls on the same
+        customer summary skip the calculation. The kept result is read-only.
+
+        Parameters:
+            - frequency (np.ndarray): Frequency of every customer.
+            - monetary (np.ndarray): Monetary value of every customer.
+            - batch_size (int, optional): Largest number of customers calculated at once. Default is 50,000.
+            - n_jobs (int, optional): Number of worker threads for the batches. Default is 1.
+            - deduplicate (bool, optional): Calculate every distinct (frequency, monetary) once. Default is False.
+
+        Returns:
+            np.ndarray: Expected average profit of every customer, NaN for those without repeat purchases.
+        """
+        params = getattr(self.ggf, 'params_', None)
+        cached = self._profit_cache
+        if (cached is not None and cached[0] is frequency and cached[1] is monetary
+                and params is not None and cached[2] is params):
+            return cached[3]
+
+        inputs = [frequency, monetary]
+        if deduplicate:
+            inputs, inverse = _unique_rows(inputs)
+        exp_avg_profit = _for_repeat_customers(self.ggf.conditional_expected_average_profit, inputs, batch_size, n_jobs)
+        if deduplicate:
+            exp_avg_profit = exp_avg_profit[inverse]
+        exp_avg_profit.setflags(write=False)
+        self._profit_cache = (frequency, monetary, params, exp_avg_profit)
+        return exp_avg_profit
+
     def calculate_cltv_prediction(self, time_period=12, discount_rate=0.01, freq="W",
-                              frequency_col=None, recency_col=None, T_col=None, monetary_col=None):
+                              frequency_col=None, recency_col=None, T_col=None, monetary_col=None,
+                              batch_size=50_000, n_jobs=1, engine='lifetimes'):
         """
         Calculate Customer Lifetime Value (CLTV) predictions using the fitted models.
 
@@ -746,10 +2018,27 @@ class CLTVModel:
             - recency_col (pd.Series, optional): Series containing recency (time since the last transaction). Default is the 'recency' attribute.
             - T_col (pd.Series, optional): Series containing T (age of the customer). Default is the 'T' attribute.
             - monetary_col (pd.Series, optional): Series containing customer monetary value. Default is the 'monetary' attribute.
+            - batch_size (int, optional): Largest number of customers predicted at once. Default is 50,000.
+            - n_jobs (int, optional): Number of worker threads for the batches. Default is 1, predicting in this thread.
+              The 'numba' engine predicts the batches one after another, as its kernel is parallel itself.
+            - engine (str, optional): 'lifetimes' to predict the purchases with the BetaGeoFitter, or 'numba' to sum
+              the discounted purchases with the parallel bgnbd_discounted_purchases kernel. Default is 'lifetimes'.
 
         Returns:
             pd.DataFrame: CLTV predictions for each customer.
+
+        Raises:
+            ValueError: If the engine is not 'lifetimes' or 'numba'.
+
+        Notes:
+            - Customers with a frequency of 0 are not predicted and get NaN.
+            - The 'numba' engine gives the same predictions up to rounding. It loops over the periods of
+              every customer instead of building (customers x periods) arrays.
+            - The predictions are returned as the customer ID and 'clv' columns, without copying the
+              predicted values into a second DataFrame.
         """
+        if engine not in ('lifetimes', 'numba'):
+            raise ValueError(f"The engine must be 'lifetimes' or 'numba', got {engine!r}.")
 
         if frequency_col is None:
             frequency_col = self.frequency
@@ -760,12 +2049,22 @@ class CLTVModel:
         if monetary_col is None:
             monetary_col = self.monetary
 
-        cltv_pred = self.ggf.customer_lifetime_value(
-            self.bgf, frequency_col, recency_col,
-            T_col, monetary_col,
-            time=time_period, freq=freq, discount_rate=discount_rate
+        if engine == 'numba':
+            predict = functools.partial(_customer_lifetime_value_numba, self._bgf_params(), self._ggf_params())
+            # The workqueue threading layer aborts when a parallel kernel is launched from several threads
+            n_jobs = 1
+        else:
+            predict = functools.partial(_customer_lifetime_value, self.bgf, self.ggf)
+        clv = _for_repeat_customers(
+            functools.partial(predict, time=time_period, freq=freq, discount_rate=discount_rate),
+            [self._model_input(col) for col in (frequency_col, recency_col, T_col, monetary_col)],
+            batch_size, n_jobs
         )
-        cltv_pred = cltv_pred.reset_index()
+        # The columns of `Series.reset_index`, built directly from the arrays. The IDs are copied,
+        # so editing the predictions cannot change the index of the summary
+        customers = frequency_col.index
+        cltv_pred = pd.DataFrame({'index' if customers.name is None else customers.name: customers.to_numpy(copy=True),
+                                  'clv': clv}, copy=False)
         self.cltv_pred = cltv_pred
         return cltv_pred
 
@@ -782,21 +2081,78 @@ class CLTVModel:
 
         Returns:
             None
+
+        Notes:
+            - When the predictions list the customers of the summary index in the same order, as
+              `calculate_cltv_prediction` does, their columns are assigned by position without a join.
+            - A left merge on the summary index with unique customer IDs in the predictions is done by
+              reindexing the predictions on that index, which gives the same DataFrame as the merge.
         """
         if customer_summary_pr is None:
             customer_summary_pr = self.customer_summary_pr
         if df is None:
             df = self.df
-        if customer_id_col not in df.columns:
-            raise ValueError(f"The {customer_id_col} column is required in {df}.")
+        self._require_columns(df, customer_id_col)
         if cltv_pred is None:
             cltv_pred = self.cltv_pred
-        
-        customer_summary_pr = customer_summary_pr.merge(cltv_pred, on = customer_id_col, how=how)
+
+        if how == 'left' and self._same_customers(customer_summary_pr, cltv_pred, customer_id_col):
+            predictions = {col: cltv_pred[col].to_numpy() for col in cltv_pred.columns if col != customer_id_col}
+            customer_summary_pr = customer_summary_pr.assign(**predictions).reset_index()
+        elif how == 'left' and self._indexed_by_customers(customer_summary_pr, cltv_pred, customer_id_col) \
+                and cltv_pred[customer_id_col].is_unique:
+            aligned = cltv_pred.set_index(customer_id_col).reindex(customer_summary_pr.index)
+            predictions = {col: aligned[col].to_numpy() for col in aligned.columns}
+            customer_summary_pr = customer_summary_pr.assign(**predictions).reset_index()
+        else:
+            customer_summary_pr = customer_summary_pr.merge(cltv_pred, on = customer_id_col, how=how)
         self.customer_summary_pr = customer_summary_pr
         return customer_summary_pr
 
-    def create_segments(self, customer_summary_pr = None, clv_col = 'clv', segment_colname = 'segment', num_segments = 4, labels = ["D", "C", "B", "A"]):
+    @staticmethod
+    def _top_k(frame, colname, k, ascending=False):
+        """
+        Select the k rows with the highest values of a column without sorting the whole DataFrame.
+
+        Parameters:
+            - frame (pd.DataFrame): DataFrame to select from.
+            - colname (str): Column name to rank by.
+            - k (int): Number of rows to select.
+            - ascending (bool, optional): Order the selected rows from low to high. Default is False.
+
+        Returns:
+            pd.DataFrame: The selected rows, ordered by the column. Missing values rank lowest.
+        """
+        values = frame[colname].to_numpy(dtype=np.float64)
+        k = min(k, len(values))
+        if k <= 0:
+            return frame.iloc[:0]
+        # argpartition places NaN last, so negating keeps missing values out of the top
+        negated = -values
+        positions = np.argpartition(negated, k - 1)[:k]
+        positions = positions[np.argsort(negated[positions], kind='stable')]
+        return frame.iloc[positions[::-1] if ascending else positions]
+
+    @staticmethod
+    def _same_customers(customer_summary_pr, cltv_pred, customer_id_col):
+        """
+        Check whether the predictions hold the customers of the summary index, in the same order,
+        and share no column with the summary.
+        """
+        return (CLTVModel._indexed_by_customers(customer_summary_pr, cltv_pred, customer_id_col)
+                and np.array_equal(cltv_pred[customer_id_col].to_numpy(), customer_summary_pr.index.to_numpy()))
+
+    @staticmethod
+    def _indexed_by_customers(customer_summary_pr, cltv_pred, customer_id_col):
+        """
+        Check whether the summary is indexed by the customer IDs of the predictions and shares no column with them.
+        """
+        return (customer_summary_pr.index.name == customer_id_col
+                and customer_id_col in cltv_pred.columns
+                and customer_summary_pr.columns.intersection(cltv_pred.columns).empty)
+
+    def create_segments(self, customer_summary_pr = None, clv_col = 'clv', segment_colname = 'segment', num_segments = 4, labels = ["D", "C", "B", "A"],
+                        top_k = None, sort = True):
         """
         Create customer segments based on CLTV predictions.
 
@@ -806,36 +2162,131 @@ class CLTVModel:
             - segment_colname (str, optional): Column name for the created segment. Default is 'segment'.
             - num_segments (int, optional): Number of segments to create. Default is 4.
             - labels (list, optional): Labels for the created segments. Default is ["D", "C", "B", "A"].
+            - top_k (int, optional): Return only the top_k customers with the highest CLV. Default is None, returning all.
+            - sort (bool, optional): Sort the returned DataFrame by CLV. Default is True. Pass False
+              to return customer_summary_pr itself, e.g. when only the segments are needed.
 
         Returns:
             None
+
+        Raises:
+            ValueError: If the number of labels does not match the number of segments.
+
+        Notes:
+            - The segments are quantile bins like `pd.qcut`: each bin includes its upper edge and the
+              lowest bin also includes the minimum. Customers without a CLV get no segment.
+            - Repeated quantile edges leave the segments between them empty instead of raising.
+            - A float32 column, e.g. the expected average profit, is binned as float32 without a
+              float64 copy. The CLTV predictions are float64 and binned as they are.
+            - With top_k, the customers are selected by a partition instead of a full sort. All
+              customers are segmented either way.
         """
         if customer_summary_pr is None:
             customer_summary_pr = self.customer_summary_pr
-
-        customer_summary_pr[segment_colname] = pd.qcut(customer_summary_pr[clv_col],
-                                                        q = num_segments, labels=labels)
+        if len(labels) != num_segments:
+            raise ValueError(f"{num_segments} segments need {num_segments} labels, got {len(labels)}.")
+
+        column = customer_summary_pr[clv_col]
+        # Float columns are binned in their own width, so float32 values are neither copied nor widened
+        float_dtype = column.dtype if isinstance(column.dtype, np.dtype) and column.dtype.kind == 'f' else np.float64
+        values = column.to_numpy(dtype=float_dtype)
+        edges = np.nanquantile(values, np.linspace(0, 1, num_segments + 1))
+        codes = np.searchsorted(edges[1:-1], values, side='left')
+        codes[np.isnan(values)] = -1
+        customer_summary_pr[segment_colname] = pd.Categorical.from_codes(codes, categories=labels,
+                                                                         ordered=True)
         self.segment = customer_summary_pr[segment_colname]
 
+        if top_k is not None:
+            return self._top_k(customer_summary_pr, clv_col, top_k)
+        if not sort:
+            return customer_summary_pr
         return customer_summary_pr.sort_values(by=clv_col, ascending=False)
 
-    def display_segments_summary(self, segment_col = None, customer_summary_pr = None):
+    def segment_customers(self, cltv_pred = None, customer_summary_pr = None, customer_id_col = "customer_id", clv_col = 'clv',
+                          segment_colname = 'segment', num_segments = 4, labels = ["D", "C", "B", "A"]):
+        """
+        Merge the CLTV predictions, segment the customers and summarize the segments in one call.
+
+        Parameters:
+            - cltv_pred (pd.DataFrame, optional): CLTV predictions DataFrame. Default is the 'cltv_pred' attribute.
+            - customer_summary_pr (pd.DataFrame, optional): Customer summary DataFrame. Default is the 'customer_summary_pr' attribute.
+            - customer_id_col (str, optional): Column name for customer ID. Default is "customer_id".
+            - clv_col (str, optional): Column name for Customer Lifetime Value (CLV). Default is 'clv'.
+            - segment_colname (str, optional): Column name for the created segment. Default is 'segment'.
+            - num_segments (int, optional): Number of segments to create. Default is 4.
+            - labels (list, optional): Labels for the created segments. Default is ["D", "C", "B", "A"].
+
+        Returns:
+            pd.DataFrame: Count, mean and sum of the CLV of every segment, like display_segments_summary(clv_col=clv_col).
+
+        Raises:
+            ValueError: If the number of labels does not match the number of segments.
+
+        Notes:
+            Runs merge_cltv_predictions, create_segments and display_segments_summary on the same DataFrame.
+            The merged summary is kept in the 'customer_summary_pr' attribute unsorted, so the only copy
+            of the customer table is the one made by the merge.
+        """
+        if len(labels) != num_segments:
+            raise ValueError(f"{num_segments} segments need {num_segments} labels, got {len(labels)}.")
+        customer_summary_pr = self.merge_cltv_predictions(cltv_pred, customer_summary_pr, customer_id_col=customer_id_col)
+        self.create_segments(customer_summary_pr, clv_col, segment_colname, num_segments, labels, sort=False)
+        return self.display_segments_summary(self.segment, customer_summary_pr, clv_col)
+
+    def display_segments_summary(self, segment_col = None, customer_summary_pr = None, clv_col = None):
         """
         Display a summary of customer segments, including count, mean, and sum.
 
         Parameters:
             - segment_col (pd.Series, optional): Series containing customer segments. Default is the 'segment' attribute.
             - customer_summary_pr (pd.DataFrame, optional): Customer summary DataFrame. Default is the 'customer_summary_pr' attribute.
+            - clv_col (str, optional): Summarize only this column, e.g. 'clv'. Default is None, summarizing every column.
 
         Returns:
-            pd.DataFrame: Summary statistics for each customer segment.
+            pd.DataFrame: Summary statistics for each customer segment. The count, mean and sum of every column
+            are in that order under the column name, or are the only columns when clv_col is given.
+
+        Notes:
+            - Categorical segments of NumPy integer and float columns are summarized by the
+              segment_totals kernel, in one scan per column. Other data is grouped by pandas.
         """
         if customer_summary_pr is None:
             customer_summary_pr = self.customer_summary_pr
         if segment_col is None:
             segment_col = self.segment
-        if segment_col.name not in customer_summary_pr.columns:
-            raise ValueError(f"The {segment_col.name} column is required in {customer_summary_pr}.")
-        
-        return customer_summary_pr.groupby(segment_col.name).agg({"count", "mean", "sum"})
+        self._require_columns(customer_summary_pr, segment_col.name, *(() if clv_col is None else (clv_col,)))
+
+        stats = ["count", "mean", "sum"]
+        segments = customer_summary_pr[segment_col.name]
+        if clv_col is None:
+            values = customer_summary_pr.drop(columns=segment_col.name)
+        else:
+            values = customer_summary_pr[[clv_col]]
+        if not isinstance(segments.dtype, pd.CategoricalDtype) or not all(
+                isinstance(dtype, np.dtype) and dtype.kind in 'iuf' for dtype in values.dtypes):
+            grouped = customer_summary_pr.groupby(segment_col.name, observed=True)
+            if clv_col is None:
+                return grouped.agg(stats)
+            return grouped.agg(**{stat: (clv_col, stat) for stat in stats})
+
+        codes = segments.cat.codes.to_numpy()
+        n_segments = len(segments.cat.categories)
+        summary = {}
+        for col in values.columns:
+            column = values[col].to_numpy()
+            # Integers are summed in 64 bits like pandas, so the int32 frequency does not overflow
+            if column.dtype.kind in 'iu':
+                column = column.astype(np.int64 if column.dtype.kind == 'i' else np.uint64, copy=False)
+            counts, totals = segment_totals(codes, column, n_segments)
+            column_stats = {"count": counts, "sum": totals,
+                            "mean": np.divide(totals, counts, where=counts > 0,
+                                              out=np.full(n_segments, np.nan,
+                                                          dtype=totals.dtype if totals.dtype.kind == 'f' else np.float64))}
+            for stat in stats:
+                summary[stat if clv_col is not None else (col, stat)] = column_stats[stat]
+
+        observed = np.bincount(codes[codes >= 0], minlength=n_segments) > 0
+        index = pd.CategoricalIndex(segments.cat.categories[observed], dtype=segments.dtype, name=segment_col.name)
+        return pd.DataFrame({key: stat[observed] for key, stat in summary.items()}, index=index)
 
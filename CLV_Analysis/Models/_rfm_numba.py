@@ -0,0 +1,373 @@
+"""
+RFM Kernels Module
+
+This module defines the Numba-compiled kernels used by the `CLTVModel` class to
+build the customer summary, to prepare the recency, frequency and monetary (RFM)
+values of the probabilistic models and to predict with the BG/NBD model.
+
+Functions:
+- filter_rfm: Keeps the repeat customers and scales their RFM values in one pass.
+- summarize_sorted: Totals the sales, counts the transactions and finds the first and last
+  date of customers sorted by ID.
+- segment_totals: Counts and sums the values of every customer segment.
+- bgnbd_negative_log_likelihood: Evaluates the BG/NBD fit objective and its gradient.
+- bgnbd_expected_purchases: Predicts the purchases of every customer with fitted BG/NBD parameters.
+- bgnbd_discounted_purchases: Sums the discounted purchases of every customer over the periods of a CLTV.
+
+Note:
+- The kernels work on NumPy arrays and are compiled on first use. The compiled code
+  is cached next to this module, so later processes skip the compilation.
+- The kernels release the GIL, so models in different threads run them concurrently.
+- Unless NUMBA_THREADING_LAYER or NUMBA_THREADING_LAYER_PRIORITY is set, importing this module
+  makes Numba prefer the OpenMP and workqueue threading layers over TBB. After a kernel has run on
+  TBB, the joblib worker processes of `fit_cohort_models` keep the interpreter from exiting. The
+  priority is set for the whole process, so it also applies to any other Numba code.
+"""
+
+import math
+import os
+import numpy as np
+from numba import config, njit, prange
+
+if not {'NUMBA_THREADING_LAYER', 'NUMBA_THREADING_LAYER_PRIORITY'} & os.environ.keys():
+    config.THREADING_LAYER_PRIORITY = ['omp', 'workqueue', 'tbb']
+
+# Sales per parallel chunk of summarize_sorted; smaller inputs are scanned on one thread
+SUMMARY_CHUNK_SIZE = 100_000
+
+
+@njit(cache=True, nogil=True)
+def filter_rfm(frequency, recency, T, monetary):
+    """
+    Keep the customers with more than one transaction and scale their RFM values.
+
+    Parameters:
+        - frequency (np.ndarray): Number of transactions of each customer.
+        - recency (np.ndarray): Days between the first and the last transaction of each customer.
+        - T (np.ndarray): Days between the first transaction and the end of the period of each customer.
+        - monetary (np.ndarray): Total sales amount of each customer.
+
+    Returns:
+        Tuple of np.ndarray: Positions of the kept customers, their frequency, their recency and T
+        in weeks, and their average sales amount per transaction.
+
+    Note:
+        - The frequency is returned as int32, which holds any transaction count exactly. The other
+          values stay float64, as the BG/NBD fit does not converge on float32 inputs.
+        - Customers with a missing (NaN) frequency are dropped, as `frequency > 1` is false for them.
+    """
+    n = np.count_nonzero(frequency > 1)
+    positions = np.empty(n, dtype=np.int64)
+    frequency_out = np.empty(n, dtype=np.int32)
+    recency_out = np.empty(n, dtype=np.float64)
+    T_out = np.empty(n, dtype=np.float64)
+    monetary_out = np.empty(n, dtype=np.float64)
+
+    j = 0
+    for i in range(frequency.shape[0]):
+        if frequency[i] > 1:
+            positions[j] = i
+            frequency_out[j] = frequency[i]
+            recency_out[j] = recency[i] / 7
+            T_out[j] = T[i] / 7
+            monetary_out[j] = monetary[i] / frequency[i]
+            j += 1
+    return positions, frequency_out, recency_out, T_out, monetary_out
+
+
+@njit(cache=True, nogil=True, parallel=True)
+def summarize_sorted(customer_ids, amounts, transaction_codes, n_codes, dates, n_threads=1):
+    """
+    Sum the sales amount, count the distinct transactions and find the first and last date of
+    every customer in one scan.
+
+    Parameters:
+        - customer_ids (np.ndarray): Customer ID of every sale, sorted so each customer is one run.
+        - amounts (np.ndarray): Sales amount of every sale.
+        - transaction_codes (np.ndarray): Transaction of every sale as a code between 0 and n_codes - 1.
+        - n_codes (int): Number of possible transaction codes.
+        - dates (np.ndarray): Date of every sale as int64, or an empty array to skip the dates.
+        - n_threads (int, optional): Number of threads to split large inputs over, usually
+          numba.get_num_threads(). Default is 1.
+
+    Returns:
+        Tuple of np.ndarray: ID of every customer, their total sales amount, their number of
+        distinct transactions, and their first and last date (empty without dates).
+
+    Note:
+        - The sums use Kahan compensation like pandas, and missing amounts are skipped.
+        - A transaction counts once per customer: the last run that saw each code is kept in a
+          marker array, so nothing has to be cleared between runs.
+        - Inputs of at least 2 * SUMMARY_CHUNK_SIZE sales are split into chunks of whole customer
+          runs that are scanned in parallel, each with its own marker array. No run is split, so
+          the results do not depend on the number of threads. The thread count is an argument, as
+          kernels that call numba.get_num_threads() cannot be cached.
+    """
+    n = customer_ids.shape[0]
+    n_runs = 0
+    for i in range(n):
+        if i == 0 or customer_ids[i] != customer_ids[i - 1]:
+            n_runs += 1
+    starts = np.empty(n_runs + 1, dtype=np.int64)
+    run = 0
+    for i in range(n):
+        if i == 0 or customer_ids[i] != customer_ids[i - 1]:
+            starts[run] = i
+            run += 1
+    starts[n_runs] = n
+
+    has_dates = dates.shape[0] > 0
+    customers = np.empty(n_runs, dtype=customer_ids.dtype)
+    totals = np.zeros(n_runs, dtype=np.float64)
+    counts = np.zeros(n_runs, dtype=np.int64)
+    first_dates = np.empty(n_runs if has_dates else 0, dtype=np.int64)
+    last_dates = np.empty(n_runs if has_dates else 0, dtype=np.int64)
+
+    n_chunks = max(1, min(n_threads, n // SUMMARY_CHUNK_SIZE))
+    for chunk in prange(n_chunks):
+        # The runs starting in this chunk's share of the sales
+        first_run = np.searchsorted(starts, chunk * n // n_chunks)
+        end_run = np.searchsorted(starts, (chunk + 1) * n // n_chunks)
+        last_run = np.full(n_codes, -1, dtype=np.int64)
+        for run in range(first_run, end_run):
+            customers[run] = customer_ids[starts[run]]
+            total = 0.0
+            compensation = 0.0
+            count = 0
+            if has_dates:
+                first_dates[run] = dates[starts[run]]
+                last_dates[run] = dates[starts[run]]
+            for i in range(starts[run], starts[run + 1]):
+                amount = amounts[i]
+                if not np.isnan(amount):
+                    y = amount - compensation
+                    t = total + y
+                    compensation = (t - total) - y
+                    total = t
+                code = transaction_codes[i]
+                if last_run[code] != run:
+                    last_run[code] = run
+                    count += 1
+                if has_dates:
+                    if dates[i] < first_dates[run]:
+                        first_dates[run] = dates[i]
+                    elif dates[i] > last_dates[run]:
+                        last_dates[run] = dates[i]
+            totals[run] = total
+            counts[run] = count
+    return customers, totals, counts, first_dates, last_dates
+
+
+@njit(cache=True, nogil=True)
+def segment_totals(codes, values, n_segments):
+    """
+    Count the non-missing values of every segment and sum them in one scan.
+
+    Parameters:
+        - codes (np.ndarray): Segment code of every customer, -1 for customers without a segment.
+        - values (np.ndarray): Integer or float value of every customer. Integer values should be
+          int64 or uint64, as the sums are accumulated in the type of the values.
+        - n_segments (int): Number of segments.
+
+    Returns:
+        Tuple of np.ndarray: Number of non-missing values and their sum for every segment. The sums
+        keep the type of the values.
+
+    Note:
+        - The float sums use Kahan compensation like pandas, and missing values are skipped.
+    """
+    counts = np.zeros(n_segments, dtype=np.int64)
+    totals = np.zeros(n_segments, dtype=values.dtype)
+    compensations = np.zeros(n_segments, dtype=values.dtype)
+    for i in range(codes.shape[0]):
+        code = codes[i]
+        value = values[i]
+        if code < 0 or np.isnan(value):
+            continue
+        counts[code] += 1
+        y = value - compensations[code]
+        t = totals[code] + y
+        compensations[code] = (t - totals[code]) - y
+        totals[code] = t
+    return counts, totals
+
+
+@njit(cache=True, nogil=True)
+def _digamma(x):
+    """
+    Digamma function of x > 0, by recurrence up to x >= 6 and the asymptotic series from there.
+    """
+    result = 0.0
+    while x < 6.0:
+        result -= 1.0 / x
+        x += 1.0
+    f = 1.0 / (x * x)
+    return result + math.log(x) - 0.5 / x - f * (1.0 / 12 - f * (1.0 / 120 - f * (1.0 / 252 - f * (1.0 / 240 - f / 132))))
+
+
+@njit(cache=True, parallel=True, nogil=True)
+def bgnbd_negative_log_likelihood(log_params, frequency, recency, T, penalizer_coef):
+    """
+    Evaluate the penalized negative log-likelihood of the BG/NBD model and its gradient.
+
+    Evaluates the same objective as BetaGeoFitter._negative_log_likelihood of lifetimes, with unit
+    weights, in parallel over the customers.
+
+    Parameters:
+        - log_params (np.ndarray): Logarithm of the r, alpha, a and b parameters.
+        - frequency (np.ndarray): Number of repeat transactions of each customer.
+        - recency (np.ndarray): Age of each customer at their last transaction.
+        - T (np.ndarray): Age of each customer.
+        - penalizer_coef (float): Coefficient of the L2 penalty on the parameters.
+
+    Returns:
+        Tuple of (float, np.ndarray): Mean negative log-likelihood plus the penalty, and its gradient
+        with respect to log_params.
+    """
+    r = math.exp(log_params[0])
+    alpha = math.exp(log_params[1])
+    a = math.exp(log_params[2])
+    b = math.exp(log_params[3])
+    const = math.lgamma(a + b) - math.lgamma(b) - math.lgamma(r) + r * math.log(alpha)
+    psi_r, psi_b, psi_ab = _digamma(r), _digamma(b), _digamma(a + b)
+
+    n = frequency.shape[0]
+    ll = 0.0
+    d_r = 0.0
+    d_alpha = 0.0
+    d_a = 0.0
+    d_b = 0.0
+    for i in prange(n):
+        x = frequency[i]
+        log_T = math.log(alpha + T[i])
+        A_3 = -(r + x) * log_T
+        A_12 = math.lgamma(r + x) + math.lgamma(b + x) - math.lgamma(a + b + x)
+        # Weights of the "inactive after the last purchase" and "still active" terms
+        w_4 = 0.0
+        log_tx = 0.0
+        if x > 0:
+            log_tx = math.log(alpha + recency[i])
+            A_4 = math.log(a) - math.log(b + x - 1) - (r + x) * log_tx
+            top = max(A_3, A_4)
+            log_sum = top + math.log(math.exp(A_3 - top) + math.exp(A_4 - top))
+            w_4 = math.exp(A_4 - log_sum)
+        else:
+            log_sum = A_3
+        w_3 = 1.0 - w_4
+        psi_abx = _digamma(a + b + x)
+        ll += A_12 + log_sum
+        d_r += _digamma(r + x) - w_3 * log_T - w_4 * log_tx
+        d_alpha += -(r + x) * (w_3 / (alpha + T[i]) + w_4 / (alpha + recency[i]))
+        d_a += -psi_abx + (w_4 / a if x > 0 else 0.0)
+        d_b += _digamma(b + x) - psi_abx - (w_4 / (b + x - 1) if x > 0 else 0.0)
+
+    value = -(ll / n + const) + penalizer_coef * (r * r + alpha * alpha + a * a + b * b)
+    grad = np.empty(4)
+    grad[0] = -r * (d_r / n - psi_r + math.log(alpha)) + 2 * penalizer_coef * r * r
+    grad[1] = -alpha * (d_alpha / n + r / alpha) + 2 * penalizer_coef * alpha * alpha
+    grad[2] = -a * (d_a / n + psi_ab) + 2 * penalizer_coef * a * a
+    grad[3] = -b * (d_b / n + psi_ab - psi_b) + 2 * penalizer_coef * b * b
+    return value, grad
+
+
+@njit(cache=True, nogil=True)
+def _hyp2f1_series(a, b, c, z):
+    """
+    Sum the hypergeometric series 2F1(a, b; c; z) for 0 <= z < 1 until its terms vanish.
+    """
+    term = 1.0
+    total = 1.0
+    for k in range(100_000):
+        term *= (a + k) * (b + k) / ((c + k) * (k + 1)) * z
+        total += term
+        if abs(term) <= 1e-16 * abs(total):
+            break
+    return total
+
+
+@njit(cache=True, parallel=True, nogil=True)
+def bgnbd_expected_purchases(t, frequency, recency, T, r, alpha, a, b):
+    """
+    Predict the number of repeat purchases of every customer up to time t with the BG/NBD model.
+
+    Evaluates the same expression as BetaGeoFitter.conditional_expected_number_of_purchases_up_to_time
+    of lifetimes, in parallel over the customers.
+
+    Parameters:
+        - t (float): Time period of the prediction, in the unit of recency and T.
+        - frequency (np.ndarray): Number of repeat transactions of each customer.
+        - recency (np.ndarray): Age of each customer at their last transaction.
+        - T (np.ndarray): Age of each customer.
+        - r, alpha, a, b (float): Fitted BG/NBD parameters.
+
+    Returns:
+        np.ndarray: Expected number of purchases of every customer.
+
+    Note:
+        - The hypergeometric term is taken in its Euler form, (1 - z)^(a - 1) * 2F1(a + b - 1 - r, a - 1;
+          a + b + x - 1; z). Its first two parameters do not grow with the frequency x, so the series
+          converges in a few terms for the usual prediction periods.
+    """
+    n = frequency.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    for i in prange(n):
+        x = frequency[i]
+        out[i] = _cumulative_purchases(t, x, T[i], r, alpha, a, b) / _alive_denominator(x, recency[i], T[i], r, alpha, a, b)
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _cumulative_purchases(t, x, T, r, alpha, a, b):
+    """
+    Numerator of the BG/NBD expected purchases up to time t of a customer with x repeat purchases.
+    """
+    z = t / (alpha + T + t)
+    hyp_term = (1 - z) ** (a - 1) * _hyp2f1_series(a + b - 1 - r, a - 1, a + b + x - 1, z)
+    return (a + b + x - 1) / (a - 1) * (1 - hyp_term)
+
+
+@njit(cache=True, nogil=True)
+def _alive_denominator(x, recency, T, r, alpha, a, b):
+    """
+    Denominator of the BG/NBD expected purchases, which does not depend on the time period.
+    """
+    if x > 0:
+        return 1.0 + a / (b + x - 1) * ((alpha + T) / (alpha + recency)) ** (r + x)
+    return 1.0
+
+
+@njit(cache=True, parallel=True, nogil=True)
+def bgnbd_discounted_purchases(times, discount, frequency, recency, T, r, alpha, a, b):
+    """
+    Sum the discounted purchases of every customer over consecutive periods with the BG/NBD model.
+
+    The purchases of a period are the expected purchases up to its end minus those up to its
+    start, as in the CLTV of GammaGammaFitter.customer_lifetime_value of lifetimes.
+
+    Parameters:
+        - times (np.ndarray): Start of the first period followed by the end of every period.
+        - discount (np.ndarray): Discount factor of every period, one fewer than times.
+        - frequency (np.ndarray): Number of repeat transactions of each customer.
+        - recency (np.ndarray): Age of each customer at their last transaction.
+        - T (np.ndarray): Age of each customer.
+        - r, alpha, a, b (float): Fitted BG/NBD parameters.
+
+    Returns:
+        np.ndarray: Discounted expected number of purchases of every customer.
+
+    Note:
+        - The periods of a customer are summed in one loop, so no (customers x periods)
+          intermediate array is built, and the time-independent denominator is computed once.
+    """
+    n = frequency.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    for i in prange(n):
+        x = frequency[i]
+        previous = _cumulative_purchases(times[0], x, T[i], r, alpha, a, b)
+        total = 0.0
+        for k in range(discount.shape[0]):
+            current = _cumulative_purchases(times[k + 1], x, T[i], r, alpha, a, b)
+            total += discount[k] * (current - previous)
+            previous = current
+        out[i] = total / _alive_denominator(x, recency[i], T[i], r, alpha, a, b)
+    return out
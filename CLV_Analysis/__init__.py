@@ -1,4 +1,13 @@
+import importlib
+
 from . import Logger
-from . import API
-from . import DB
-from . import Models
\ No newline at end of file
+
+# API, DB and Models are imported on first access, so importing one of them,
+# e.g. CLV_Analysis.Models.CLTV, does not load the web stack of the API
+_SUBPACKAGES = ('API', 'DB', 'Models')
+
+
+def __getattr__(name):
+    if name in _SUBPACKAGES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
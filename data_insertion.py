@@ -15,70 +15,173 @@ Note:
 - Ensure that the necessary dependencies are installed, including pandas, sqlalchemy, and the CLV_Analysis package.
 - The script assumes the presence of CSV files ('customer.csv', 'transactions.csv', 'product.csv', 'date.csv', 'sales.csv')
   in the 'data_csv' directory.
+- The CSV files are read and inserted in chunks of CSV_CHUNK_SIZE rows, so no file is held in memory at once.
+- The customer, transaction, product and date tables are loaded through a single SqlHandler connection,
+  so its page cache stays warm from one table to the next.
+- The CSV files are parsed concurrently on worker threads while the main thread inserts, so the
+  parsing of the next tables is hidden behind the writes. All inserts still run on the main thread.
+  If an insert fails, the readers are cancelled and joined, so the script exits with the error.
+- If the customer, transaction, product and date tables are all empty, they are loaded through
+  `SqlHandler.initial_load`, without a rollback journal and fsync. The sales facts are inserted
+  afterwards through the SQLAlchemy session with the usual WAL settings.
 """
 
+import contextlib
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from CLV_Analysis.DB.sql_interactions import SqlHandler
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from CLV_Analysis.DB.schema import Sale
+from CLV_Analysis.DB.schema import Sale, SessionLocal, engine, init_schema
 import pandas as pd
 
-# customer
-Inst = SqlHandler('temp', 'customer')
-
-data = pd.read_csv('data_csv/customer.csv')
-
-# Inst.truncate_table()
-Inst.insert_many(data)
-
-Inst.close_cnxn()
-
-# transaction
-Inst1 = SqlHandler('temp', 'transactions')
-
-data1 = pd.read_csv('data_csv/transactions.csv')
-
-# Inst1.truncate_table()
-Inst1.insert_many(data1)
-
-Inst1.close_cnxn()
-
-# product
-Inst2 = SqlHandler('temp', 'product')
-
-data2 = pd.read_csv('data_csv/product.csv')
-
-# Inst2.truncate_table()
-Inst2.insert_many(data2)
-
-Inst2.close_cnxn()
-
-# date
-Inst3 = SqlHandler('temp', 'date')
-
-data3 = pd.read_csv('data_csv/date.csv')
-
-# Inst3.truncate_table()
-Inst3.insert_many(data3)
-
-Inst3.close_cnxn()
-
-# Sale
-# Create a SQLAlchemy engine and session
-engine = create_engine('sqlite:///temp.db')
-Session = sessionmaker(bind=engine)
-session = Session()
-
-# Read CSV file into a list of dictionaries
-data4 = pd.read_csv('data_csv/sales.csv').to_dict(orient='records')
-
-# Insert the sample data into the 'sales_fact' table
-for data in data4:
-    sale = Sale(**data)
-    session.add(sale)
-
-# Commit the changes to the database
-session.commit()
-
-# Close the session
-session.close()
+# Rows read from a CSV file at a time, so no file is held in memory at once
+CSV_CHUNK_SIZE = 100_000
+# Parsed chunks a reader thread may hold before waiting for the inserts
+PREFETCH_CHUNKS = 2
+# Seconds a reader waits on a full queue before checking whether the load was cancelled
+PUT_TIMEOUT = 0.5
+
+TABLES = ('customer', 'transactions', 'product', 'date', 'sales')
+# Tables loaded through the SqlHandler, the sales facts go through the SQLAlchemy session
+DIMENSION_TABLES = TABLES[:-1]
+
+
+def put_chunk(chunks, chunk, cancelled):
+    """
+    Queue a chunk, waiting while the queue is full until the load is cancelled.
+
+    Returns False if the load was cancelled before the chunk could be queued.
+    """
+    while not cancelled.is_set():
+        try:
+            chunks.put(chunk, timeout=PUT_TIMEOUT)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def read_chunks(path, chunks, cancelled):
+    """
+    Parse a CSV file in chunks on a worker thread and queue them for the inserts.
+
+    None is queued after the last chunk, also if the parsing fails. The reader stops as soon as
+    `cancelled` is set, so it never blocks on a queue that is no longer consumed.
+    """
+    try:
+        for chunk in pd.read_csv(path, chunksize=CSV_CHUNK_SIZE):
+            if not put_chunk(chunks, chunk, cancelled):
+                return
+    finally:
+        put_chunk(chunks, None, cancelled)
+
+
+def queued_chunks(chunks, reader):
+    """
+    Yield the parsed chunks of a queue, then raise the error of its reader, if any.
+    """
+    while (chunk := chunks.get()) is not None:
+        yield chunk
+    reader.result()
+
+
+def drain(chunks):
+    """
+    Drop the chunks left in a queue.
+    """
+    while True:
+        try:
+            chunks.get_nowait()
+        except queue.Empty:
+            return
+
+
+def insert_table(Inst, table_name, chunks, reader):
+    """
+    Insert the chunks of a table's CSV file through a SqlHandler.
+
+    The chunks are locals, so each is freed as soon as it is inserted.
+    """
+    Inst.table_name = table_name
+    for data in queued_chunks(chunks, reader):
+        Inst.insert_many(data)
+
+
+def is_initial_load(Inst):
+    """
+    Check whether all tables loaded through the SqlHandler are still empty.
+    """
+    for table_name in DIMENSION_TABLES:
+        Inst.table_name = table_name
+        if not Inst.is_empty():
+            return False
+    return True
+
+
+def to_records(data):
+    """
+    Convert a DataFrame into a list of dictionaries of plain Python values, one per row.
+
+    Gives the records of `to_dict(orient='records')`, but every column is converted once with
+    `tolist` and the dictionaries are zipped from those lists instead of boxing cell by cell.
+    """
+    columns = list(data.columns)
+    return [dict(zip(columns, row)) for row in zip(*(data[col].tolist() for col in columns))]
+
+
+def insert_sales(session, chunks, reader):
+    """
+    Insert the chunks of the sales CSV file into the 'sales_fact' table of the session.
+
+    Each chunk and its list of dictionaries are locals, freed before the next chunk is converted.
+    """
+    for data4 in queued_chunks(chunks, reader):
+        records = to_records(data4)
+        del data4
+        Sale.bulk_insert(session, records)
+        del records
+
+
+init_schema()
+# Close the pooled connection of the schema engine, so the initial load can leave WAL mode
+engine.dispose()
+
+# Every file gets its own reader thread and a bounded queue, so the readers stay
+# at most PREFETCH_CHUNKS chunks ahead of the inserts
+cancelled = threading.Event()
+executor = ThreadPoolExecutor(max_workers=len(TABLES))
+chunk_queues = {table_name: queue.Queue(maxsize=PREFETCH_CHUNKS) for table_name in TABLES}
+readers = {table_name: executor.submit(read_chunks, f'data_csv/{table_name}.csv', chunk_queues[table_name], cancelled)
+           for table_name in TABLES}
+
+try:
+    # customer, transaction, product and date share one connection
+    Inst = SqlHandler('temp', 'customer')
+
+    load = Inst.initial_load(DIMENSION_TABLES) if is_initial_load(Inst) else contextlib.nullcontext()
+    with load:
+        for table_name in DIMENSION_TABLES:
+            # Inst.truncate_table()
+            insert_table(Inst, table_name, chunk_queues[table_name], readers[table_name])
+
+    Inst.close_cnxn()
+
+    # Sale
+    # Create a session from the shared session factory of the schema module
+    session = SessionLocal()
+
+    # Insert the CSV file in chunks into the 'sales_fact' table
+    insert_sales(session, chunk_queues['sales'], readers['sales'])
+
+    # Commit the changes to the database
+    session.commit()
+
+    # Close the session
+    session.close()
+finally:
+    # Stop the readers of the tables that were not loaded (all of them have finished after a
+    # successful load), so the worker threads can be joined and the script exits
+    cancelled.set()
+    for chunks in chunk_queues.values():
+        drain(chunks)
+    executor.shutdown(cancel_futures=True)
@@ -0,0 +1,51 @@
+"""
+Gunicorn Configuration
+
+Production launch configuration of the FastAPI application:
+
+    gunicorn -c gunicorn_conf.py CLV_Analysis.API.main:app
+
+One uvicorn worker is started per CPU core, or `WEB_CONCURRENCY` workers if
+set. Every worker builds its own SQLite connection pool in the application
+startup hook, after the fork, so no connection is shared between processes.
+With WAL journaling the workers read concurrently, while writes are still
+serialized by SQLite.
+
+The schema and the planner statistics are prepared once, by the master
+process in `on_starting`, instead of by every worker.
+
+Note:
+- The GET cache of the application lives in each worker, and a write only
+  clears the cache of the worker that handled it. With more than one worker
+  the cache is therefore turned off, so no worker serves rows that another
+  one has changed or deleted. Run a single worker to keep it.
+- If write-heavy traffic causes `database is locked` errors, route the
+  POST/PUT/DELETE endpoints to a separate single-worker instance.
+"""
+
+import os
+
+workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+if workers > 1:
+    # Set before the application is imported, which reads it at import time
+    os.environ["CLV_CACHE_TTL"] = "0"
+
+
+def on_starting(server):
+    """
+    Prepare the database once in the master, before any worker is forked.
+    """
+    from CLV_Analysis.API import main
+    main.prepare_database()
+    os.environ[main.DB_PREPARED_ENV] = "1"
+
+
+def post_fork(server, worker):
+    """
+    Drop the SQLAlchemy connections inherited from the preloaded master.
+    """
+    from CLV_Analysis.DB import schema
+    schema.engine.dispose(close=False)
@@ -4,19 +4,41 @@ Run Script
 This script starts the FastAPI application using uvicorn and opens the documentation in a web browser.
 
 Note: Ensure that the uvicorn package is installed before running this script.
+- The server runs in this process, on the application that is already imported, instead of
+  in a uvicorn subprocess that imports it again. The documentation is opened once it is up.
+- The server does not reload on code changes. Run `uvicorn CLV_Analysis.API.main:app --reload`
+  for development.
 """
 
-import subprocess
+import threading
+import time
 import webbrowser
-from CLV_Analysis.API import main
+import uvicorn
+from CLV_Analysis.API.main import app
 
+HOST = '127.0.0.1'
+PORT = 8000
 
-def start_fastapi():
-    subprocess.run(["uvicorn", "CLV_Analysis.API.main:app", "--reload"])
-    webbrowser.open('http://127.0.0.1:8000/docs#/')
 
+def open_docs(server):
+    """
+    Open the documentation in a web browser as soon as the server accepts connections.
+    """
+    while not server.started:
+        if server.should_exit:
+            return
+        time.sleep(0.1)
+    webbrowser.open(f'http://{HOST}:{PORT}/docs#/')
+
+
+def start_fastapi():
+    """
+    Serve the application with an in-process uvicorn server until it is stopped.
+    """
+    server = uvicorn.Server(uvicorn.Config(app, host=HOST, port=PORT))
+    threading.Thread(target=open_docs, args=(server,), daemon=True).start()
+    server.run()
 
-name = "__main__"
 
-if name == "__main__":
+if __name__ == "__main__":
     start_fastapi()
@@ -2,8 +2,18 @@
 Schema Builder Script
 
 This script builds the database schema using the classes defined in the CLV_Analysis.DB.schema module.
-It imports all classes from the schema module to create the necessary tables for the SQLite database.
+It imports `init_schema` from the schema module, which registers all classes, and calls it to create
+the necessary tables and their indexes for the SQLite database.
+
+Before that, an SQLite database file is converted to the configured page size with `set_page_size`.
+This rewrites the whole file, so it runs here once instead of on every API startup.
 
 Note: The schema_builder.py file should be executed to set up the database schema.
 """
-from CLV_Analysis.DB.schema import *
+import asyncio
+from CLV_Analysis.DB.schema import engine, init_schema
+from CLV_Analysis.DB.sql_interactions import set_page_size
+
+if engine.dialect.name == 'sqlite':
+    asyncio.run(set_page_size(engine.url.database))
+init_schema()
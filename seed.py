@@ -0,0 +1,121 @@
+"""
+Database Seeding Script
+
+This script fills the SQLite database ('temp.db') with synthetic data directly,
+without writing the intermediate CSV files. The customer, product, transaction
+and date tables are generated concurrently on worker threads, then every table
+is written with a single bulk insert.
+
+Modules:
+- CLV_Analysis.DB.data_generator: Provides the vectorized data generators.
+- CLV_Analysis.DB.sql_interactions: Provides the connection factory and the
+  `SqlHandler.bulk_insert` coroutine.
+
+Note:
+- The database file is converted to the configured page size through
+  `sql_interactions.set_page_size`, then missing tables are created through
+  `schema.init_schema` before seeding.
+- The generated data follows the same rules as the Synthetic Data guide.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from CLV_Analysis.DB import schema, sql_interactions
+from CLV_Analysis.DB.data_generator import (
+    _RNG, _SEED, generate_customers, generate_products,
+    generate_transactions, generate_date_range
+)
+
+DB_NAME = 'temp.db'
+
+NUMBER_OF_PRODUCTS = 5000
+NUMBER_OF_CUSTOMERS = 3000
+NUMBER_OF_TRANSACTIONS = 4000
+NUMBER_OF_DATES = 8767  # 2000-01-01 to 2023-12-31
+
+
+def generate_sales(transactions, dates):
+    """
+    Generate the sales facts of the given transactions.
+
+    Every transaction gets 1 to 5 sales of random products, and inherits the
+    customer and date of its transaction. The random numbers come from the
+    shared generator of the data generator module, so a `CLV_SEED` run is
+    reproducible.
+
+    Parameters:
+    - transactions: Transaction data returned by `generate_transactions`.
+    - dates: Date data returned by `generate_date_range`.
+
+    Returns:
+    - Dictionary mapping each sales fact column to a NumPy array.
+    """
+    n_transactions = len(transactions["transaction_id"])
+    transaction_id = np.repeat(transactions["transaction_id"],
+                               _RNG.integers(1, 6, n_transactions))
+    n = len(transaction_id)
+
+    date_ids = pd.Series(dates["date_id"],
+                         index=pd.DatetimeIndex(dates["date"]))
+    transaction_date_id = date_ids.reindex(transactions["date"]).values
+
+    return {
+        "transaction_id": transaction_id,
+        "product_id": _RNG.integers(0, NUMBER_OF_PRODUCTS, n),
+        "customer_id": transactions["customer_id"][transaction_id],
+        "quantity": _RNG.integers(1, 20, n),
+        "date_id": transaction_date_id[transaction_id]
+    }
+
+
+def to_rows(data):
+    """
+    Convert a column -> array mapping into rows of plain Python values.
+    """
+    return list(zip(*(np.asarray(values).tolist() for values in data.values())))
+
+
+async def seed():
+    """
+    Generate all tables concurrently and bulk insert them into the database.
+
+    With `CLV_SEED` set, the tables are generated one after another instead,
+    as threads drawing from the shared random number generator would take
+    its numbers in a different order every run.
+    """
+    generators = ((generate_customers, NUMBER_OF_CUSTOMERS),
+                  (generate_products, NUMBER_OF_PRODUCTS),
+                  (generate_transactions, NUMBER_OF_TRANSACTIONS),
+                  (generate_date_range, NUMBER_OF_DATES))
+    if _SEED is None:
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=os.cpu_count()))
+        customers, products, transactions, dates = await asyncio.gather(
+            *(asyncio.to_thread(generate, n) for generate, n in generators))
+    else:
+        customers, products, transactions, dates = (
+            generate(n) for generate, n in generators)
+    sales = generate_sales(transactions, dates)
+
+    await sql_interactions.set_page_size(DB_NAME)
+    schema.init_schema()
+    conn = await sql_interactions.connect(DB_NAME)
+    try:
+        for table_name, data in (("customer", customers),
+                                 ("product", products),
+                                 ("transactions", transactions),
+                                 ("date", dates),
+                                 ("sales_fact", sales)):
+            await sql_interactions.SqlHandler.bulk_insert(
+                conn, to_rows(data), table_name=table_name,
+                columns=list(data)
+            )
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(seed())
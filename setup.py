@@ -6,5 +6,6 @@ setup(
     name='CLV_Analysis',
     version='0.1.0',
     packages=find_packages(include=['CLV_Analysis','CLV_Analysis.*']),
+    extras_require={'duckdb': ['duckdb-engine==0.17.0']},
     
 )
\ No newline at end of file